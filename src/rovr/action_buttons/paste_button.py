@@ -1,7 +1,6 @@
 from textual.widgets import Button
 
 from rovr.functions.icons import get_icon
-from rovr.functions.path import decompress
 from rovr.screens import YesOrNo
 from rovr.variables.constants import config
 
@@ -30,8 +29,6 @@ class PasteButton(Button):
             "Clipboard"
         ).selected  # dont include highlighted
         if selected_items:
-            # decompress items
-            selected_items = [decompress(item) for item in selected_items]
             # split into two items, those ending with `-cut` and those ending with `-copy`
             to_copy, to_cut = (
                 [item[:-5] for item in selected_items if item.endswith("-copy")],
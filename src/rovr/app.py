@@ -1,7 +1,6 @@
-import asyncio
 import shutil
 from contextlib import suppress
-from os import chdir, getcwd, listdir, path
+from os import chdir, getcwd, path
 from types import SimpleNamespace
 from typing import Callable, Iterable
 
@@ -32,6 +31,15 @@ from rovr.action_buttons import (
     UnzipButton,
     ZipButton,
 )
+from rovr.classes import (
+    DirectoryWatcher,
+    FrecencyStore,
+    PathIndex,
+    ProbeTimeout,
+    ZoxideCache,
+)
+from rovr.classes.frecency_store import zoxide_database_path
+from rovr.classes.probe_pool import probe_pool
 from rovr.core import (
     FileList,
     PinnedSidebar,
@@ -39,7 +47,7 @@ from rovr.core import (
 )
 from rovr.footer import Clipboard, MetadataContainer, ProcessContainer
 from rovr.functions import icons
-from rovr.functions.path import decompress, ensure_existing_directory, normalise
+from rovr.functions.path import ensure_existing_directory, normalise
 from rovr.functions.themes import get_custom_themes
 from rovr.header import HeaderArea
 from rovr.navigation_widgets import (
@@ -49,11 +57,11 @@ from rovr.navigation_widgets import (
     PathInput,
     UpButton,
 )
-from rovr.screens import DummyScreen, YesOrNo, ZDToDirectory
+from rovr.screens import DummyScreen, JumpToPath, YesOrNo, ZDToDirectory
 from rovr.screens.way_too_small import TerminalTooSmall
 from rovr.search_container import SearchInput
 from rovr.variables.constants import MaxPossible, config
-from rovr.variables.maps import VAR_TO_DIR
+from rovr.variables.maps import VAR_TO_DIR, dirs
 
 max_possible = MaxPossible()
 
@@ -94,6 +102,14 @@ class Application(App, inherit_bindings=False):
         self.app_blurred = False
         self.startup_path = startup_path
         self.has_pushed_screen = False
+        self.path_index: PathIndex | None = None
+        self.frecency_store = FrecencyStore(
+            path.join(VAR_TO_DIR["CONFIG"], "frecency.json")
+        )
+        # kept for as long as the app runs, so it isn't fetched on every open
+        self.zoxide_cache = ZoxideCache()
+        # the directory that the latest `cd` is going to
+        self._cd_target: str | None = None
 
     def compose(self) -> ComposeResult:
         print("Starting Rovr...")
@@ -176,6 +192,8 @@ class Application(App, inherit_bindings=False):
             self.query_one("#forward").tooltip = "Go forward in history"
             self.query_one("#up").tooltip = "Go up the directory tree"
         self.tabWidget = self.query_one("Tabline")
+        # visited folders, for z
+        self.frecency_store.load(zoxide_database_path())
 
         # Change to startup directory. This also calls update_file_list()
         # causing the file_list to get populated
@@ -185,7 +203,19 @@ class Application(App, inherit_bindings=False):
         )
         self.query_one("#file_list").focus()
         # start mini watcher
-        self.watch_for_changes_and_update()
+        self.directory_watcher = DirectoryWatcher(self.on_directories_changed)
+        self.directory_watcher.start()
+        # start path index
+        if config["plugins"]["path_index"]["enabled"]:
+            self.path_index = PathIndex(
+                path.join(dirs.user_cache_dir, "path_index.db"),
+                [
+                    normalise(path.expanduser(root))
+                    for root in config["plugins"]["path_index"]["roots"]
+                ],
+                set(config["settings"]["recursive_search_exclude"]),
+            )
+            self.path_index.start()
 
     @work
     async def action_focus_next(self) -> None:
@@ -306,23 +336,45 @@ class Application(App, inherit_bindings=False):
                 config["plugins"]["zoxide"]["enabled"]
                 and event.key in config["plugins"]["zoxide"]["keybinds"]
             ):
-                if shutil.which("zoxide") is None:
-                    self.notify(
-                        "Zoxide is not installed or not in PATH.",
-                        title="Zoxide",
-                        severity="error",
-                    )
 
                 def on_response(response: str) -> None:
                     """Handle the response from the ZDToDirectory dialog."""
                     if response:
                         pathinput = self.query_one(PathInput)
-                        pathinput.value = decompress(response).replace(path.sep, "/")
+                        pathinput.value = response.replace(path.sep, "/")
                         pathinput.on_input_submitted(
                             SimpleNamespace(value=pathinput.value)
                         )
 
-                self.push_screen(ZDToDirectory(), on_response)
+                if config["plugins"]["zoxide"]["source"] == "zoxide":
+                    if shutil.which("zoxide") is None:
+                        self.notify(
+                            "Zoxide is not installed or not in PATH.",
+                            title="Zoxide",
+                            severity="error",
+                        )
+                    source = self.zoxide_cache
+                else:
+                    source = self.frecency_store
+                self.push_screen(ZDToDirectory(source), on_response)
+            # path index
+            case key if (
+                self.path_index is not None
+                and key in config["plugins"]["path_index"]["keybinds"]
+            ):
+
+                def on_jump_response(response: str | None) -> None:
+                    """Go to the chosen folder, or to the folder of the chosen file."""
+                    if not response:
+                        return
+                    if path.isdir(response):
+                        self.cd(response)
+                    else:
+                        self.cd(
+                            path.dirname(response), focus_on=path.basename(response)
+                        )
+
+                self.push_screen(JumpToPath(self.path_index), on_jump_response)
             # zen mode
             case key if (
                 config["plugins"]["zen_mode"]["enabled"]
@@ -352,6 +404,7 @@ class Application(App, inherit_bindings=False):
             )
         ):
             return
+        self.frecency_store.save()
         if config["settings"]["cd_on_quit"]:
             with open(
                 path.join(VAR_TO_DIR["CONFIG"], "rovr_quit_cd_path"), "w"
@@ -367,37 +420,109 @@ class Application(App, inherit_bindings=False):
         focus_on: str | None = None,
         callback: Callable | None = None,
     ) -> None:
-        # Makes sure `directory` is a directory, or chdir will fail with exception
-        directory = ensure_existing_directory(directory)
+        self._cd_target = directory
+        self._cd(directory, add_to_history, focus_on, callback)
 
-        if normalise(getcwd()) == normalise(directory):
+    @work(exclusive=True, group="cd")
+    async def _cd(
+        self,
+        directory: str,
+        add_to_history: bool,
+        focus_on: str | None,
+        callback: Callable | None,
+    ) -> None:
+        """Go to a directory, without waiting on a hung mount."""
+        try:
+            entered = await probe_pool.run_async(self._enter_directory, directory)
+        except ProbeTimeout:
+            self.notify(
+                f"{directory} did not respond in time.",
+                title="Unresponsive",
+                severity="error",
+            )
+            return
+        if entered is None:
+            # a newer cd replaced this one
+            return
+        directory, same_directory = entered
+        if same_directory:
             add_to_history = False
         else:
-            chdir(directory)
+            self.frecency_store.add(normalise(directory))
 
         self.query_one("#file_list").update_file_list(
-            add_to_session=add_to_history, focus_on=focus_on
+            add_to_session=add_to_history, focus_on=focus_on, callback=callback
         )
-        if callback:
-            self.call_later(callback)
 
-    @work
-    async def watch_for_changes_and_update(self) -> None:
-        self._cwd = getcwd()
-        self._items = listdir(self._cwd)
-        while True:
-            await asyncio.sleep(1)
-            new_cwd = getcwd()
+    def _enter_directory(self, directory: str) -> tuple[str, bool] | None:
+        """Change the working directory, in the probe pool.
+
+        Args:
+            directory (str): The directory to go to.
+
+        Returns:
+            tuple[str, bool] | None: The directory that was entered, which is the closest existing parent
+                if it doesn't exist, and whether it already was the working directory, or None if a newer
+                `cd` replaced this one before it got there.
+        """
+        # Makes sure `directory` is a directory, or chdir will fail with exception
+        existing = ensure_existing_directory(directory)
+        try:
+            same_directory = normalise(getcwd()) == normalise(existing)
+        except FileNotFoundError:
+            # the current directory was removed
+            same_directory = False
+        if self._cd_target != directory:
+            # this finished late, after a hang, so don't go back to it
+            return None
+        if not same_directory:
+            chdir(existing)
+        return existing, same_directory
+
+    def update_watched_directories(self) -> None:
+        """Watch the current directory, and the folder that is being previewed,
+        unless they didn't respond when they were listed."""
+        directories = set()
+        with suppress(NoMatches):
+            file_list = self.query_one("#file_list")
+            if not file_list.entries.unresponsive:
+                directories.add(normalise(getcwd()))
+        with suppress(NoMatches):
+            folder_preview = self.query_one("#folder_preview")
+            if not (
+                folder_preview.entries.unresponsive
+                and folder_preview.entries.directory == folder_preview.enter_into
+            ):
+                directories.add(folder_preview.enter_into)
+        with suppress(AttributeError):
+            self.directory_watcher.watch(directories)
+
+    @work(group="directories_changed")
+    async def on_directories_changed(self, directories: set[str]) -> None:
+        """Reload whatever shows a directory that changed.
+
+        Args:
+            directories (set[str]): The directories that changed.
+        """
+        if self.path_index is not None:
+            self.path_index.update(directories)
+        file_list = self.query_one("#file_list")
+        # getcwd fails if the current directory itself was removed
+        cwd = file_list.entries.directory
+        if cwd in directories:
             try:
-                new_cwd_items = listdir(new_cwd)
-            except PermissionError:
-                continue
-            if self._cwd != new_cwd:
-                self._cwd = new_cwd
-                self._items = listdir(self._cwd)
-            elif self._items != new_cwd_items:
-                self.cd(self._cwd)
-                self._items = new_cwd_items
+                is_dir = await probe_pool.run_async(path.isdir, cwd)
+            except ProbeTimeout:
+                # it hung, so listing it again would too
+                is_dir = None
+            if is_dir:
+                file_list.reload_listing()
+            elif is_dir is False:
+                self.cd(cwd)
+        with suppress(NoMatches):
+            folder_preview = self.query_one("#folder_preview")
+            if folder_preview.entries.directory in directories:
+                folder_preview.reload_listing()
 
     @work
     async def on_resize(self, event: events.Resize) -> None:
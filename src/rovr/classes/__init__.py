@@ -1,6 +1,20 @@
 from .archive import Archive
-from .exceptions import FolderNotFileError
+from .content_search import ContentSearch
+from .directory_watcher import DirectoryWatcher
+from .entry_table import EntryTable
+from .exceptions import FolderNotFileError, ProbeTimeout, ScanCancelled
+from .frecency_store import FrecencyStore
+from .fuzzy_filter import FuzzyFilter
+from .icon_resolver import IconResolver
+from .listing_cache import ListingCache
+from .path_index import PathIndex
+from .preview_cache import PreviewCache
+from .preview_prefetcher import PreviewPrefetcher
+from .probe_pool import ProbePool
+from .selection_strip_cache import SelectionStripCache
 from .session_manager import SessionManager
+from .subtree_search import SubtreeSearch
+from .syntax_highlighter import SyntaxHighlighter
 from .textual_options import (
     ClipboardSelection,
     FileListSelectionWidget,
@@ -13,12 +27,30 @@ from .textual_validators import (
     PathDoesntExist,
 )
 from .theme import RovrThemeClass
+from .virtual_options import VirtualOptions
+from .zoxide_cache import ZoxideCache
 
 __all__ = [
     "RovrThemeClass",
     "Archive",
+    "ContentSearch",
+    "DirectoryWatcher",
+    "EntryTable",
     "FolderNotFileError",
+    "ProbeTimeout",
+    "ScanCancelled",
+    "FrecencyStore",
+    "FuzzyFilter",
+    "IconResolver",
+    "ListingCache",
+    "PathIndex",
+    "PreviewCache",
+    "PreviewPrefetcher",
+    "ProbePool",
+    "SelectionStripCache",
     "SessionManager",
+    "SubtreeSearch",
+    "SyntaxHighlighter",
     "ClipboardSelection",
     "FileListSelectionWidget",
     "PinnedSidebarOption",
@@ -26,4 +58,6 @@ __all__ = [
     "EndsWithRar",
     "IsValidFilePath",
     "PathDoesntExist",
+    "VirtualOptions",
+    "ZoxideCache",
 ]
@@ -0,0 +1,179 @@
+import mmap
+import os
+import re
+from contextlib import suppress
+
+from rovr.functions.utils import sniff_file
+
+from .subtree_search import SubtreeSearch
+
+# files at least this big are mapped into memory instead of read in one go
+MMAP_THRESHOLD = 1024 * 1024
+# how much of a file is searched between checks for cancellation
+CHUNK_SIZE = 4 * 1024 * 1024
+# the most matching lines kept from a single file
+MAX_MATCHES_PER_FILE = 100
+# the most characters of a matching line that are kept
+SNIPPET_LENGTH = 200
+# the biggest utf-16 file that is searched, as it has to be decoded first
+MAX_WIDE_FILE_SIZE = 16 * 1024 * 1024
+
+
+class ContentSearch(SubtreeSearch):
+    """Walks a directory tree like `SubtreeSearch`, collecting the lines of files that contain some text.
+
+    Every thread searches the files of the directories it scans, so the
+    pool also bounds how many files are open at once. Files are sniffed
+    with `sniff_file`, whose result the preview shares, and binary ones
+    are skipped. Small files are read in one go, and big ones are mapped
+    into memory and searched a chunk at a time, so a search can be
+    cancelled partway through a huge file. Latin-1 files are searched for
+    the query in latin-1, and utf-16 files are decoded first. The search is case-insensitive,
+    unless the query has an uppercase letter in it.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        query: str,
+        excluded: set[str],
+        limit: int,
+        workers: int = 4,
+    ) -> None:
+        """
+        Initialise the search. Nothing is walked until `start` is called.
+
+        Args:
+            root (str): The directory to search in.
+            query (str): The text to look for in files.
+            excluded (set[str]): The names of folders to not walk into.
+            limit (int): Stop after this many matching lines.
+            workers (int): The number of threads that scan directories and search files.
+        """
+        super().__init__(root, query, excluded, limit, workers)
+        # no encoding that is searched in makes the query longer than utf-8
+        self._needle_length = len(query.encode("utf-8"))
+        self._flags = 0 if query != query.lower() else re.IGNORECASE
+        self._patterns = {"utf-8": self._compile("utf-8")}
+        with suppress(UnicodeEncodeError):
+            # a query that can't be in latin-1 can't be in a latin-1 file
+            self._patterns["latin-1"] = self._compile("latin-1")
+
+    def _compile(self, encoding: str) -> re.Pattern[bytes]:
+        return re.compile(re.escape(self.query.encode(encoding)), self._flags)
+
+    def _search_item(self, item: os.DirEntry, is_dir: bool) -> list[tuple]:
+        """Search the contents of one item of a directory being scanned.
+
+        Args:
+            item (os.DirEntry): The item.
+            is_dir (bool): Whether it is a folder (and not a link to one).
+
+        Returns:
+            list[tuple]: The path, line number (starting from 1) and text of every matching line.
+        """
+        try:
+            # also skips things like pipes, which would block when read
+            if is_dir or not item.is_file():
+                return []
+        except OSError:
+            return []
+        file_path = item.path.replace("\\", "/")
+        try:
+            encoding = sniff_file(file_path)
+            if encoding is None:
+                return []
+            with open(file_path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                if size == 0:
+                    return []
+                if encoding not in self._patterns:
+                    if not encoding.startswith("utf-") or size > MAX_WIDE_FILE_SIZE:
+                        return []
+                    # every character takes more than one byte, so it's
+                    # searched as utf-8 instead
+                    data = file.read().decode(encoding, errors="replace")
+                    return self._find_lines(file_path, data.encode("utf-8"), "utf-8")
+                if size < MMAP_THRESHOLD:
+                    return self._find_lines(file_path, file.read(), encoding)
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return self._find_lines(file_path, data, encoding)
+        except (OSError, ValueError):
+            # no permission, removed, or emptied before it could be mapped
+            return []
+
+    def _find(
+        self, data: bytes | mmap.mmap, position: int, pattern: re.Pattern[bytes]
+    ) -> int:
+        """Find the next match, a chunk at a time.
+
+        Args:
+            data (bytes | mmap.mmap): The contents of the file.
+            position (int): Where to start looking from.
+            pattern (re.Pattern[bytes]): The query, in the file's encoding.
+
+        Returns:
+            int: Where the match starts, or -1 if there isn't one or the search was cancelled.
+        """
+        size = len(data)
+        while position < size and not self.cancelled.is_set():
+            end = min(size, position + CHUNK_SIZE)
+            match = pattern.search(data, position, end)
+            if match is not None:
+                return match.start()
+            if end == size:
+                break
+            # a match can start in this chunk and end in the next one
+            position = end - self._needle_length + 1
+        return -1
+
+    def _count_newlines(self, data: bytes | mmap.mmap, start: int, end: int) -> int:
+        """Count the newlines in part of a file, a chunk at a time.
+
+        Slicing a mapped file copies it, so this only ever copies a chunk,
+        and checks for cancellation between them.
+
+        Args:
+            data (bytes | mmap.mmap): The contents of the file.
+            start (int): Where to start counting from.
+            end (int): Where to stop counting.
+
+        Returns:
+            int: The number of newlines, or how many were counted before the search was cancelled.
+        """
+        count = 0
+        while start < end and not self.cancelled.is_set():
+            chunk_end = min(end, start + CHUNK_SIZE)
+            count += data[start:chunk_end].count(b"\n")
+            start = chunk_end
+        return count
+
+    def _find_lines(
+        self, file_path: str, data: bytes | mmap.mmap, encoding: str
+    ) -> list[tuple[str, int, str]]:
+        pattern = self._patterns[encoding]
+        found = []
+        line_number = 1
+        # where the newlines have been counted up to
+        counted_to = 0
+        start = self._find(data, 0, pattern)
+        while start != -1:
+            line_start = data.rfind(b"\n", 0, start) + 1
+            line_end = data.find(b"\n", start)
+            if line_end == -1:
+                line_end = len(data)
+            line_number += self._count_newlines(data, counted_to, line_start)
+            if self.cancelled.is_set():
+                break
+            counted_to = line_start
+            # keep the match in the snippet, even in a very long line
+            snippet_start = max(line_start, start - SNIPPET_LENGTH // 2)
+            snippet = data[
+                snippet_start : min(line_end, snippet_start + SNIPPET_LENGTH * 4)
+            ].decode(encoding, errors="replace")
+            found.append((file_path, line_number, snippet.strip()[:SNIPPET_LENGTH]))
+            if len(found) >= MAX_MATCHES_PER_FILE:
+                break
+            # only show every line once, even if it matches more than once
+            start = self._find(data, line_end + 1, pattern)
+        return found
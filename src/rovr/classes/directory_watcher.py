@@ -0,0 +1,320 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import re
+import struct
+import sys
+from typing import Callable
+
+from .exceptions import ProbeTimeout
+from .probe_pool import probe_pool
+
+# from <sys/inotify.h>
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x01000000
+# only what changes the listing of a directory
+WATCH_MASK = (
+    IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+# wd, mask, cookie, len, followed by `len` bytes of name
+EVENT_HEADER = struct.Struct("iIII")
+# inotify only sees changes made through this machine's kernel, so changes
+# made by other clients of these are only noticed by polling
+NETWORK_FILESYSTEMS = {
+    "9p",
+    "afs",
+    "ceph",
+    "cifs",
+    "davfs",
+    "fuse",
+    "glusterfs",
+    "lustre",
+    "ncpfs",
+    "nfs",
+    "nfs4",
+    "smb3",
+    "smbfs",
+}
+
+
+def _mount_types() -> list[tuple[str, str]]:
+    """Get every mount point, and its filesystem type.
+
+    Returns:
+        list[tuple[str, str]]: The mount points, longest first, with their types, or nothing if they can't be read.
+    """
+    try:
+        with open("/proc/self/mountinfo", "r", encoding="utf-8") as file:
+            lines = file.readlines()
+    except OSError:
+        return []
+    mounts = []
+    for line in lines:
+        # the mount point is the fifth field, and the type follows a lone "-"
+        fields = line.split()
+        try:
+            mount_point = fields[4]
+            fstype = fields[fields.index("-", 6) + 1]
+        except (IndexError, ValueError):
+            continue
+        # spaces and the like are escaped as octal, like \040
+        mount_point = re.sub(
+            r"\\([0-7]{3})", lambda match: chr(int(match[1], 8)), mount_point
+        )
+        mounts.append((mount_point, fstype))
+    mounts.sort(key=lambda mount: len(mount[0]), reverse=True)
+    return mounts
+
+
+def _is_network_filesystem(directory: str, mounts: list[tuple[str, str]]) -> bool:
+    for mount_point, fstype in mounts:
+        if directory == mount_point or directory.startswith(
+            mount_point.rstrip("/") + "/"
+        ):
+            return fstype in NETWORK_FILESYSTEMS or fstype.startswith("fuse.")
+    return False
+
+
+def _load_inotify() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    # musl and glibc both have these, but check anyways
+    if not all(
+        hasattr(libc, name)
+        for name in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch")
+    ):
+        return None
+    return libc
+
+
+class DirectoryWatcher:
+    """Calls back when the listing of a watched directory changes.
+
+    On Linux, this uses inotify through ctypes, so nothing runs until the
+    kernel reports a change. Anywhere else, for directories that inotify
+    can't watch, and for ones on network filesystems (where inotify misses
+    changes made by other clients), the directories' modification times
+    are polled instead, through the probe pool so that a hung mount can't
+    block the event loop. Changes are collected for `debounce` seconds, so
+    that a burst of them only calls back once.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[set[str]], None],
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialise the watcher. Nothing is watched until `start` is called.
+
+        Args:
+            on_change (Callable[[set[str]], None]): Called with the directories that changed.
+            debounce (float): How long to collect changes for, before calling back.
+            poll_interval (float): How often to check directories that are polled.
+        """
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._libc = _load_inotify()
+        self._fd: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # directory -> watch descriptor
+        self._watches: dict[str, int] = {}
+        self._watch_to_directory: dict[int, str] = {}
+        # directory -> st_mtime_ns, for directories that inotify isn't
+        # watching, or False if it never responded
+        self._polled: dict[str, int | None | bool] = {}
+        self._poll_task: asyncio.Task | None = None
+        # the directories that should be watched, and the ones that are
+        # still being set up
+        self._wanted: set[str] = set()
+        self._adding: set[str] = set()
+        self._add_task: asyncio.Task | None = None
+        self._changed: set[str] = set()
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether inotify is being used."""
+        return self._fd is not None
+
+    def start(self) -> None:
+        """Start watching, from within the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        if self._libc is not None and self._fd is None:
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+                self._loop.add_reader(fd, self._read_events)
+
+    def stop(self) -> None:
+        """Stop watching everything."""
+        self.watch(set())
+        if self._add_task is not None:
+            self._add_task.cancel()
+            self._add_task = None
+        if self._fd is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def watch(self, directories: set[str]) -> None:
+        """Watch exactly these directories.
+
+        New directories are set up in a task, as looking at them can block.
+
+        Args:
+            directories (set[str]): The normalised paths of the directories to watch.
+        """
+        self._wanted = set(directories)
+        for directory in set(self._watches) - directories:
+            watch = self._watches.pop(directory)
+            self._watch_to_directory.pop(watch, None)
+            if self._fd is not None:
+                self._libc.inotify_rm_watch(self._fd, watch)
+        for directory in set(self._polled) - directories:
+            del self._polled[directory]
+        self._adding |= directories - set(self._watches) - set(self._polled)
+        if self._adding and self._add_task is None and self._loop is not None:
+            self._add_task = self._loop.create_task(self._add())
+
+    async def _add(self) -> None:
+        """Start watching the directories that were asked for, while there are any."""
+        network_mounts = None
+        while self._adding:
+            directory = self._adding.pop()
+            if directory not in self._wanted:
+                continue
+            if self._fd is not None:
+                if network_mounts is None:
+                    network_mounts = _mount_types()
+                if not _is_network_filesystem(directory, network_mounts):
+                    try:
+                        # looking the path up can hang on a dead mount too
+                        watch = await probe_pool.run_async(
+                            self._libc.inotify_add_watch,
+                            self._fd,
+                            os.fsencode(directory),
+                            WATCH_MASK,
+                        )
+                    except ProbeTimeout:
+                        watch = -1
+                    if watch >= 0:
+                        if directory in self._wanted:
+                            self._watches[directory] = watch
+                            self._watch_to_directory[watch] = directory
+                        elif watch not in self._watch_to_directory:
+                            # it was unwatched while this was being set up
+                            self._libc.inotify_rm_watch(self._fd, watch)
+                        continue
+            # a network filesystem, out of watches, no permission, no inotify
+            # at all, or it didn't respond in time
+            mtime = await self._mtime_of(directory)
+            if directory in self._wanted and directory not in self._watches:
+                self._polled[directory] = mtime
+        self._add_task = None
+        if self._polled and self._poll_task is None and self._loop is not None:
+            self._poll_task = self._loop.create_task(self._poll())
+
+    @staticmethod
+    def _stat_mtime(directory: str) -> int | None:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    async def _mtime_of(self, directory: str) -> int | None | bool:
+        """Get the modification time of a directory, without waiting on a hung mount.
+
+        Args:
+            directory (str): The directory.
+
+        Returns:
+            int | None | bool: The modification time, None if it can't be stat-ed,
+                or False if it didn't respond in time.
+        """
+        try:
+            return await probe_pool.run_async(self._stat_mtime, directory)
+        except ProbeTimeout:
+            return False
+
+    def _read_events(self) -> None:
+        """Read every pending inotify event, when the file descriptor is readable."""
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                return
+            if not data:
+                break
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                watch, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    # events were dropped, so anything could have changed
+                    self._changed.update(self._watches)
+                    continue
+                directory = self._watch_to_directory.get(watch)
+                if directory is None:
+                    continue
+                self._changed.add(directory)
+                if mask & IN_IGNORED:
+                    # the directory was removed, so the watch is gone too
+                    del self._watch_to_directory[watch]
+                    self._watches.pop(directory, None)
+        self._schedule_flush()
+
+    async def _poll(self) -> None:
+        """Check the modification time of polled directories, while there are any."""
+        while self._polled:
+            await asyncio.sleep(self.poll_interval)
+            directories = list(self._polled)
+            mtimes = await asyncio.gather(*map(self._mtime_of, directories))
+            for directory, new_mtime in zip(directories, mtimes):
+                if new_mtime is False or directory not in self._polled:
+                    # a directory that didn't respond is checked again next time
+                    continue
+                if self._polled[directory] is False:
+                    # it responded for the first time, so there is nothing to compare with
+                    self._polled[directory] = new_mtime
+                elif new_mtime != self._polled[directory]:
+                    self._polled[directory] = new_mtime
+                    self._changed.add(directory)
+            self._schedule_flush()
+        self._poll_task = None
+
+    def _schedule_flush(self) -> None:
+        if self._changed and self._flush_handle is None and self._loop is not None:
+            self._flush_handle = self._loop.call_later(self.debounce, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        changed, self._changed = self._changed, set()
+        if changed:
+            self.on_change(changed)
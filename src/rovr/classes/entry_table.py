@@ -0,0 +1,400 @@
+import os
+import re
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from threading import Event
+from time import monotonic
+from typing import Callable, Sequence
+
+from .exceptions import ScanCancelled
+from .icon_resolver import icon_resolver
+
+IS_DIR = 1
+IS_SYMLINK = 2
+IS_JUNCTION = 4
+
+SORT_ORDERS = ("name", "natural", "size", "mtime", "extension")
+# the orders that depend on the stats of the items, which can change without
+# the directory changing
+STAT_SORT_ORDERS = ("size", "mtime")
+# how long stats are trusted for, in seconds, once a table is reused from the
+# listing cache, so going back and forth doesn't stat everything again
+STATS_TTL = 5.0
+# the number of items that each thread stats at once
+STAT_BATCH_SIZE = 256
+# the number of items scanned between checks for cancellation
+CANCEL_CHECK_INTERVAL = 1024
+
+_stat_pool: ThreadPoolExecutor | None = None
+
+
+def _stat_batch(paths: list[str]) -> list[os.stat_result | None]:
+    stats = []
+    for item_path in paths:
+        try:
+            stats.append(os.stat(item_path))
+        except OSError:
+            stats.append(None)
+    return stats
+
+
+def _natural_key(sort_key: str) -> list[str | int]:
+    # splitting on a capture group puts the numbers at every odd index,
+    # so two keys never have a str and an int compared with each other
+    parts: list[str | int] = re.split(r"(\d+)", sort_key)
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
+# a rough guess of how much a row takes up, excluding its name and sort key
+# (the list slots, the flag, the icon index and an empty stat slot)
+ROW_OVERHEAD = 40
+
+
+class EntryTable:
+    """The items of a directory, stored as columns instead of one object per item.
+
+    Folders come first, then files, each sorted case-insensitively by name.
+    Rows are referred to by their index, which is also the option index in
+    an unfiltered `FileList`.
+
+    Attributes:
+        directory (str): The directory that was scanned.
+        names (list[str]): The name of every item.
+        sort_keys (list[str]): The key that every item was sorted with.
+        flags (bytearray): A mix of `IS_DIR`, `IS_SYMLINK` and `IS_JUNCTION` for every item.
+        icon_indexes (array): The index into `icons` for every item.
+        icons (list[list]): The unique icons in the directory.
+        stats (list[os.stat_result | None]): The stat of every item, only filled when asked for.
+        folder_count (int): The number of folders, which are the first rows.
+        error (bool): Whether the directory couldn't be scanned.
+        unresponsive (bool): Whether the scan was given up on, because it took too long.
+    """
+
+    __slots__ = (
+        "directory",
+        "names",
+        "sort_keys",
+        "flags",
+        "icon_indexes",
+        "icons",
+        "stats",
+        "folder_count",
+        "error",
+        "unresponsive",
+        "_keys",
+        "_orders",
+        "_stats_at",
+        "_stats_outdated",
+    )
+
+    def __init__(
+        self, directory: str, error: bool = False, unresponsive: bool = False
+    ) -> None:
+        """
+        Initialise an empty table.
+
+        Args:
+            directory (str): The directory that the table is for.
+            error (bool): Whether the directory couldn't be scanned.
+            unresponsive (bool): Whether the scan was given up on, which is also an error.
+        """
+        self.directory = directory
+        self.names: list[str] = []
+        self.sort_keys: list[str] = []
+        self.flags = bytearray()
+        self.icon_indexes = array("I")
+        self.icons: list[list] = []
+        self.stats: list[os.stat_result | None] = []
+        self.folder_count = 0
+        self.error = error or unresponsive
+        self.unresponsive = unresponsive
+        # sort order -> the key of every row
+        self._keys: dict[str, list] = {}
+        # (sort order, reverse) -> the rows in that order
+        self._orders: dict[tuple[str, bool], Sequence[int]] = {}
+        # when the stat column was last filled, and whether the items may
+        # have changed since
+        self._stats_at = 0.0
+        self._stats_outdated = False
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def scan(cls, directory: str, cancelled: Event | None = None) -> "EntryTable":
+        """Scan a directory into a table.
+
+        Args:
+            directory (str): The normalised path to the directory.
+            cancelled (Event | None): Stops the scan once it is set.
+
+        Returns:
+            EntryTable: The items in the directory, with `error` set if it couldn't be scanned.
+
+        Raises:
+            ScanCancelled: If `cancelled` was set during the scan.
+        """
+        scanned = []
+        try:
+            with os.scandir(directory) as listed_dir:
+                # is_dir and is_symlink only use the type from the scan,
+                # except for the rare filesystem that doesn't report it
+                for item in listed_dir:
+                    scanned.append((
+                        not item.is_dir(),
+                        item.name.lower(),
+                        item.name,
+                        (IS_SYMLINK if item.is_symlink() else 0)
+                        | (IS_JUNCTION if item.is_junction() else 0),
+                    ))
+                    if (
+                        cancelled is not None
+                        and len(scanned) % CANCEL_CHECK_INTERVAL == 0
+                        and cancelled.is_set()
+                    ):
+                        raise ScanCancelled(directory)
+        except OSError:
+            print(f"PermissionError: Unable to access {directory}")
+            return cls(directory, error=True)
+        if cancelled is not None and cancelled.is_set():
+            raise ScanCancelled(directory)
+        table = cls(directory)
+        # folders first, then case-insensitive names
+        scanned.sort()
+        icons = icon_resolver.resolve(
+            [sort_key for _, sort_key, _, _ in scanned],
+            [not is_file for is_file, _, _, _ in scanned],
+        )
+        # icons that are the same are the same list, so index them by identity
+        icon_to_index: dict[int, int] = {}
+        for (is_file, sort_key, name, flags), icon in zip(scanned, icons):
+            if not is_file:
+                flags |= IS_DIR
+                table.folder_count += 1
+            icon_index = icon_to_index.get(id(icon))
+            if icon_index is None:
+                icon_index = icon_to_index[id(icon)] = len(table.icons)
+                table.icons.append(icon)
+            table.names.append(name)
+            table.sort_keys.append(sort_key)
+            table.flags.append(flags)
+            table.icon_indexes.append(icon_index)
+        table.stats = [None] * len(table.names)
+        print(
+            f"Found {table.folder_count} folders and {len(table) - table.folder_count} files in {directory}"
+        )
+        return table
+
+    def path_of(self, row: int) -> str:
+        """Get the full path of an item.
+
+        Args:
+            row (int): The row of the item.
+
+        Returns:
+            str: The path to the item.
+        """
+        return path.join(self.directory, self.names[row]).replace("\\", "/")
+
+    def icon_of(self, row: int) -> list:
+        """Get the icon of an item.
+
+        Args:
+            row (int): The row of the item.
+
+        Returns:
+            list: The icon and its colour.
+        """
+        return self.icons[self.icon_indexes[row]]
+
+    def is_dir(self, row: int) -> bool:
+        """Check whether an item is a folder (or a link to one).
+
+        Args:
+            row (int): The row of the item.
+
+        Returns:
+            bool: Whether the item is a folder.
+        """
+        return bool(self.flags[row] & IS_DIR)
+
+    def stat(self, row: int, refresh: bool = False) -> os.stat_result | None:
+        """Get the stat of an item, filling the stat column if it is empty.
+
+        Args:
+            row (int): The row of the item.
+            refresh (bool): Stat the item again, even if it was already stat-ed.
+
+        Returns:
+            os.stat_result | None: The stat of the item, or None if it can't be stat-ed.
+        """
+        if refresh or self.stats[row] is None:
+            try:
+                self.stats[row] = os.stat(self.path_of(row))
+            except OSError:
+                return None
+        return self.stats[row]
+
+    def diff(self, newer: "EntryTable") -> tuple[list[str], list[str], list[str]]:
+        """Compare the table with a newer scan of the same directory.
+
+        Args:
+            newer (EntryTable): The newer scan.
+
+        Returns:
+            tuple[list[str], list[str], list[str]]: The names that were added, removed, and changed type.
+        """
+        old = dict(zip(self.names, self.flags))
+        new = dict(zip(newer.names, newer.flags))
+        added = [name for name in new if name not in old]
+        removed = [name for name in old if name not in new]
+        modified = [
+            name for name, flags in new.items() if name in old and old[name] != flags
+        ]
+        return added, removed, modified
+
+    def fill_stats(self) -> None:
+        """Stat every item that hasn't been stat-ed yet, in batches across a thread pool."""
+        missing = [row for row, item_stat in enumerate(self.stats) if item_stat is None]
+        if not missing:
+            return
+        for row, item_stat in zip(missing, self._stat_rows(missing)):
+            self.stats[row] = item_stat
+        self._stats_at = monotonic()
+
+    def _stat_rows(self, rows: list[int]) -> list[os.stat_result | None]:
+        """Stat some items, in batches across a thread pool.
+
+        Args:
+            rows (list[int]): The rows of the items.
+
+        Returns:
+            list[os.stat_result | None]: The stat of every item, or None if it can't be stat-ed.
+        """
+        global _stat_pool
+        if _stat_pool is None:
+            _stat_pool = ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+                thread_name_prefix="rovr-stat",
+            )
+        batches = [
+            rows[start : start + STAT_BATCH_SIZE]
+            for start in range(0, len(rows), STAT_BATCH_SIZE)
+        ]
+        stats = []
+        for batch_stats in _stat_pool.map(
+            _stat_batch, [[self.path_of(row) for row in batch] for batch in batches]
+        ):
+            stats.extend(batch_stats)
+        return stats
+
+    def mark_stats_outdated(self) -> None:
+        """Note that the items may have changed, like when the table is reused from a cache.
+
+        Editing a file doesn't change its directory's modification time, so
+        the next stat based order stats every item again, if the stats are
+        older than `STATS_TTL`. Nothing is thrown away until then.
+        """
+        self._stats_outdated = True
+
+    def _stats_stale(self) -> bool:
+        return self._stats_outdated and monotonic() - self._stats_at > STATS_TTL
+
+    def _refresh_stats(self) -> list[os.stat_result | None]:
+        """Stat every item again, dropping the orders that came from the old stats.
+
+        Returns:
+            list[os.stat_result | None]: The new stat column.
+        """
+        stats = self._stat_rows(list(range(len(self.names))))
+        # replaced instead of changed in place, as another view of the same
+        # table may still be sorting with, or showing, the old ones
+        self.stats = stats
+        self._keys = {
+            sort_by: keys
+            for sort_by, keys in self._keys.items()
+            if sort_by not in STAT_SORT_ORDERS
+        }
+        self._orders = {
+            order: rows
+            for order, rows in self._orders.items()
+            if order[0] not in STAT_SORT_ORDERS
+        }
+        self._stats_at = monotonic()
+        self._stats_outdated = False
+        return stats
+
+    def _sort_key(self, sort_by: str) -> Callable[[int], object]:
+        """Get the key function for a sort order, computing every key once.
+
+        Args:
+            sort_by (str): One of `SORT_ORDERS`.
+
+        Returns:
+            Callable[[int], object]: Gets the key of a row.
+        """
+        stale = sort_by in STAT_SORT_ORDERS and self._stats_stale()
+        keys = None if stale else self._keys.get(sort_by)
+        if keys is None:
+            sort_keys = self.sort_keys
+            match sort_by:
+                case "natural":
+                    keys = [_natural_key(sort_key) for sort_key in sort_keys]
+                case "size" | "mtime":
+                    if stale:
+                        stats = self._refresh_stats()
+                    else:
+                        self.fill_stats()
+                        stats = self.stats
+                    attribute = "st_size" if sort_by == "size" else "st_mtime_ns"
+                    keys = [
+                        (
+                            -1 if item_stat is None else getattr(item_stat, attribute),
+                            sort_key,
+                        )
+                        for item_stat, sort_key in zip(stats, sort_keys)
+                    ]
+                case "extension":
+                    keys = [
+                        (path.splitext(sort_key)[1], sort_key) for sort_key in sort_keys
+                    ]
+                case _:
+                    keys = sort_keys
+            self._keys[sort_by] = keys
+        return keys.__getitem__
+
+    def sorted_rows(self, sort_by: str, reverse: bool = False) -> Sequence[int]:
+        """Get the rows in a sort order, keeping folders before files.
+
+        Args:
+            sort_by (str): One of `SORT_ORDERS`.
+            reverse (bool): Whether to reverse the order of the folders and of the files.
+
+        Returns:
+            Sequence[int]: The rows, in the order they should be shown.
+        """
+        if sort_by == "name" and not reverse:
+            # the order that the table was scanned in
+            return range(len(self.names))
+        if sort_by in STAT_SORT_ORDERS and self._stats_stale():
+            order = None
+        else:
+            order = self._orders.get((sort_by, reverse))
+        if order is None:
+            key = self._sort_key(sort_by)
+            order = sorted(range(self.folder_count), key=key, reverse=reverse) + sorted(
+                range(self.folder_count, len(self.names)), key=key, reverse=reverse
+            )
+            self._orders[sort_by, reverse] = order
+        return order
+
+    @property
+    def nbytes(self) -> int:
+        """A rough estimate of how much memory the table takes up."""
+        return sum(
+            ROW_OVERHEAD + sys.getsizeof(name) + sys.getsizeof(sort_key)
+            for name, sort_key in zip(self.names, self.sort_keys)
+        )
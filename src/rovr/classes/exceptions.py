@@ -4,3 +4,11 @@ class FolderNotFileError(Exception):
     def __init__(self, message: str) -> None:
         super().__init__(message)
         self.message = message
+
+
+class ScanCancelled(Exception):
+    """Raised inside a directory scan when it is no longer needed."""
+
+
+class ProbeTimeout(Exception):
+    """Raised when a filesystem call doesn't respond before its deadline."""
@@ -0,0 +1,337 @@
+import json
+import os
+import struct
+import time
+from threading import Lock, Timer
+
+from platformdirs import PlatformDirs
+
+from rovr.functions.path import normalise
+
+from .exceptions import ProbeTimeout
+from .probe_pool import probe_pool
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+# once the ranks add up to more than this, they are all scaled down, and
+# folders that weren't visited in a while are forgotten
+MAX_AGE = 10_000
+# how long the ranked folders are kept for, before they are ranked again
+RANK_TTL = 60
+# how long to wait after a visit before saving, so a burst of them saves once
+SAVE_DELAY = 2.0
+# the version of zoxide's database that can be imported
+ZOXIDE_VERSION = 3
+# how long to wait for a folder to say whether it still exists, in seconds,
+# as queries run on every key press
+EXISTS_TIMEOUT = 0.1
+
+
+def zoxide_database_path() -> str:
+    """Get where zoxide keeps its database.
+
+    Returns:
+        str: The path to `db.zo`, which may not exist.
+    """
+    data_dir = (
+        os.environ.get("_ZO_DATA_DIR")
+        or PlatformDirs("zoxide", appauthor=False).user_data_dir
+    )
+    return os.path.join(data_dir, "db.zo")
+
+
+def read_zoxide_database(file_path: str) -> dict[str, list]:
+    """Read the folders out of a zoxide database.
+
+    Args:
+        file_path (str): The path to `db.zo`.
+
+    Returns:
+        dict[str, list]: Every folder, with its rank and when it was last visited, or nothing if it can't be read.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            data = file.read()
+        # bincode: a u32 version, then a u64 count of (u64 length + utf-8
+        # path, f64 rank, u64 last accessed) entries, all little endian
+        (version,) = struct.unpack_from("<I", data, 0)
+        if version != ZOXIDE_VERSION:
+            return {}
+        (count,) = struct.unpack_from("<Q", data, 4)
+        offset = 12
+        folders = {}
+        for _ in range(count):
+            (length,) = struct.unpack_from("<Q", data, offset)
+            offset += 8
+            folder = data[offset : offset + length].decode("utf-8")
+            offset += length
+            rank, last_accessed = struct.unpack_from("<dQ", data, offset)
+            offset += 16
+            folders[folder.replace("\\", "/")] = [rank, last_accessed]
+        return folders
+    except (OSError, struct.error, UnicodeDecodeError):
+        return {}
+
+
+def match_keywords(
+    ranked: list[tuple[str, str]], keywords: list[str], limit: int
+) -> list[str]:
+    """Get the first folders that match some keywords, the way zoxide does.
+
+    The keywords have to be in the path in order, and the last one has to
+    be in the last part of it. Matching is case-insensitive.
+
+    Args:
+        ranked (list[tuple[str, str]]): Every folder, best first, with its lowercase path.
+        keywords (list[str]): The keywords, which can be empty to match every folder.
+        limit (int): The maximum number of folders to return.
+
+    Returns:
+        list[str]: The matching folders, best first.
+    """
+    keywords = [keyword.lower() for keyword in keywords]
+    last_keyword = keywords[-1] if keywords else ""
+    found = []
+    for folder, lower_folder in ranked:
+        position = 0
+        for keyword in keywords:
+            position = lower_folder.find(keyword, position)
+            if position == -1:
+                break
+            position += len(keyword)
+        else:
+            if (
+                "/" in last_keyword
+                or last_keyword in lower_folder[lower_folder.rfind("/") + 1 :]
+            ):
+                found.append(folder)
+                if len(found) >= limit:
+                    break
+    return found
+
+
+def _frecency(rank: float, last_accessed: float, now: float) -> float:
+    age = now - last_accessed
+    if age < HOUR:
+        return rank * 4
+    if age < DAY:
+        return rank * 2
+    if age < WEEK:
+        return rank / 2
+    return rank / 4
+
+
+class FrecencyStore:
+    """Remembers the folders that were visited, ranked by how often and how recently.
+
+    This works like zoxide: every visit adds one to a folder's rank, and
+    folders visited in the last hour, day or week count for more. The
+    folders are kept in a JSON file, and ranked in memory, so that a query
+    only needs to go through them in order until enough match. Like zoxide,
+    folders that don't exist anymore are only noticed, and forgotten, when
+    a query matches them. Saving happens in a thread, shortly after a visit.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Initialise the store. Nothing is read until `load` is called.
+
+        Args:
+            file_path (str): Where to keep the visited folders.
+        """
+        self.file_path = file_path
+        # folder -> [rank, last visited]
+        self.folders: dict[str, list] = {}
+        self.imported_zoxide = False
+        # the sum of every rank, kept up to date instead of summed on every visit
+        self._total_rank = 0.0
+        # every folder, best first, with its lowercase path
+        self._ranked: list[tuple[str, str]] | None = None
+        self._ranked_at = 0.0
+        # the folders that were found to exist since they were last ranked
+        self._existing: set[str] = set()
+        self._lock = Lock()
+        self._save_timer: Timer | None = None
+
+    def load(self, zoxide_database: str | None = None) -> None:
+        """Read the visited folders, importing zoxide's folders the first time.
+
+        Args:
+            zoxide_database (str | None): The path to zoxide's database to import, if there is one.
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            folders = data["folders"]
+            imported_zoxide = data["imported_zoxide"]
+        except (OSError, ValueError, KeyError, TypeError):
+            folders, imported_zoxide = {}, False
+        with self._lock:
+            self.folders = folders
+            self.imported_zoxide = imported_zoxide
+            self._total_rank = sum(rank for rank, _ in folders.values())
+            self._ranked = None
+        if (
+            not imported_zoxide
+            and zoxide_database is not None
+            and os.path.exists(zoxide_database)
+        ):
+            self.import_folders(read_zoxide_database(zoxide_database))
+            self.imported_zoxide = True
+            self.save()
+
+    def import_folders(self, folders: dict[str, list]) -> None:
+        """Add folders from somewhere else, keeping the higher rank and later visit of both.
+
+        Args:
+            folders (dict[str, list]): The folders, with their rank and when they were last visited.
+        """
+        with self._lock:
+            for folder, (rank, last_accessed) in folders.items():
+                known = self.folders.get(folder)
+                if known is None:
+                    self.folders[folder] = [rank, last_accessed]
+                else:
+                    known[0] = max(known[0], rank)
+                    known[1] = max(known[1], last_accessed)
+            self._total_rank = sum(rank for rank, _ in self.folders.values())
+            self._ranked = None
+
+    def add(self, folder: str) -> None:
+        """Count a visit to a folder.
+
+        Args:
+            folder (str): The normalised path of the folder.
+        """
+        now = int(time.time())
+        with self._lock:
+            known = self.folders.get(folder)
+            if known is None:
+                self.folders[folder] = [1.0, now]
+            else:
+                known[0] += 1
+                known[1] = now
+            self._total_rank += 1
+            if self._total_rank > MAX_AGE:
+                factor = 0.9 * MAX_AGE / self._total_rank
+                self.folders = {
+                    path: [rank * factor, last_accessed]
+                    for path, (rank, last_accessed) in self.folders.items()
+                    if rank * factor >= 1
+                }
+                self._total_rank = sum(rank for rank, _ in self.folders.values())
+            self._ranked = None
+        self._schedule_save()
+
+    def remove(self, folder: str) -> None:
+        """Forget a folder, like one that doesn't exist anymore.
+
+        Args:
+            folder (str): The normalised path of the folder.
+        """
+        with self._lock:
+            removed = self.folders.pop(folder, None)
+            if removed is None:
+                return
+            self._total_rank -= removed[0]
+            self._ranked = None
+        self._schedule_save()
+
+    def query(self, keywords: list[str], limit: int) -> list[str]:
+        """Get the best ranked folders that match some keywords, see `match_keywords`.
+
+        The current folder isn't included, and folders that don't exist
+        anymore are forgotten.
+
+        Args:
+            keywords (list[str]): The keywords, which can be empty to match every folder.
+            limit (int): The maximum number of folders to return.
+
+        Returns:
+            list[str]: The matching folders, best first.
+        """
+        try:
+            current = normalise(os.getcwd())
+        except OSError:
+            current = None
+        while True:
+            # one more, in case the current folder is one of them
+            folders = [
+                folder
+                for folder in match_keywords(self._ranking(), keywords, limit + 1)
+                if folder != current
+            ][:limit]
+            missing = self._missing(folders)
+            if not missing:
+                return folders
+            for folder in missing:
+                self.remove(folder)
+
+    def _missing(self, folders: list[str]) -> list[str]:
+        """Find the folders that don't exist anymore.
+
+        Args:
+            folders (list[str]): The folders to check.
+
+        Returns:
+            list[str]: The ones that don't exist.
+        """
+        missing = []
+        for folder in folders:
+            if folder in self._existing:
+                continue
+            try:
+                exists = probe_pool.run(os.path.isdir, folder, timeout=EXISTS_TIMEOUT)
+            except ProbeTimeout:
+                # likely a hung mount, so keep it, and don't wait on the rest
+                break
+            if exists:
+                self._existing.add(folder)
+            else:
+                missing.append(folder)
+        return missing
+
+    def _ranking(self) -> list[tuple[str, str]]:
+        now = time.time()
+        with self._lock:
+            if self._ranked is None or now - self._ranked_at > RANK_TTL:
+                self._ranked = [
+                    (folder, folder.lower())
+                    for folder, _ in sorted(
+                        self.folders.items(),
+                        key=lambda item: -_frecency(item[1][0], item[1][1], now),
+                    )
+                ]
+                self._ranked_at = now
+                # check them again, in case some were removed since
+                self._existing = set()
+            return self._ranked
+
+    def _schedule_save(self) -> None:
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = Timer(SAVE_DELAY, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self) -> None:
+        """Write the visited folders to the file now."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            data = json.dumps({
+                "imported_zoxide": self.imported_zoxide,
+                "folders": self.folders,
+            })
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            # write to another file first, so a crash can't leave half of one
+            temporary_path = self.file_path + ".tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(temporary_path, self.file_path)
+        except OSError:
+            pass
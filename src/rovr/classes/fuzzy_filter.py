@@ -0,0 +1,107 @@
+import heapq
+from threading import Event, Lock
+from typing import Sequence
+
+from textual.fuzzy import Matcher
+
+from .trigram_index import TrigramIndex
+
+# the number of labels scored between checks for cancellation
+CANCEL_CHECK_INTERVAL = 1024
+
+
+class FuzzyFilter:
+    """Fuzzy matches a list of labels, ranking the matches by score.
+
+    A fuzzy match needs every character of the query in order, so a label
+    that doesn't match a query can't match a longer one that starts with it.
+    The rows that matched the last query are kept, and when the next query
+    extends it (like when typing another character), only those rows are
+    scored again.
+
+    A query starting with `'` matches the rest of it exactly, and a query
+    with a `*` or `?` in it is a glob. Both go through a `TrigramIndex`,
+    which is only built when it is first needed (or asked for with
+    `build_index`), and is kept for as long as the filter is.
+    """
+
+    def __init__(self, labels: Sequence[str], limit: int) -> None:
+        """
+        Initialise the filter.
+
+        Args:
+            labels (Sequence[str]): The label of every row.
+            limit (int): The maximum number of rows to return.
+        """
+        self.labels = labels
+        self.limit = limit
+        # the last query, and every row that matched it in row order, swapped
+        # together so that a call in another thread always sees a matching pair
+        self._last: tuple[str, Sequence[int]] = ("", range(len(labels)))
+        self._index: TrigramIndex | None = None
+        self._index_lock = Lock()
+
+    def build_index(self) -> TrigramIndex:
+        """Get the trigram index of the labels, building it the first time.
+
+        Returns:
+            TrigramIndex: The index, which takes a while to build for very large listings.
+        """
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = TrigramIndex(self.labels)
+        return self._index
+
+    def filter(self, query: str, cancelled: Event | None = None) -> list[int] | None:
+        """Get the rows whose label matches a query, best first.
+
+        Rows with the same score keep their order (exact and glob matches are
+        all in row order), and only the best `limit` rows are returned. This is safe to call from a thread, even while an
+        older call is still running.
+
+        Args:
+            query (str): The query to match, which mustn't be empty.
+            cancelled (Event | None): Stops matching once it is set.
+
+        Returns:
+            list[int] | None: The matching rows, or None if it was cancelled.
+        """
+        if query.startswith("'"):
+            rows = self.build_index().substring(query[1:], cancelled)
+            return None if rows is None else rows[: self.limit]
+        if "*" in query or "?" in query:
+            rows = self.build_index().glob(query, cancelled)
+            return None if rows is None else rows[: self.limit]
+        query = query.lower()
+        last_query, last_matches = self._last
+        if query.startswith(last_query):
+            candidates = last_matches
+        else:
+            candidates = range(len(self.labels))
+        score = Matcher(query).match
+        labels = self.labels
+        matches: list[int] = []
+        scores: list[float] = []
+        for count, row in enumerate(candidates, 1):
+            row_score = score(labels[row])
+            if row_score > 0:
+                matches.append(row)
+                scores.append(row_score)
+            if (
+                cancelled is not None
+                and count % CANCEL_CHECK_INTERVAL == 0
+                and cancelled.is_set()
+            ):
+                # the matches so far are incomplete, so don't keep them
+                return None
+        self._last = (query, matches)
+        # highest score first, then lowest row
+        order = range(len(matches))
+        if len(matches) > self.limit:
+            order = heapq.nsmallest(
+                self.limit, order, key=lambda index: (-scores[index], index)
+            )
+        else:
+            order = sorted(order, key=lambda index: -scores[index])
+        return [matches[index] for index in order]
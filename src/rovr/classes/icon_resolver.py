@@ -0,0 +1,184 @@
+from os import path
+from typing import Iterable
+
+from rovr.variables.constants import config
+from rovr.variables.maps import ASCII_ICONS, FILE_MAP, FILES_MAP, FOLDER_MAP, ICONS
+
+# marks the end of a pattern in a suffix trie node, which can't clash with a
+# character because every other key is exactly one character long
+_END = ""
+
+
+class _PatternIndex:
+    """The custom icons of one kind (files or folders), compiled for lookups.
+
+    Exact patterns go into a dict, and endswith patterns go into a trie of
+    their reversed characters, so a name is matched against every pattern
+    by walking its own characters backwards once. Each pattern remembers
+    its position in the config, because earlier entries win.
+    """
+
+    def __init__(self, custom_icons: list[dict]) -> None:
+        """
+        Compile the custom icons.
+
+        Args:
+            custom_icons (list[dict]): The `[[icons.files]]` or `[[icons.folders]]` entries.
+        """
+        # name -> (priority, icon)
+        self.exact: dict[str, tuple[int, list]] = {}
+        self.suffixes: dict = {}
+        for priority, custom_icon in enumerate(custom_icons):
+            pattern = custom_icon["pattern"].lower()
+            icon = [custom_icon["icon"], custom_icon["color"]]
+            if custom_icon.get("match_type", "exact") == "endswith":
+                node = self.suffixes
+                for char in reversed(pattern):
+                    node = node.setdefault(char, {})
+                node.setdefault(_END, (priority, icon))
+            else:
+                self.exact.setdefault(pattern, (priority, icon))
+
+    def __bool__(self) -> bool:
+        return bool(self.exact or self.suffixes)
+
+    def match(self, name: str) -> list | None:
+        """Find the earliest custom icon that matches a name.
+
+        Args:
+            name (str): The lowercase name.
+
+        Returns:
+            list | None: The icon and its colour, or None if nothing matched.
+        """
+        best = self.exact.get(name)
+        node = self.suffixes
+        for char in reversed(name):
+            found = node.get(_END)
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            found = node.get(_END)
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found
+        return None if best is None else best[1]
+
+
+class IconResolver:
+    """Works out the icon of a file or folder from its name.
+
+    Everything that only depends on the config is done once when the
+    resolver is made: custom icons are compiled into a `_PatternIndex`, and
+    the name and extension maps point straight at their icons instead of at
+    icon keys. Looking up a name is then a few dict lookups, however many
+    custom icons there are, which is what makes resolving a directory of
+    tens of thousands of items at once cheap.
+    """
+
+    def __init__(self, nerd_font: bool, custom_icons: dict) -> None:
+        """
+        Build the lookup tables.
+
+        Args:
+            nerd_font (bool): Whether nerd font icons are used, instead of ascii ones.
+            custom_icons (dict): The `icons` table of the config.
+        """
+        self.nerd_font = nerd_font
+        self.custom_files = _PatternIndex(custom_icons.get("files", []))
+        self.custom_folders = _PatternIndex(custom_icons.get("folders", []))
+        self.default_file = (ICONS if nerd_font else ASCII_ICONS)["file"]["default"]
+        self.default_folder = (ICONS if nerd_font else ASCII_ICONS)["folder"]["default"]
+        file_icons = ICONS["file"]
+        folder_icons = ICONS["folder"]
+        self.file_names = {
+            name: file_icons.get(key, self.default_file)
+            for name, key in FILES_MAP.items()
+        }
+        self.extensions = {
+            extension: file_icons.get(key, self.default_file)
+            for extension, key in FILE_MAP.items()
+        }
+        self.folder_names = {
+            name: folder_icons.get(key, self.default_folder)
+            for name, key in FOLDER_MAP.items()
+        }
+
+    def file_icon(self, name: str) -> list:
+        """Get the icon of a file.
+
+        Args:
+            name (str): The lowercase name of the file.
+
+        Returns:
+            list: The icon and its colour.
+        """
+        if not self.nerd_font:
+            return self.default_file
+        if self.custom_files:
+            icon = self.custom_files.match(name)
+            if icon is not None:
+                return icon
+        icon = self.file_names.get(name)
+        if icon is not None:
+            return icon
+        # this is for hidden files like `.gitignore` too
+        dot = name.rfind(".")
+        if dot != -1:
+            return self.extensions.get(name[dot:], self.default_file)
+        return self.default_file
+
+    def folder_icon(self, name: str) -> list:
+        """Get the icon of a folder.
+
+        Args:
+            name (str): The lowercase name of the folder.
+
+        Returns:
+            list: The icon and its colour.
+        """
+        if not self.nerd_font:
+            return ASCII_ICONS["folder"].get(name, self.default_folder)
+        if self.custom_folders:
+            icon = self.custom_folders.match(name)
+            if icon is not None:
+                return icon
+        return self.folder_names.get(name, self.default_folder)
+
+    def resolve(self, names: Iterable[str], is_dir: Iterable[bool]) -> list[list]:
+        """Get the icons of many items at once, like a whole directory listing.
+
+        Items that share an icon get the same list, so the result can be
+        deduplicated by identity.
+
+        Args:
+            names (Iterable[str]): The lowercase names of the items.
+            is_dir (Iterable[bool]): Whether each item is a folder.
+
+        Returns:
+            list[list]: The icon and its colour for every item.
+        """
+        file_icon = self.file_icon
+        folder_icon = self.folder_icon
+        return [
+            folder_icon(name) if folder else file_icon(name)
+            for name, folder in zip(names, is_dir)
+        ]
+
+    def for_path(self, location: str, folder: bool) -> list:
+        """Get the icon of an item from its path.
+
+        Args:
+            location (str): The name or path of the item.
+            folder (bool): Whether the item is a folder.
+
+        Returns:
+            list: The icon and its colour.
+        """
+        name = path.basename(location).lower()
+        return self.folder_icon(name) if folder else self.file_icon(name)
+
+
+icon_resolver = IconResolver(config["interface"]["nerd_font"], config.get("icons", {}))
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from os import stat
+from threading import Lock
+from typing import Callable
+
+from .entry_table import EntryTable
+
+
+class ListingCache:
+    """A least recently used cache of directory listings.
+
+    A listing is only reused while the directory's modification time is the
+    same as when it was scanned, so anything that adds, removes or renames an
+    item in the directory invalidates it.
+    """
+
+    def __init__(self, max_entries: int, max_memory: int) -> None:
+        """
+        Initialise the cache.
+
+        Args:
+            max_entries (int): The maximum number of listings to keep.
+            max_memory (int): The rough maximum number of bytes that the listings can take up.
+        """
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.memory = 0
+        # path -> (st_mtime_ns, size, listing)
+        self._entries: OrderedDict[str, tuple[int, int, EntryTable]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, location: str) -> bool:
+        return location in self._entries
+
+    def get(self, location: str, scan: Callable[[str], EntryTable]) -> EntryTable:
+        """Get the listing of a directory, scanning it if the cached one is stale.
+
+        Args:
+            location (str): The normalised path to the directory.
+            scan (Callable[[str], EntryTable]): Scans the directory when there is no usable listing.
+
+        Returns:
+            EntryTable: The items in the directory.
+        """
+        try:
+            mtime = stat(location).st_mtime_ns
+        except OSError:
+            self.invalidate(location)
+            return scan(location)
+        with self._lock:
+            entry = self._entries.get(location)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(location)
+                # the items themselves may have changed, even if the listing didn't
+                entry[2].mark_stats_outdated()
+                return entry[2]
+        listing = scan(location)
+        if listing.error:
+            self.invalidate(location)
+        else:
+            self.put(location, mtime, listing)
+        return listing
+
+    def put(self, location: str, mtime: int, listing: EntryTable) -> None:
+        """Store the listing of a directory.
+
+        Args:
+            location (str): The normalised path to the directory.
+            mtime (int): The `st_mtime_ns` of the directory before it was scanned.
+            listing (EntryTable): The items in the directory.
+        """
+        if self.max_entries <= 0:
+            return
+        size = listing.nbytes
+        if size > self.max_memory:
+            self.invalidate(location)
+            return
+        with self._lock:
+            if location in self._entries:
+                self.memory -= self._entries.pop(location)[1]
+            self._entries[location] = (mtime, size, listing)
+            self.memory += size
+            while len(self._entries) > self.max_entries or (
+                self.memory > self.max_memory
+            ):
+                self.memory -= self._entries.popitem(last=False)[1][1]
+
+    def invalidate(self, location: str) -> None:
+        """Forget the listing of a directory.
+
+        Args:
+            location (str): The normalised path to the directory.
+        """
+        with self._lock:
+            entry = self._entries.pop(location, None)
+            if entry is not None:
+                self.memory -= entry[1]
+
+    def clear(self) -> None:
+        """Forget every listing."""
+        with self._lock:
+            self._entries.clear()
+            self.memory = 0
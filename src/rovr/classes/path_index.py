@@ -0,0 +1,295 @@
+import os
+import sqlite3
+import time
+from queue import Empty, SimpleQueue
+from threading import Event, Lock, Thread
+
+from rovr.functions.utils import lower_thread_priority
+
+# how long to wait between walks of the roots, in seconds
+RESCAN_INTERVAL = 600
+# how many directories are indexed between commits, so searches see progress
+BATCH_SIZE = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    parent TEXT NOT NULL,
+    path TEXT NOT NULL,
+    is_dir INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent);
+-- the modification time of every directory when it was last listed
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+    path, content='entries', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, path) VALUES (new.id, new.path);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, path)
+    VALUES ('delete', old.id, old.path);
+END;
+"""
+
+
+def _subtree_bounds(directory: str) -> tuple[str, str]:
+    # every path under `directory` sorts between `directory/` and `directory0`,
+    # as `0` comes right after `/`
+    prefix = directory.rstrip("/") + "/"
+    return prefix, prefix[:-1] + "0"
+
+
+class PathIndex:
+    """An on-disk index of every path under a few root directories, for locate-style search.
+
+    The paths are kept in an SQLite database, with a trigram full text
+    index over them, so finding the paths that contain some text takes
+    milliseconds, even with millions of them. A background thread with
+    the lowest CPU and IO priority walks the roots, but only lists the
+    directories whose modification time changed since they were last
+    indexed, and the roots are walked again every `RESCAN_INTERVAL`
+    seconds. Directories that are known to have changed (like from the
+    directory watcher) can be queued with `update` in between.
+    """
+
+    def __init__(self, db_path: str, roots: list[str], excluded: set[str]) -> None:
+        """
+        Initialise the index. Nothing is indexed until `start` is called.
+
+        Args:
+            db_path (str): Where to keep the database.
+            roots (list[str]): The normalised paths of the directories to index.
+            excluded (set[str]): The names of folders to not index the contents of.
+        """
+        self.db_path = db_path
+        self.roots = roots
+        self.excluded = excluded
+        # set once the roots were walked for the first time
+        self.ready = Event()
+        self._stopped = Event()
+        self._updates: SimpleQueue[str] = SimpleQueue()
+        self._reader: sqlite3.Connection | None = None
+        self._reader_lock = Lock()
+
+    def start(self) -> None:
+        """Start indexing in the background."""
+        Thread(target=self._run, name="rovr-path-index", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop indexing, which the thread notices within a directory."""
+        self._stopped.set()
+
+    def update(self, directories: set[str]) -> None:
+        """Queue directories to be indexed again, without waiting for the next walk.
+
+        Args:
+            directories (set[str]): The normalised paths of the directories that changed.
+        """
+        for directory in directories:
+            self._updates.put(directory)
+
+    def search(
+        self, query: str, limit: int, folders_only: bool = False
+    ) -> list[tuple[str, bool]]:
+        """Find the indexed paths that contain every word of a query, shortest first.
+
+        Only the first `limit` matches are found, and then sorted, so that
+        a query that is in millions of paths stays fast. Matching is
+        case-insensitive.
+
+        Args:
+            query (str): The words to look for.
+            limit (int): The maximum number of paths to return.
+            folders_only (bool): Whether to only return folders.
+
+        Returns:
+            list[tuple[str, bool]]: The path of every match, and whether it is a folder.
+        """
+        conditions = []
+        parameters: list[str | int] = []
+        # the trigram index can only find words of 3 or more characters, so
+        # shorter words are checked against whatever the index found
+        long_words = [word for word in query.split() if len(word) >= 3]
+        if long_words:
+            conditions.append("entries_fts MATCH ?")
+            parameters.append(
+                " ".join('"' + word.replace('"', '""') + '"' for word in long_words)
+            )
+        for word in query.split():
+            if len(word) < 3:
+                conditions.append("instr(lower(entries.path), ?) > 0")
+                parameters.append(word.lower())
+        if folders_only:
+            conditions.append("entries.is_dir = 1")
+        statement = "SELECT entries.path, entries.is_dir FROM entries"
+        if long_words:
+            statement += " JOIN entries_fts ON entries_fts.rowid = entries.id"
+        if conditions:
+            statement += " WHERE " + " AND ".join(conditions)
+        statement += " LIMIT ?"
+        parameters.append(limit)
+        with self._reader_lock:
+            try:
+                if self._reader is None:
+                    self._reader = sqlite3.connect(
+                        self.db_path, check_same_thread=False
+                    )
+                rows = self._reader.execute(statement, parameters).fetchall()
+            except sqlite3.Error:
+                # not created yet, or locked for too long
+                return []
+        return sorted(
+            ((item_path, bool(is_dir)) for item_path, is_dir in rows),
+            key=lambda match: len(match[0]),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=5)
+        # readers don't block the indexer, and the other way around
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _run(self) -> None:
+        lower_thread_priority()
+        try:
+            connection = self._connect()
+        except (OSError, sqlite3.Error):
+            return
+        try:
+            while not self._stopped.is_set():
+                self._walk(connection, list(self.roots))
+                self.ready.set()
+                next_walk = time.monotonic() + RESCAN_INTERVAL
+                while not self._stopped.is_set() and time.monotonic() < next_walk:
+                    try:
+                        directory = self._updates.get(timeout=1)
+                    except Empty:
+                        continue
+                    if self._should_index(directory):
+                        self._walk(connection, [directory], new_only=True)
+        except sqlite3.Error:
+            # the database is broken or locked, so give up until next time
+            pass
+        finally:
+            connection.close()
+
+    def _should_index(self, directory: str) -> bool:
+        return any(
+            directory == root or directory.startswith(root.rstrip("/") + "/")
+            for root in self.roots
+        ) and self.excluded.isdisjoint(directory.split("/"))
+
+    def _walk(
+        self,
+        connection: sqlite3.Connection,
+        directories: list[str],
+        new_only: bool = False,
+    ) -> None:
+        """Index directories and the folders under them.
+
+        Args:
+            connection (sqlite3.Connection): The connection to write with.
+            directories (list[str]): The directories to start from.
+            new_only (bool): Whether to only walk into folders that were never indexed, instead of every folder.
+        """
+        stack = list(directories)
+        count = 0
+        while stack and not self._stopped.is_set():
+            folders = self._index_directory(connection, stack.pop())
+            if new_only:
+                folders = [
+                    folder
+                    for folder in folders
+                    if connection.execute(
+                        "SELECT 1 FROM folders WHERE path = ?", (folder,)
+                    ).fetchone()
+                    is None
+                ]
+            stack.extend(folders)
+            count += 1
+            if count % BATCH_SIZE == 0:
+                connection.commit()
+        connection.commit()
+
+    def _index_directory(
+        self, connection: sqlite3.Connection, directory: str
+    ) -> list[str]:
+        """List a directory into the index, if it changed since it was last listed.
+
+        Args:
+            connection (sqlite3.Connection): The connection to write with.
+            directory (str): The directory.
+
+        Returns:
+            list[str]: The folders in it that should be walked into.
+        """
+        known_folders = {
+            folder
+            for (folder,) in connection.execute(
+                "SELECT path FROM entries WHERE parent = ? AND is_dir = 1",
+                (directory,),
+            )
+        }
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            row = connection.execute(
+                "SELECT mtime FROM folders WHERE path = ?", (directory,)
+            ).fetchone()
+            if row is not None and row[0] == mtime:
+                # nothing was added or removed, but folders under it could have
+                folders = known_folders
+            else:
+                items = []
+                with os.scandir(directory) as listed_dir:
+                    for item in listed_dir:
+                        try:
+                            is_dir = item.is_dir(follow_symlinks=False)
+                        except OSError:
+                            is_dir = False
+                        items.append((item.path.replace("\\", "/"), is_dir))
+                connection.execute("DELETE FROM entries WHERE parent = ?", (directory,))
+                connection.executemany(
+                    "INSERT INTO entries (parent, path, is_dir) VALUES (?, ?, ?)",
+                    [(directory, item_path, is_dir) for item_path, is_dir in items],
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO folders (path, mtime) VALUES (?, ?)",
+                    (directory, mtime),
+                )
+                folders = {item_path for item_path, is_dir in items if is_dir}
+        except OSError:
+            # removed, or no permission anymore
+            self._forget(connection, directory)
+            return []
+        for removed in known_folders - folders:
+            self._forget(connection, removed)
+        return [
+            folder
+            for folder in folders
+            if os.path.basename(folder) not in self.excluded
+        ]
+
+    def _forget(self, connection: sqlite3.Connection, directory: str) -> None:
+        """Remove everything under a directory from the index.
+
+        Args:
+            connection (sqlite3.Connection): The connection to write with.
+            directory (str): The directory.
+        """
+        low, high = _subtree_bounds(directory)
+        connection.execute(
+            "DELETE FROM entries WHERE parent = ? OR (parent >= ? AND parent < ?)",
+            (directory, low, high),
+        )
+        connection.execute(
+            "DELETE FROM folders WHERE path = ? OR (path >= ? AND path < ?)",
+            (directory, low, high),
+        )
@@ -0,0 +1,200 @@
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock
+
+# pruning the previews on disk leaves this much of the budget used, so that
+# a full cache isn't pruned again on every write
+PRUNE_TO = 0.9
+
+
+class PreviewCache:
+    """A least recently used cache of previews, with a memory budget.
+
+    A preview is keyed by the file's path, size and modification time, the
+    type of preview, and the size of the preview container (for the types
+    that depend on it), so a preview is only reused while the file and the
+    container stay the same. Previews that are expensive to make can also
+    be kept as bytes in a folder, so that they survive a restart, up to a
+    separate budget.
+    """
+
+    def __init__(
+        self, max_memory: int, disk_dir: str | None = None, max_disk: int = 0
+    ) -> None:
+        """
+        Initialise the cache.
+
+        Args:
+            max_memory (int): The rough maximum number of bytes that the previews can take up in memory.
+            disk_dir (str | None): The folder to keep previews in on disk, if any.
+            max_disk (int): The maximum number of bytes that the previews on disk can take up.
+        """
+        self.max_memory = max_memory
+        self.memory = 0
+        self.disk_dir = disk_dir if max_disk > 0 else None
+        self.max_disk = max_disk
+        # key -> (size, preview)
+        self._entries: OrderedDict[tuple, tuple[int, object]] = OrderedDict()
+        self._lock = Lock()
+        self._disk_lock = Lock()
+        # the bytes of the previews on disk, only counted by a scan once
+        self._disk_usage: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(
+        file_path: str, kind: str, width: int = 0, height: int = 0, *extra: object
+    ) -> tuple | None:
+        """Make the key of a preview.
+
+        Args:
+            file_path (str): The path to the file.
+            kind (str): The type of preview, like `text` or `bat`.
+            width (int): The width of the preview container, if the preview depends on it.
+            height (int): The height of the preview container, if the preview depends on it.
+            *extra (object): Anything else that the preview depends on, like the line to show.
+
+        Returns:
+            tuple | None: The key, or None if the file can't be looked at.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (file_path, stat.st_size, stat.st_mtime_ns, kind, width, height, *extra)
+
+    def get(self, key: tuple | None) -> object:
+        """Get a preview from memory.
+
+        Args:
+            key (tuple | None): The key from `key`.
+
+        Returns:
+            object: The preview, or None if it isn't cached.
+        """
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple | None, preview: object, size: int) -> None:
+        """Keep a preview in memory, dropping the least recently used ones if needed.
+
+        Args:
+            key (tuple | None): The key from `key`.
+            preview (object): The preview.
+            size (int): Roughly how many bytes the preview takes up.
+        """
+        if key is None or size > self.max_memory:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.memory -= self._entries.pop(key)[0]
+            self._entries[key] = (size, preview)
+            self.memory += size
+            while self.memory > self.max_memory:
+                self.memory -= self._entries.popitem(last=False)[1][0]
+
+    def get_bytes(self, key: tuple | None) -> bytes | None:
+        """Get a preview from disk.
+
+        Args:
+            key (tuple | None): The key from `key`.
+
+        Returns:
+            bytes | None: The preview, or None if it isn't on disk.
+        """
+        file_path = self._disk_path(key)
+        if file_path is None:
+            return None
+        try:
+            with open(file_path, "rb") as file:
+                data = file.read()
+            # keep the ones that are used from being pruned first
+            os.utime(file_path)
+        except OSError:
+            return None
+        return data
+
+    def put_bytes(self, key: tuple | None, data: bytes) -> None:
+        """Keep a preview on disk, pruning the least recently used ones if needed.
+
+        Args:
+            key (tuple | None): The key from `key`.
+            data (bytes): The preview.
+        """
+        file_path = self._disk_path(key)
+        if file_path is None or len(data) > self.max_disk:
+            return
+        with self._disk_lock:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                if self._disk_usage is None:
+                    self._disk_usage = self._scan()[1]
+                try:
+                    replaced = os.stat(file_path).st_size
+                except FileNotFoundError:
+                    replaced = 0
+                temporary_path = file_path + ".tmp"
+                with open(temporary_path, "wb") as file:
+                    file.write(data)
+                os.replace(temporary_path, file_path)
+                self._disk_usage += len(data) - replaced
+                if self._disk_usage > self.max_disk:
+                    self._prune()
+            except OSError:
+                # count them again next time, instead of trusting a total that may be off
+                self._disk_usage = None
+                return
+
+    def _disk_path(self, key: tuple | None) -> str | None:
+        if key is None or self.disk_dir is None:
+            return None
+        name = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, name)
+
+    def _scan(self) -> tuple[list[tuple[int, int, str]], int]:
+        """List the previews on disk.
+
+        Returns:
+            tuple[list[tuple[int, int, str]], int]: The modification time, size and path of every preview,
+                and their total size.
+        """
+        previews = []
+        total = 0
+        with os.scandir(self.disk_dir) as listed_dir:
+            for item in listed_dir:
+                if item.name.endswith(".tmp"):
+                    continue
+                stat = item.stat()
+                previews.append((stat.st_mtime_ns, stat.st_size, item.path))
+                total += stat.st_size
+        return previews, total
+
+    def _prune(self) -> None:
+        """Remove the least recently used previews on disk until they fit the budget, with some room to spare."""
+        previews, total = self._scan()
+        target = int(self.max_disk * PRUNE_TO)
+        previews.sort()
+        for _, size, file_path in previews:
+            if total <= target:
+                break
+            try:
+                os.remove(file_path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_usage = total
+
+    def clear(self) -> None:
+        """Forget every preview in memory."""
+        with self._lock:
+            self._entries.clear()
+            self.memory = 0
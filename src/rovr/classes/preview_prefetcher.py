@@ -0,0 +1,103 @@
+import os
+import time
+from contextlib import suppress
+from threading import Event, Lock, Thread
+from typing import Callable
+
+from rovr.functions.utils import lower_thread_priority
+
+# a stat slower than this, in seconds, means the filesystem is slow
+SLOW_STAT = 0.05
+# the longest time to stop prefetching for after a slow stat, in seconds
+MAX_BACKOFF = 30.0
+
+
+class PreviewPrefetcher:
+    """Loads the previews of items that are likely to be shown next, in a background thread.
+
+    Asking for new items replaces the ones that haven't been loaded yet,
+    and cancels the one being loaded if it isn't one of them anymore, so
+    the thread never works on items that the cursor already moved past.
+    The thread has the lowest CPU and IO priority, and every item is
+    stat-ed first: if that is slow, like on a network share, prefetching
+    stops for a while, twice as long every time it happens again in a row.
+    """
+
+    def __init__(self, load: Callable[[str, Event], None]) -> None:
+        """
+        Initialise the prefetcher. The thread is only started on the first `prefetch`.
+
+        Args:
+            load (Callable[[str, Event], None]): Loads the preview of a path into a cache, and should stop early once the event is set.
+        """
+        self.load = load
+        self._pending: list[str] = []
+        # the path being loaded, and the event that cancels it
+        self._current: tuple[str, Event] | None = None
+        self._backoff = 0.0
+        self._resume_at = 0.0
+        self._wake = Event()
+        self._lock = Lock()
+        self._thread: Thread | None = None
+
+    def prefetch(self, paths: list[str]) -> None:
+        """Load the previews of some paths, in order, instead of any that are still waiting.
+
+        Args:
+            paths (list[str]): The paths, most likely to be shown first.
+        """
+        with self._lock:
+            if self._current is not None:
+                current_path, cancelled = self._current
+                if current_path in paths:
+                    paths = [path for path in paths if path != current_path]
+                else:
+                    cancelled.set()
+            self._pending = list(paths)
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name="rovr-preview-prefetch", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def cancel(self) -> None:
+        """Stop loading every preview that was asked for."""
+        self.prefetch([])
+
+    def _next(self) -> tuple[str, Event] | None:
+        with self._lock:
+            if not self._pending or time.monotonic() < self._resume_at:
+                # backing off throws away whatever was asked for meanwhile
+                self._pending = []
+                self._wake.clear()
+                return None
+            self._current = (self._pending.pop(0), Event())
+            return self._current
+
+    def _run(self) -> None:
+        lower_thread_priority()
+        while True:
+            self._wake.wait()
+            item = self._next()
+            if item is None:
+                continue
+            file_path, cancelled = item
+            started = time.monotonic()
+            try:
+                os.stat(file_path)
+                exists = True
+            except OSError:
+                exists = False
+            if time.monotonic() - started > SLOW_STAT:
+                self._backoff = min(MAX_BACKOFF, max(1.0, self._backoff * 2))
+                self._resume_at = time.monotonic() + self._backoff
+            else:
+                self._backoff = 0.0
+                if exists and not cancelled.is_set():
+                    # a broken preview is shown properly when it is actually
+                    # highlighted, so there is nothing to do with the error here
+                    with suppress(Exception):
+                        self.load(file_path, cancelled)
+            with self._lock:
+                self._current = None
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+from rovr.variables.constants import config
+
+from .exceptions import ProbeTimeout
+
+
+class ProbePool:
+    """Runs filesystem calls in dedicated threads, and stops waiting for them
+    after a deadline.
+
+    A call on a hung mount (a stale nfs share, a dead sshfs connection) can
+    block forever, so it is better to give up on it than to freeze whatever
+    is waiting. The thread itself can't be stopped, but only one call per
+    key is run at a time, so probing the same hung path again doesn't use up
+    another thread.
+    """
+
+    def __init__(
+        self, timeout: float, max_workers: int = 8, latency: float = 0.0
+    ) -> None:
+        """
+        Initialise the pool.
+
+        Args:
+            timeout (float): The default number of seconds to wait for a call.
+            max_workers (int): The number of threads that can make calls at once.
+            latency (float): Extra seconds to wait before every call, to act like a slow mount.
+        """
+        self.timeout = timeout
+        self.latency = latency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="rovr-probe"
+        )
+        self._in_flight: dict[Hashable, Future] = {}
+        self._lock = Lock()
+
+    def _call(self, func: Callable, *args: Any) -> Any:  # noqa: ANN401
+        if self.latency:
+            time.sleep(self.latency)
+        return func(*args)
+
+    def submit(self, func: Callable, *args: Any, key: Hashable = None) -> Future:  # noqa: ANN401
+        """Start a call in the pool.
+
+        Args:
+            func (Callable): The function to call.
+            *args (Any): The arguments to call it with.
+            key (Hashable): Calls with the same key share one call while it is running, if given.
+
+        Returns:
+            Future: The future of the call.
+        """
+        if key is None:
+            return self._executor.submit(self._call, func, *args)
+        with self._lock:
+            future = self._in_flight.get(key)
+            # a finished call can still be here until its callback removes it
+            if future is not None and not future.done():
+                return future
+            future = self._executor.submit(self._call, func, *args)
+            self._in_flight[key] = future
+        # outside the lock, as the callback runs straight away if the call already finished
+        future.add_done_callback(partial(self._forget, key))
+        return future
+
+    def _forget(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            # a newer call with the same key may have replaced this one
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def run(self, func: Callable, *args: Any, timeout: float | None = None) -> Any:  # noqa: ANN401
+        """Call a function in the pool, and wait for it until the deadline.
+
+        Args:
+            func (Callable): The function to call.
+            *args (Any): The arguments to call it with, which must be hashable.
+            timeout (float | None): The seconds to wait for, instead of the default.
+
+        Returns:
+            Any: What the function returned.
+
+        Raises:
+            ProbeTimeout: If the call didn't finish in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(func, *args, key=(func, *args))
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            raise ProbeTimeout(f"no response after {timeout}s") from None
+
+    async def run_async(
+        self,
+        func: Callable,
+        *args: Any,  # noqa: ANN401
+        timeout: float | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Call a function in the pool, and await it until the deadline.
+
+        Args:
+            func (Callable): The function to call.
+            *args (Any): The arguments to call it with, which must be hashable.
+            timeout (float | None): The seconds to wait for, instead of the default.
+
+        Returns:
+            Any: What the function returned.
+
+        Raises:
+            ProbeTimeout: If the call didn't finish in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        future = asyncio.wrap_future(self.submit(func, *args, key=(func, *args)))
+        try:
+            # shielded, so giving up doesn't cancel the call for anyone sharing it
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except TimeoutError:
+            raise ProbeTimeout(f"no response after {timeout}s") from None
+
+
+# ROVR_PROBE_LATENCY makes every call slow, to try out how rovr behaves on a slow mount
+probe_pool = ProbePool(
+    timeout=config["settings"]["probe_timeout"],
+    latency=float(os.environ.get("ROVR_PROBE_LATENCY", 0) or 0),
+)
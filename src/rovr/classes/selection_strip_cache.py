@@ -0,0 +1,111 @@
+from typing import Callable, Hashable
+
+from rich.segment import Segment
+from rich.style import Style
+from textual.cache import LRUCache
+from textual.strip import Strip
+
+from rovr.functions import icons as icon_utils
+
+
+class SelectionStripCache:
+    """Caches the lines of a selection list in select mode, with the toggle button in front.
+
+    A line only changes when its option, whether it is selected, highlighted
+    or hovered over, the width or the theme changes, so those make up the
+    key, and a repaint (like holding a key down to scroll) reuses the lines
+    it already built. The styles of the toggle button are also worked out
+    once per theme, instead of once per line.
+
+    The owner should call `clear` whenever its options change, and
+    `clear(styles=True)` when its styles are updated.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Initialise the cache.
+
+        Args:
+            maxsize (int): The maximum number of lines to keep.
+        """
+        self._strips: LRUCache[Hashable, Strip] = LRUCache(maxsize=maxsize)
+        # (component class, style of the line) -> (side style, button style)
+        self._styles: dict[tuple[str, Style], tuple[Style, Style]] = {}
+        self._icons: tuple[str, str, str, str] | None = None
+
+    def clear(self, styles: bool = False) -> None:
+        """Forget every cached line.
+
+        Args:
+            styles (bool): Whether to forget the toggle button styles too.
+        """
+        self._strips.clear()
+        if styles:
+            self._styles.clear()
+
+    def get(self, key: Hashable) -> Strip | None:
+        """Get a cached line.
+
+        Args:
+            key (Hashable): The state that the line was built for.
+
+        Returns:
+            Strip | None: The line, or None if it isn't cached.
+        """
+        return self._strips.get(key)
+
+    def add_button(
+        self,
+        key: Hashable,
+        line: Strip,
+        index: int,
+        selected: bool,
+        component_class: str,
+        get_component_rich_style: Callable[[str], Style],
+        default_style: Style,
+    ) -> Strip:
+        """Put the toggle button in front of a line, and cache the result.
+
+        Args:
+            key (Hashable): The state that the line is built for.
+            line (Strip): The rendered option.
+            index (int): The index of the option, so that clicks on the button reach it.
+            selected (bool): Whether the option is selected.
+            component_class (str): The `selection-list--button` class of the button.
+            get_component_rich_style (Callable[[str], Style]): Gets the style of a component class.
+            default_style (Style): The style to use if the line has none.
+
+        Returns:
+            Strip: The line with the toggle button.
+        """
+        if self._icons is None:
+            self._icons = (
+                icon_utils.get_toggle_button_icon("left"),
+                icon_utils.get_toggle_button_icon("inner"),
+                icon_utils.get_toggle_button_icon("inner_filled"),
+                icon_utils.get_toggle_button_icon("right"),
+            )
+        left, inner, inner_filled, right = self._icons
+        underlying_style = next(iter(line)).style or default_style
+        styles = self._styles.get((component_class, underlying_style))
+        if styles is None:
+            button_style = get_component_rich_style(component_class)
+            side_style = Style.from_color(
+                button_style.bgcolor, underlying_style.bgcolor
+            )
+            styles = self._styles[component_class, underlying_style] = (
+                side_style,
+                button_style,
+            )
+        side_style, button_style = styles
+        meta = Style(meta={"option": index})
+        side_style += meta
+        strip = Strip([
+            Segment(left, style=side_style),
+            Segment(inner_filled if selected else inner, style=button_style + meta),
+            Segment(right, style=side_style),
+            Segment(" ", style=underlying_style),
+            *line,
+        ])
+        self._strips[key] = strip
+        return strip
@@ -1,3 +1,6 @@
+from rovr.variables.constants import config
+
+
 # What is textual reactive?
 class SessionManager:
     """Manages session-related variables.
@@ -9,19 +12,24 @@ class SessionManager:
         historyIndex (int): The index of the session in the directories.
             This can be a number between 0 and the length of the list - 1,
             inclusive.
-        lastHighlighted (dict[str, int]): A dictionary mapping directory paths
-            to the index of the last highlighted item. If a directory is not
-            in the dictionary, the default is 0.
+        lastHighlighted (dict[str, str]): A dictionary mapping directory paths
+            to the name of the last highlighted item. If a directory is not
+            in the dictionary, the first item is highlighted.
         selectMode (bool): Whether select mode is enabled for that directory.
-        selectedItems (list[str]): A dictionary mapping directory paths to the
-            list of selected items in that directory.
+        selectedItems (list[str]): The names of the selected items in the
+            current directory.
         search (str): The current search string.
+        sortBy (str): The order that items are sorted in, one of
+            `rovr.classes.entry_table.SORT_ORDERS`.
+        sortReverse (bool): Whether the sort order is reversed.
     """
 
     def __init__(self) -> None:
         self.directories: list[dict] = []
         self.historyIndex: int = 0
-        self.lastHighlighted: dict[str, int] = {}
+        self.lastHighlighted: dict[str, str] = {}
         self.selectMode: bool = False
         self.selectedItems: list[str] = []
         self.search: str = ""
+        self.sortBy: str = config["settings"]["sort_by"]
+        self.sortReverse: bool = config["settings"]["sort_reverse"]
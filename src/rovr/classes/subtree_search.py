@@ -0,0 +1,159 @@
+import os
+import re
+from fnmatch import translate
+from queue import Empty, SimpleQueue
+from threading import Event, Lock, Thread
+from typing import Callable
+
+
+def name_matcher(query: str) -> Callable[[str], bool]:
+    """Get a function that checks a name against a query.
+
+    A query with a `*` or `?` in it is a glob against the whole name, and
+    anything else has to be somewhere in the name. Both are case-insensitive.
+
+    Args:
+        query (str): The query to match.
+
+    Returns:
+        Callable[[str], bool]: Checks a name.
+    """
+    query = query.lower()
+    if "*" in query or "?" in query:
+        match = re.compile(translate(query), re.DOTALL).match
+        return lambda name: match(name.lower()) is not None
+    return lambda name: query in name.lower()
+
+
+class SubtreeSearch:
+    """Walks a directory tree with a pool of threads, collecting the items whose name matches.
+
+    Every thread takes a directory off a shared queue, scans it, and puts
+    the folders it finds back on the queue, so big subtrees are spread
+    across the threads. Matches are collected as they are found, and
+    `take` hands over the ones found since the last call, so results can
+    be shown while the search carries on. Folders that are excluded (like
+    `.git` or `node_modules`) aren't walked into, and links to folders
+    aren't followed.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        query: str,
+        excluded: set[str],
+        limit: int,
+        workers: int = 4,
+    ) -> None:
+        """
+        Initialise the search. Nothing is walked until `start` is called.
+
+        Args:
+            root (str): The directory to search in.
+            query (str): What to match names against, see `name_matcher`.
+            excluded (set[str]): The names of folders to not walk into.
+            limit (int): Stop after this many matches.
+            workers (int): The number of threads that scan directories.
+        """
+        self.root = root
+        self.query = query
+        self.excluded = excluded
+        self.limit = limit
+        self.workers = workers
+        self.cancelled = Event()
+        self.finished = Event()
+        self.truncated = False
+        self.scanned = 0
+        self._matches = name_matcher(query)
+        self._queue: SimpleQueue[str] = SimpleQueue()
+        # directories that were queued but not scanned yet
+        self._pending = 0
+        self._found: list[tuple] = []
+        self._found_count = 0
+        self._lock = Lock()
+
+    def start(self) -> None:
+        """Start walking from the root."""
+        self._enqueue(self.root)
+        for _ in range(self.workers):
+            Thread(target=self._work, name="rovr-subtree", daemon=True).start()
+
+    def cancel(self) -> None:
+        """Stop walking, which the threads notice within a few items."""
+        self.cancelled.set()
+        self.finished.set()
+
+    def take(self) -> list[tuple]:
+        """Get the matches found since the last call.
+
+        Returns:
+            list[tuple]: The matches, see `_search_item`.
+        """
+        with self._lock:
+            found, self._found = self._found, []
+        return found
+
+    def _enqueue(self, directory: str) -> None:
+        with self._lock:
+            self._pending += 1
+        self._queue.put(directory)
+
+    def _work(self) -> None:
+        while not self.finished.is_set():
+            try:
+                directory = self._queue.get(timeout=0.05)
+            except Empty:
+                continue
+            try:
+                self._scan(directory)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    if self._pending == 0:
+                        self.finished.set()
+
+    def _search_item(self, item: os.DirEntry, is_dir: bool) -> list[tuple]:
+        """Check one item of a directory being scanned.
+
+        Args:
+            item (os.DirEntry): The item.
+            is_dir (bool): Whether it is a folder (and not a link to one).
+
+        Returns:
+            list[tuple]: The path of the item and whether it is a folder, if its name matches.
+        """
+        if self._matches(item.name):
+            return [(item.path.replace("\\", "/"), is_dir)]
+        return []
+
+    def _add(self, found: list[tuple]) -> None:
+        with self._lock:
+            found = found[: self.limit - self._found_count]
+            self._found.extend(found)
+            self._found_count += len(found)
+            if self._found_count >= self.limit:
+                self.truncated = True
+                self.cancel()
+
+    def _scan(self, directory: str) -> None:
+        if self.cancelled.is_set():
+            return
+        try:
+            with os.scandir(directory) as listed_dir:
+                for item in listed_dir:
+                    try:
+                        is_dir = item.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    found = self._search_item(item, is_dir)
+                    if found:
+                        self._add(found)
+                    if is_dir and item.name not in self.excluded:
+                        self._enqueue(item.path)
+                    if self.cancelled.is_set():
+                        return
+        except OSError:
+            # no permission, or it was removed while walking
+            return
+        with self._lock:
+            self.scanned += 1
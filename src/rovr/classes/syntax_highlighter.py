@@ -0,0 +1,218 @@
+import codecs
+import os
+from collections import OrderedDict
+from threading import Lock
+
+from rich.style import Style
+from rich.text import Text
+from textual._tree_sitter import get_language
+from textual.widgets import TextArea
+from textual.widgets.text_area import TextAreaTheme
+from tree_sitter import Parser, Query, QueryCursor, Tree
+
+from rovr.functions.utils import sniff_file
+
+# the biggest file that is highlighted, as all of it has to be parsed to
+# highlight any part of it
+MAX_PARSE_SIZE = 4 * 1024 * 1024
+# how many parsed files are kept
+MAX_TREES = 8
+# the text preview's theme takes its syntax colours from this one
+THEME = TextAreaTheme.get_builtin_theme("vscode_dark")
+# only the colour of the theme's gutter, so it sits on the preview's background
+GUTTER_STYLE = Style(color=THEME.gutter_style.color)
+
+
+class SyntaxHighlighter:
+    """Highlights the visible lines of a file in-process, with tree-sitter.
+
+    This uses the languages and highlight queries that Textual bundles for
+    `TextArea`, and the same colours as the text preview. A file is only
+    parsed once: the tree is kept for as long as the file's size and
+    modification time stay the same, so showing another part of the file
+    only runs the highlight query over the lines that are shown.
+    """
+
+    def __init__(self, max_trees: int = MAX_TREES) -> None:
+        """
+        Initialise the highlighter.
+
+        Args:
+            max_trees (int): The number of parsed files to keep.
+        """
+        self.max_trees = max_trees
+        # (path, size, mtime) -> (tree, source, start of every line)
+        self._trees: OrderedDict[tuple, tuple[Tree, bytes, list[int]]] = OrderedDict()
+        self._queries: dict[str, Query | None] = {}
+        self._lock = Lock()
+
+    def highlight(
+        self,
+        file_path: str,
+        language: str | None,
+        start: int,
+        count: int,
+        line: int | None = None,
+        line_numbers: bool = False,
+        max_columns: int = 1024,
+    ) -> Text | None:
+        """Highlight some lines of a file.
+
+        Args:
+            file_path (str): The path to the file.
+            language (str | None): The name of the file's language, like `python`.
+            start (int): The index of the first line to highlight.
+            count (int): How many lines to highlight.
+            line (int | None): A line to highlight the background of, starting from 1, if any.
+            line_numbers (bool): Whether to show line numbers in front of the lines.
+            max_columns (int): The most characters to keep from each line.
+
+        Returns:
+            Text | None: The highlighted lines, or None if the language isn't supported,
+                or the file is too big or isn't utf-8.
+        """
+        query = self._query(language)
+        if query is None:
+            return None
+        parsed = self._parse(file_path, language)
+        if parsed is None:
+            return None
+        tree, source, line_starts = parsed
+        end = min(len(line_starts), start + count)
+        if start >= end:
+            return Text()
+
+        # the highlights of every line, as byte ranges
+        highlights: list[list[tuple[int, int | None, Style]]] = [
+            [] for _ in range(end - start)
+        ]
+        cursor = QueryCursor(query)
+        cursor.set_point_range((start, 0), (end, 0))
+        for name, nodes in cursor.captures(tree.root_node).items():
+            style = THEME.syntax_styles.get(name)
+            if style is None:
+                continue
+            for node in nodes:
+                start_row, start_column = node.start_point
+                end_row, end_column = node.end_point
+                for row in range(max(start_row, start), min(end_row, end - 1) + 1):
+                    highlights[row - start].append((
+                        start_column if row == start_row else 0,
+                        end_column if row == end_row else None,
+                        style,
+                    ))
+
+        gutter_width = len(str(end))
+        lines = []
+        for row in range(start, end):
+            line_end = (
+                line_starts[row + 1] if row + 1 < len(line_starts) else len(source)
+            )
+            line_bytes = (
+                source[line_starts[row] : line_end]
+                .removesuffix(b"\n")
+                .removesuffix(b"\r")
+            )
+            # no character takes more than 4 bytes
+            line_bytes = line_bytes[: max_columns * 4]
+            text = Text(line_bytes.decode("utf-8", errors="replace")[:max_columns])
+            for start_byte, end_byte, style in highlights[row - start]:
+                text.stylize(
+                    style,
+                    _column(line_bytes, start_byte),
+                    len(text) if end_byte is None else _column(line_bytes, end_byte),
+                )
+            if line_numbers:
+                text = Text.assemble(
+                    (f"{row + 1:>{gutter_width}} ", GUTTER_STYLE), text
+                )
+            if row + 1 == line:
+                text.stylize(THEME.cursor_line_style)
+            lines.append(text)
+        return Text("\n").join(lines)
+
+    def _query(self, language: str | None) -> Query | None:
+        """Get the highlight query of a language, preparing it the first time.
+
+        Args:
+            language (str | None): The name of the language.
+
+        Returns:
+            Query | None: The query, or None if the language isn't supported.
+        """
+        if language is None:
+            return None
+        with self._lock:
+            if language not in self._queries:
+                tree_sitter_language = get_language(language)
+                highlight_query = TextArea._get_builtin_highlight_query(language)
+                self._queries[language] = (
+                    Query(tree_sitter_language, highlight_query)
+                    if tree_sitter_language is not None and highlight_query
+                    else None
+                )
+            return self._queries[language]
+
+    def _parse(
+        self, file_path: str, language: str
+    ) -> tuple[Tree, bytes, list[int]] | None:
+        """Parse a file, or get the tree from the last time it was parsed.
+
+        Args:
+            file_path (str): The path to the file.
+            language (str): The name of the file's language.
+
+        Returns:
+            tuple[Tree, bytes, list[int]] | None: The tree, the contents of the file, and where every line starts,
+                or None if it is too big or isn't utf-8.
+        """
+        try:
+            stat = os.stat(file_path)
+            if stat.st_size > MAX_PARSE_SIZE or sniff_file(file_path) != "utf-8":
+                return None
+        except OSError:
+            return None
+        key = (file_path, stat.st_size, stat.st_mtime_ns, language)
+        with self._lock:
+            parsed = self._trees.get(key)
+            if parsed is not None:
+                self._trees.move_to_end(key)
+                return parsed
+        try:
+            with open(file_path, "rb") as file:
+                source = file.read(MAX_PARSE_SIZE)
+        except OSError:
+            return None
+        if source.startswith(codecs.BOM_UTF8):
+            # the byte order mark would shift every column on the first line
+            return None
+        tree = Parser(get_language(language)).parse(source)
+        line_starts = [0]
+        position = source.find(b"\n")
+        while position != -1:
+            line_starts.append(position + 1)
+            position = source.find(b"\n", position + 1)
+        if len(line_starts) > 1 and line_starts[-1] == len(source):
+            # there is no line after the last newline
+            line_starts.pop()
+        parsed = (tree, source, line_starts)
+        with self._lock:
+            self._trees[key] = parsed
+            while len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+        return parsed
+
+
+def _column(line_bytes: bytes, byte_offset: int) -> int:
+    """Get the character that a byte of a line is in.
+
+    Args:
+        line_bytes (bytes): The line.
+        byte_offset (int): The byte.
+
+    Returns:
+        int: The index of the character.
+    """
+    if line_bytes.isascii():
+        return byte_offset
+    return len(line_bytes[:byte_offset].decode("utf-8", errors="replace"))
@@ -1,16 +1,37 @@
-from os import DirEntry
+from functools import lru_cache
 
-from textual.content import Content, ContentText
+from textual.content import Content, ContentText, Span
 from textual.widgets.option_list import Option
 from textual.widgets.selection_list import Selection
 
 
+@lru_cache(maxsize=1024)
+def _icon_span(icon: str, color: str) -> Span:
+    # the icon always starts after the leading space
+    return Span(1, 1 + len(icon), color)
+
+
+def icon_prompt(icon: list, label: str) -> Content:
+    """
+    Make the prompt of a row, which is the coloured icon followed by the label.
+
+    This is the same as `Content.from_markup(f" [{color}]{icon}[/{color}] $name")`,
+    but without parsing any markup, since the label is always plain text.
+
+    Args:
+        icon (list): The icon list from a utils function.
+        label (str): The label for the option.
+
+    Returns:
+        Content: The prompt.
+    """
+    return Content(f" {icon[0]} {label}", [_icon_span(icon[0], icon[1])])
+
+
 class PinnedSidebarOption(Option):
     def __init__(self, icon: list, label: str, *args, **kwargs) -> None:
         super().__init__(
-            prompt=Content.from_markup(
-                f" [{icon[1]}]{icon[0]}[/{icon[1]}] $name", name=label
-            ),
+            prompt=icon_prompt(icon, label),
             *args,
             **kwargs,
         )
@@ -18,29 +39,25 @@ class PinnedSidebarOption(Option):
 
 
 class FileListSelectionWidget(Selection):
-    def __init__(
-        self, icon: list, label: str, dir_entry: DirEntry, *args, **kwargs
-    ) -> None:
+    def __init__(self, icon: list, label: str, row: int, *args, **kwargs) -> None:
         """
         Initialise the selection.
 
         Args:
             icon (list): The icon list from a utils function.
             label (str): The label for the option.
-            dir_entry (DirEntry): The nt.DirEntry class
+            row (int): The row of the item in the file list's EntryTable.
             value (SelectionType): The value for the selection.
             initial_state (bool) = False: The initial selected state of the selection.
             id (str or None) = None: The optional ID for the selection.
             disabled (bool) = False: The initial enabled/disabled state. Enabled by default.
         """
         super().__init__(
-            prompt=Content.from_markup(
-                f" [{icon[1]}]{icon[0]}[/{icon[1]}] $name", name=label
-            ),
+            prompt=icon_prompt(icon, label),
             *args,
             **kwargs,
         )
-        self.dir_entry = dir_entry
+        self.row = row
         self.label = label
 
 
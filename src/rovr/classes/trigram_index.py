@@ -0,0 +1,120 @@
+import re
+from array import array
+from fnmatch import translate
+from threading import Event
+from typing import Callable, Sequence
+
+# the number of labels checked between checks for cancellation
+CANCEL_CHECK_INTERVAL = 1024
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[start : start + 3] for start in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """An index from every three character piece of a label to the rows it appears in.
+
+    Every label that contains a substring of three or more characters also
+    contains each of its trigrams, so only the rows listed under its rarest
+    trigram need to be checked, instead of every row. Globs are narrowed
+    down the same way, with the text between their wildcards. Matching is
+    case-insensitive.
+    """
+
+    def __init__(self, labels: Sequence[str]) -> None:
+        """
+        Build the index, which takes a while for very large listings.
+
+        Args:
+            labels (Sequence[str]): The label of every row.
+        """
+        self.labels = [label.lower() for label in labels]
+        # trigram -> the rows it appears in, in row order
+        self.postings: dict[str, array] = {}
+        postings = self.postings
+        for row, label in enumerate(self.labels):
+            for trigram in _trigrams(label):
+                rows = postings.get(trigram)
+                if rows is None:
+                    rows = postings[trigram] = array("I")
+                rows.append(row)
+
+    def _candidates(self, pieces: list[str]) -> Sequence[int] | None:
+        """Get the rows that can contain every piece of text.
+
+        Args:
+            pieces (list[str]): The lowercase pieces of text.
+
+        Returns:
+            Sequence[int] | None: The rows under the rarest trigram, or None if no piece has one.
+        """
+        smallest: Sequence[int] | None = None
+        for piece in pieces:
+            for trigram in _trigrams(piece):
+                rows = self.postings.get(trigram)
+                if rows is None:
+                    # no label has this trigram, so nothing can match
+                    return ()
+                if smallest is None or len(rows) < len(smallest):
+                    smallest = rows
+        return smallest
+
+    def substring(self, text: str, cancelled: Event | None = None) -> list[int] | None:
+        """Get the rows whose label contains some text.
+
+        Args:
+            text (str): The text to look for.
+            cancelled (Event | None): Stops looking once it is set.
+
+        Returns:
+            list[int] | None: The matching rows in row order, or None if it was cancelled.
+        """
+        text = text.lower()
+        candidates = self._candidates([text])
+        if candidates is None:
+            candidates = range(len(self.labels))
+        return self._check(candidates, lambda label: text in label, cancelled)
+
+    def glob(self, pattern: str, cancelled: Event | None = None) -> list[int] | None:
+        """Get the rows whose whole label matches a glob, like `*.log`.
+
+        Args:
+            pattern (str): The glob, with `*`, `?` and `[...]` as wildcards.
+            cancelled (Event | None): Stops looking once it is set.
+
+        Returns:
+            list[int] | None: The matching rows in row order, or None if it was cancelled.
+        """
+        pattern = pattern.lower()
+        matcher = re.compile(translate(pattern), re.DOTALL).match
+        # the text outside of wildcards has to be in every match, but anything
+        # after a `[` could be part of a character class, so it is left out
+        pieces = [
+            piece for piece in re.split(r"[*?]", pattern.split("[", 1)[0]) if piece
+        ]
+        candidates = self._candidates(pieces)
+        if candidates is None:
+            candidates = range(len(self.labels))
+        return self._check(
+            candidates, lambda label: matcher(label) is not None, cancelled
+        )
+
+    def _check(
+        self,
+        candidates: Sequence[int],
+        matches: Callable[[str], bool],
+        cancelled: Event | None,
+    ) -> list[int] | None:
+        labels = self.labels
+        found = []
+        for count, row in enumerate(candidates, 1):
+            if matches(labels[row]):
+                found.append(row)
+            if (
+                cancelled is not None
+                and count % CANCEL_CHECK_INTERVAL == 0
+                and cancelled.is_set()
+            ):
+                return None
+        return found
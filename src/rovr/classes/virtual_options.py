@@ -0,0 +1,155 @@
+from typing import Callable, Sequence, overload
+
+from textual.cache import LRUCache
+from textual.widgets.option_list import Option
+
+
+class VirtualOptions(Sequence[Option]):
+    """A read-only sequence of options, where an option is only created when it is accessed.
+
+    The options are backed by a list of labels, one per row, and an optional
+    view of row indexes, which allows filtering without creating any options.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        make_option: Callable[[int], Option] | None,
+        placeholder: Option | None = None,
+        cache_size: int = 1024,
+    ) -> None:
+        """
+        Initialise the options.
+
+        Args:
+            labels (Sequence[str]): The label of every row.
+            make_option (Callable[[int], Option] | None): Creates the option for a row index, only None when there are no rows.
+            placeholder (Option | None): The only option shown when there are no rows.
+            cache_size (int): The number of created options to keep around.
+        """
+        self.labels = labels
+        self._make_option = make_option
+        self._placeholder = placeholder
+        self._view: list[int] | None = None
+        self._view_placeholder: Option | None = None
+        self._cache: LRUCache[int, Option] = LRUCache(maxsize=cache_size)
+        self._label_to_row: dict[str, int] | None = None
+
+    @property
+    def placeholder(self) -> Option | None:
+        """The option shown when there are no rows to show."""
+        return self._placeholder if self._view is None else self._view_placeholder
+
+    @property
+    def view(self) -> list[int] | None:
+        """The row indexes that are shown, or None if every row is shown."""
+        return self._view
+
+    @property
+    def row_count(self) -> int:
+        """The number of rows shown, ignoring the placeholder."""
+        return len(self.labels) if self._view is None else len(self._view)
+
+    @property
+    def showing_placeholder(self) -> bool:
+        """Whether the placeholder is the only option shown."""
+        return self.row_count == 0 and self.placeholder is not None
+
+    def __len__(self) -> int:
+        return self.row_count or (self.placeholder is not None)
+
+    @overload
+    def __getitem__(self, index: int) -> Option: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Option]: ...
+
+    def __getitem__(self, index: int | slice) -> Option | list[Option]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if self.showing_placeholder:
+            if index not in (0, -1):
+                raise IndexError("option index out of range")
+            return self.placeholder
+        row = self.row_at(index)
+        option = self._cache.get(row)
+        if option is None:
+            option = self._make_option(row)
+            self._cache[row] = option
+        return option
+
+    def row_at(self, index: int) -> int:
+        """Get the row index shown at a position.
+
+        Args:
+            index (int): The position of the option.
+
+        Returns:
+            int: The row index.
+
+        Raises:
+            IndexError: If there is no row at that position.
+        """
+        if self._view is not None:
+            return self._view[index]
+        if not -len(self.labels) <= index < len(self.labels):
+            raise IndexError("option index out of range")
+        return index % len(self.labels)
+
+    def index_of_row(self, row: int) -> int:
+        """Get the position that a row is shown at.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            int: The position of the option.
+
+        Raises:
+            ValueError: If the row is not shown.
+        """
+        if self._view is not None:
+            return self._view.index(row)
+        if not 0 <= row < len(self.labels):
+            raise ValueError(f"row {row} is not shown")
+        return row
+
+    def row_of_label(self, label: str) -> int:
+        """Get the row index of a label.
+
+        Args:
+            label (str): The label of the row.
+
+        Returns:
+            int: The row index.
+
+        Raises:
+            ValueError: If there is no row with that label.
+        """
+        if self._label_to_row is None:
+            # built on the first lookup, instead of with the options
+            self._label_to_row = {label: row for row, label in enumerate(self.labels)}
+        try:
+            return self._label_to_row[label]
+        except KeyError:
+            raise ValueError(f"{label!r} is not a label") from None
+
+    def rows(self) -> Sequence[int]:
+        """Get the row indexes that are shown.
+
+        Returns:
+            Sequence[int]: The row indexes, in the order they are shown.
+        """
+        return range(len(self.labels)) if self._view is None else self._view
+
+    def set_view(
+        self, view: list[int] | None, placeholder: Option | None = None
+    ) -> None:
+        """Only show some of the rows.
+
+        Args:
+            view (list[int] | None): The row indexes to show, or None to show every row.
+            placeholder (Option | None): The only option shown when the view is empty.
+        """
+        self._view = view
+        self._view_placeholder = placeholder
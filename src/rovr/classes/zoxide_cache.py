@@ -0,0 +1,101 @@
+import time
+from contextlib import suppress
+from subprocess import DEVNULL, run
+from threading import Lock, Thread
+
+from .frecency_store import match_keywords
+
+# how long the folders are used for before they are fetched again, in seconds
+ZOXIDE_TTL = 60
+
+
+class ZoxideCache:
+    """The folders that zoxide knows about, fetched once and filtered in memory.
+
+    `zoxide query --list` already lists every folder best first, so it is
+    only run when the folders are missing or older than `ZOXIDE_TTL`, and
+    every query in between is matched in memory, the way zoxide would
+    match it. Nothing here waits for zoxide, except `refresh`, which is
+    meant to be run in a thread.
+    """
+
+    def __init__(self, executable: str = "zoxide") -> None:
+        """
+        Initialise the cache. Nothing is fetched until `refresh` is called.
+
+        Args:
+            executable (str): The zoxide executable.
+        """
+        self.executable = executable
+        # when the folders were last fetched, if ever
+        self.fetched_at: float | None = None
+        # whether zoxide's ranking changed since the folders were fetched
+        self._outdated = False
+        # every folder, best first, with its lowercase path
+        self._ranked: list[tuple[str, str]] = []
+        self._lock = Lock()
+
+    @property
+    def stale(self) -> bool:
+        """Whether the folders should be fetched again."""
+        return (
+            self.fetched_at is None
+            or self._outdated
+            or time.monotonic() - self.fetched_at > ZOXIDE_TTL
+        )
+
+    def refresh(self) -> bool:
+        """Fetch the folders from zoxide.
+
+        Returns:
+            bool: Whether the folders changed, which they always do the first time.
+        """
+        try:
+            output = run(
+                [self.executable, "query", "--list"],
+                capture_output=True,
+                text=True,
+            ).stdout
+        except OSError:
+            # not installed, so don't keep trying on every open
+            output = ""
+        ranked = [(folder, folder.lower()) for folder in output.splitlines()]
+        with self._lock:
+            changed = self.fetched_at is None or ranked != self._ranked
+            self._ranked = ranked
+            self.fetched_at = time.monotonic()
+            self._outdated = False
+        return changed
+
+    def query(self, keywords: list[str], limit: int) -> list[str]:
+        """Get the best ranked folders that match some keywords, see `match_keywords`.
+
+        Args:
+            keywords (list[str]): The keywords, which can be empty to match every folder.
+            limit (int): The maximum number of folders to return.
+
+        Returns:
+            list[str]: The matching folders, best first.
+        """
+        with self._lock:
+            ranked = self._ranked
+        return match_keywords(ranked, keywords, limit)
+
+    def add(self, folder: str) -> None:
+        """Tell zoxide about a visit to a folder, in a thread.
+
+        Args:
+            folder (str): The folder.
+        """
+        # the ranking changed, so fetch it again next time
+        self._outdated = True
+
+        def add_folder() -> None:
+            with suppress(OSError):
+                run(
+                    [self.executable, "add", folder],
+                    stdout=DEVNULL,
+                    stderr=DEVNULL,
+                )
+
+        Thread(target=add_folder, name="rovr-zoxide-add", daemon=True).start()
@@ -1,18 +1,34 @@
+import asyncio
+from contextlib import suppress
+from functools import partial
 from os import getcwd, path
 from os import system as cmd
+from threading import Event
 from time import monotonic
-from typing import ClassVar
+from typing import Callable, ClassVar, Self
 
-from rich.segment import Segment
-from rich.style import Style
-from textual import events, work
+from textual import _widget_navigation, events, work
 from textual.binding import Binding, BindingType
+from textual.geometry import Region, Size, clamp
 from textual.strip import Strip
+from textual.style import Style as VisualStyle
+from textual.visual import Padding
 from textual.widgets import Button, Input, OptionList, SelectionList
 from textual.widgets.option_list import OptionDoesNotExist
 from textual.widgets.selection_list import Selection
 
-from rovr.classes import FileListSelectionWidget
+from rovr.classes import (
+    EntryTable,
+    FileListSelectionWidget,
+    ListingCache,
+    ScanCancelled,
+    SelectionStripCache,
+    VirtualOptions,
+)
+from rovr.classes.entry_table import SORT_ORDERS
+from rovr.classes.fuzzy_filter import FuzzyFilter
+from rovr.classes.probe_pool import probe_pool
+from rovr.classes.textual_options import icon_prompt
 from rovr.functions import icons as icon_utils
 from rovr.functions import path as path_utils
 from rovr.functions import pins as pin_utils
@@ -20,6 +36,19 @@ from rovr.functions import utils
 from rovr.variables.constants import buttons_that_depend_on_path, config
 from rovr.variables.maps import ARCHIVE_EXTENSIONS
 
+# shared between every file list, so that the preview's listing of a folder
+# can be reused when entering it
+listing_cache = ListingCache(
+    max_entries=config["settings"]["listing_cache_entries"],
+    max_memory=int(config["settings"]["listing_cache_memory"] * 1_000_000),
+)
+
+
+def _discard_result(future: asyncio.Future) -> None:
+    """Retrieve the error of a future that nothing waits for anymore, so asyncio doesn't warn about it."""
+    if not future.cancelled():
+        future.exception()
+
 
 class FileList(SelectionList, inherit_bindings=False):
     """
@@ -76,6 +105,12 @@ class FileList(SelectionList, inherit_bindings=False):
         self.dummy = dummy
         self.enter_into = enter_into
         self.select_mode_enabled = select
+        self._options = VirtualOptions([], make_option=None)
+        self.fuzzy_filter = FuzzyFilter([], config["settings"]["search_result_limit"])
+        self.entries = EntryTable(getcwd())
+        self._strip_cache = SelectionStripCache()
+        # the last highlighted index, to tell which way the cursor is moving
+        self._last_highlighted_index = 0
 
     def on_mount(self) -> None:
         if not self.dummy:
@@ -107,17 +142,219 @@ class FileList(SelectionList, inherit_bindings=False):
                 self.highlighted = clicked_option
         self.last_click = monotonic()
 
+    def _set_options(self, options: VirtualOptions) -> None:
+        """Replace every option in the list.
+
+        Args:
+            options (VirtualOptions): The new options.
+        """
+        self._options = options
+        self.fuzzy_filter = FuzzyFilter(
+            options.labels, config["settings"]["search_result_limit"]
+        )
+        self._selected.clear()
+        self._clear_caches()
+        self._mouse_hovering_over = None
+        self.highlighted = None
+        self.scroll_y = 0
+        self._update_lines()
+
+    def _set_listing(self, entries: EntryTable) -> None:
+        """Show a directory listing.
+
+        Args:
+            entries (EntryTable): The items in the directory.
+        """
+        self.entries = entries
+        if entries.error:
+            self._set_options(
+                VirtualOptions(
+                    [],
+                    make_option=None,
+                    placeholder=Selection(
+                        " Unresponsive: This directory took too long to list."
+                        if entries.unresponsive
+                        else " Permission Error: Unable to access this directory.",
+                        value="",
+                        id="",
+                        disabled=True,
+                    ),
+                )
+            )
+            return
+        rows = entries.sorted_rows(*self._sort_order())
+        names = entries.names
+
+        def make_option(index: int) -> FileListSelectionWidget:
+            row = rows[index]
+            return FileListSelectionWidget(
+                icon=entries.icon_of(row),
+                label=names[row],
+                row=row,
+                value=names[row],
+                id=names[row],
+            )
+
+        self._set_options(
+            VirtualOptions(
+                names if isinstance(rows, range) else [names[row] for row in rows],
+                make_option=make_option,
+                placeholder=Selection(
+                    "   --no-files--", value="", id="", disabled=True
+                ),
+            )
+        )
+
+    def _sort_order(self) -> tuple[str, bool]:
+        """Get the sort order of the active tab.
+
+        Returns:
+            tuple[str, bool]: What to sort by, and whether to reverse it.
+        """
+        try:
+            session = self.app.tabWidget.active_tab.session
+        except AttributeError:
+            # only happens when the tabs aren't mounted
+            return config["settings"]["sort_by"], config["settings"]["sort_reverse"]
+        return session.sortBy, session.sortReverse
+
+    async def _scan(self, cwd: str, show_loading: bool = True) -> EntryTable:
+        """Get the listing of a directory from the probe pool, so that the UI
+        doesn't freeze on huge, slow or hung directories.
+
+        Args:
+            cwd (str): The normalised path to the directory.
+            show_loading (bool): Show a placeholder if the scan takes a while.
+
+        Returns:
+            EntryTable: The items in the directory, already sorted in the active tab's order,
+                or an unresponsive table if it didn't finish before `settings.probe_timeout`.
+
+        Raises:
+            CancelledError: If the worker was cancelled, which also stops the scan.
+        """
+        cancelled = Event()
+        sort_order = self._sort_order()
+
+        def scan() -> EntryTable:
+            entries = listing_cache.get(
+                cwd, partial(EntryTable.scan, cancelled=cancelled)
+            )
+            if not entries.error:
+                # the order is cached in the table, so showing it is instant
+                entries.sorted_rows(*sort_order)
+            return entries
+
+        # visits to the same directory share one scan, so a scan stuck on a
+        # hung mount only ever holds one of the pool's threads
+        future = asyncio.wrap_future(probe_pool.submit(scan, key=("scan", cwd)))
+        try:
+            if show_loading:
+                done, _ = await asyncio.wait({future}, timeout=0.25)
+                if not done:
+                    self._set_options(
+                        VirtualOptions(
+                            [],
+                            make_option=None,
+                            placeholder=Selection(
+                                " Loading...", value="", id="", disabled=True
+                            ),
+                        )
+                    )
+            # shielded, so timing out doesn't cancel the scan for anyone sharing it
+            return await asyncio.wait_for(asyncio.shield(future), probe_pool.timeout)
+        except TimeoutError:
+            # the scan is stuck, most likely on a hung network mount
+            cancelled.set()
+            future.add_done_callback(_discard_result)
+            return EntryTable(cwd, unresponsive=True)
+        except ScanCancelled:
+            # the shared scan was started and then cancelled by an older update
+            return await self._scan(cwd, show_loading)
+        except asyncio.CancelledError:
+            # a newer update replaced this one, so let the thread stop early
+            cancelled.set()
+            future.add_done_callback(_discard_result)
+            raise
+
+    @work(exclusive=True, group="resort")
+    async def resort(self) -> None:
+        """Show the current listing in the active tab's sort order, without scanning it again."""
+        if not self.entries.error:
+            # stat based orders can take a while to work out the first time
+            await asyncio.to_thread(self.entries.sorted_rows, *self._sort_order())
+        self._swap_listing(self.entries)
+        self.scroll_to_highlight()
+
+    @work(exclusive=True, group="reload")
+    async def reload_listing(self) -> None:
+        """Scan the shown directory again, and only update the list if something
+        was added, removed or changed type."""
+        directory = self.entries.directory
+        entries = await self._scan(directory, show_loading=False)
+        if entries.directory != self.entries.directory or entries.unresponsive:
+            # went somewhere else in the meantime, or it can try again next change
+            return
+        if self.entries.error == entries.error and not any(self.entries.diff(entries)):
+            return
+        if not self.dummy:
+            for selector in buttons_that_depend_on_path:
+                self.app.query_one(selector).disabled = (
+                    entries.error or len(entries) == 0
+                )
+        self._swap_listing(entries)
+
+    def _swap_listing(self, entries: EntryTable) -> None:
+        """Show another listing of the same directory, keeping the highlight,
+        the scroll position, the selection and the search filter.
+
+        The preview and metadata are only updated if the highlighted item
+        is no longer there.
+
+        Args:
+            entries (EntryTable): The items in the directory.
+        """
+        try:
+            highlighted = self.highlighted_option.value
+        except AttributeError:
+            highlighted = None
+        old_index = self.highlighted or 0
+        # how far down the screen the highlight is
+        offset = old_index - round(self.scroll_y)
+        selected = self.selected
+        with self.prevent(OptionList.OptionHighlighted):
+            self._set_listing(entries)
+            for value in selected:
+                with suppress(ValueError):
+                    self._options.row_of_label(value)
+                    self._selected[value] = None
+            if not self.dummy and self.input.value:
+                self.filter_options(self.input.value)
+            with suppress(OptionDoesNotExist):
+                self.highlighted = self.get_option_index(highlighted)
+        if self.highlighted is None and highlighted is not None:
+            # the highlighted item is gone, so highlight whatever took its place
+            self.highlighted = min(old_index, len(self._options) - 1)
+        self.scroll_to(
+            y=max((self.highlighted or 0) - offset, 0), animate=False, immediate=True
+        )
+        if not self.dummy and self.select_mode_enabled:
+            self.app.tabWidget.active_tab.session.selectedItems = self.selected
+        self.update_border_subtitle()
+
     @work(exclusive=True)
     async def update_file_list(
         self,
         add_to_session: bool = True,
         focus_on: str | None = None,
+        callback: Callable | None = None,
     ) -> None:
         """Update the file list with the current directory contents.
 
         Args:
             add_to_session (bool): Whether to add the current directory to the session history.
             focus_on (str | None): A custom item to set the focus as.
+            callback (Callable | None): Called once the listing has been updated.
         """
         cwd = path_utils.normalise(getcwd())
         # get sessionstate
@@ -127,46 +364,15 @@ class FileList(SelectionList, inherit_bindings=False):
         except AttributeError:
             self.clear_options()
             return
-        # Separate folders and files
-        folders, files = path_utils.get_cwd_object(cwd)
-        self.list_of_options = []
-        if folders == [PermissionError] or files == [PermissionError]:
-            self.list_of_options.append(
-                Selection(
-                    " Permission Error: Unable to access this directory.",
-                    value="",
-                    id="",
-                    disabled=True,
-                ),
-            )
-        elif folders == [] and files == []:
-            self.list_of_options.append(
-                Selection("   --no-files--", value="", id="", disabled=True)
-            )
+        entries = await self._scan(cwd)
+        for selector in buttons_that_depend_on_path:
+            self.app.query_one(selector).disabled = entries.error or len(entries) == 0
+        if not entries.error and len(entries) == 0:
+            # nothing inside
             preview = self.app.query_one("PreviewContainer")
             preview.remove_children()
             preview._current_preview_type = "none"
-            # nothing inside
-        else:
-            file_list_options = folders + files
-            for item in file_list_options:
-                self.list_of_options.append(
-                    FileListSelectionWidget(
-                        icon=item["icon"],
-                        label=item["name"],
-                        dir_entry=item["dir_entry"],
-                        value=path_utils.compress(item["name"]),
-                        id=path_utils.compress(item["name"]),
-                    )
-                )
-        if len(self.list_of_options) == 1 and self.list_of_options[0].disabled:
-            for selector in buttons_that_depend_on_path:
-                self.app.query_one(selector).disabled = True
-        else:
-            for selector in buttons_that_depend_on_path:
-                self.app.query_one(selector).disabled = False
-        self.clear_options()
-        self.add_options(self.list_of_options)
+        self._set_listing(entries)
         # session handler
         self.app.query_one("#path_switcher").value = cwd + (
             "" if cwd.endswith("/") else "/"
@@ -183,9 +389,7 @@ class FileList(SelectionList, inherit_bindings=False):
             })
             if session.lastHighlighted.get(cwd) is None:
                 # Hard coding is my passion (referring to the id)
-                session.lastHighlighted[cwd] = (
-                    self.app.query_one("#file_list").options[0].value
-                )
+                session.lastHighlighted[cwd] = self.get_option_at_index(0).value
             session.historyIndex = len(session.directories) - 1
         elif session.directories == []:
             session.directories = [{"path": path_utils.normalise(getcwd())}]
@@ -195,21 +399,15 @@ class FileList(SelectionList, inherit_bindings=False):
         )
         try:
             if focus_on:
-                self.highlighted = self.get_option_index(path_utils.compress(focus_on))
+                self.highlighted = self.get_option_index(focus_on)
             else:
                 self.highlighted = self.get_option_index(session.lastHighlighted[cwd])
-        except OptionDoesNotExist:
-            self.highlighted = 0
-            session.lastHighlighted[cwd] = (
-                self.app.query_one("#file_list").options[0].value
-            )
-        except KeyError:
+        except (OptionDoesNotExist, KeyError):
             self.highlighted = 0
-            session.lastHighlighted[cwd] = (
-                self.app.query_one("#file_list").options[0].value
-            )
+            session.lastHighlighted[cwd] = self.get_option_at_index(0).value
 
         self.scroll_to_highlight()
+        self.update_border_subtitle()
         self.app.tabWidget.active_tab.label = (
             path.basename(cwd) if path.basename(cwd) != "" else cwd.strip("/")
         )
@@ -217,8 +415,9 @@ class FileList(SelectionList, inherit_bindings=False):
         self.app.tabWidget.parent.on_resize()
         with self.input.prevent(self.input.Changed):
             self.input.clear()
-        if not add_to_session:
-            self.input.clear_selected()
+        self.app.update_watched_directories()
+        if callback:
+            self.call_later(callback)
 
     @work(exclusive=True)
     async def dummy_update_file_list(
@@ -231,36 +430,8 @@ class FileList(SelectionList, inherit_bindings=False):
             cwd (str): The current working directory.
         """
         self.enter_into = cwd
-        self.clear_options()
-        # Separate folders and files
-        folders, files = path_utils.get_cwd_object(cwd)
-        self.list_of_options = []
-        if folders == [PermissionError] or files == [PermissionError]:
-            self.list_of_options.append(
-                Selection(
-                    " Permission Error: Unable to access this directory.",
-                    id="",
-                    value="",
-                    disabled=True,
-                )
-            )
-        elif folders == [] and files == []:
-            self.list_of_options.append(
-                Selection("  --no-files--", value="", id="", disabled=True)
-            )
-        else:
-            file_list_options = folders + files
-            for item in file_list_options:
-                self.list_of_options.append(
-                    FileListSelectionWidget(
-                        icon=item["icon"],
-                        label=item["name"],
-                        dir_entry=item["dir_entry"],
-                        value=path_utils.compress(item["name"]),
-                        id=path_utils.compress(item["name"]),
-                    )
-                )
-        self.add_options(self.list_of_options)
+        self._set_listing(await self._scan(cwd))
+        self.app.update_watched_directories()
         # somehow prevents more debouncing, ill take it
         self.refresh(repaint=True, layout=True)
 
@@ -270,34 +441,72 @@ class FileList(SelectionList, inherit_bindings=False):
         Args:
             file_list (list[str]): List of file paths from archive contents.
         """
-        self.clear_options()
-        self.list_of_options = []
 
-        if not file_list:
-            self.list_of_options.append(
-                Selection("  --no-files--", value="", id="", disabled=True)
+        def make_option(row: int) -> Selection:
+            file_path = file_list[row]
+            if file_path.endswith("/"):
+                icon = icon_utils.get_icon_for_folder(file_path.strip("/"))
+            else:
+                icon = icon_utils.get_icon_for_file(file_path)
+            # Create a selection widget similar to FileListSelectionWidget but simpler
+            # since we don't have any metadata for archive contents
+            return Selection(
+                icon_prompt(icon, file_path),
+                value=file_path,
+                id=file_path,
+                disabled=True,  # Archive contents are not interactive like regular files
             )
-        else:
-            for file_path in file_list:
-                if file_path.endswith("/"):
-                    icon = icon_utils.get_icon_for_folder(file_path.strip("/"))
-                else:
-                    icon = icon_utils.get_icon_for_file(file_path)
-
-                # Create a selection widget similar to FileListSelectionWidget but simpler
-                # since we don't have dir_entry metadata for archive contents
-                self.list_of_options.append(
-                    Selection(
-                        f" [{icon[1]}]{icon[0]}[/{icon[1]}] {file_path}",
-                        value=path_utils.compress(file_path),
-                        id=path_utils.compress(file_path),
-                        disabled=True,  # Archive contents are not interactive like regular files
-                    )
-                )
 
-        self.add_options(self.list_of_options)
+        self._set_options(
+            VirtualOptions(
+                file_list,
+                make_option=make_option,
+                placeholder=Selection("  --no-files--", value="", id="", disabled=True),
+            )
+        )
         self.refresh(repaint=True, layout=True)
 
+    def filter_options(self, query: str) -> None:
+        """Only show the options that match a query, best match first.
+
+        This runs on the calling thread, so `SearchInput` runs `fuzzy_filter`
+        in a thread itself, and only calls `show_matches`.
+
+        Args:
+            query (str): The query to match, or an empty string to show every option.
+        """
+        self.show_matches(self.fuzzy_filter.filter(query) if query else None)
+
+    def show_matches(self, rows: list[int] | None) -> None:
+        """Only show some rows, keeping the highlight if it is still shown.
+
+        Args:
+            rows (list[int] | None): The rows to show, in order, or None to show every row.
+        """
+        if rows == self._options.view:
+            # nothing changed, so keep the highlight, scroll and caches as they are
+            return
+        try:
+            highlighted_row = self._options.row_at(self.highlighted)
+        except (IndexError, TypeError):
+            highlighted_row = -1
+        self._options.set_view(
+            rows,
+            placeholder=None
+            if rows is None
+            else Selection("   --no-matches--", value="", id="", disabled=True),
+        )
+        self._clear_caches()
+        self._mouse_hovering_over = None
+        # reset first, so that the highlight is posted even if the index is the same
+        self.highlighted = None
+        self._update_lines()
+        try:
+            self.highlighted = self._options.index_of_row(highlighted_row)
+        except ValueError:
+            self.action_first()
+        self.update_border_subtitle()
+
     async def on_selection_list_selected_changed(
         self, event: SelectionList.SelectedChanged
     ) -> None:
@@ -306,9 +515,11 @@ class FileList(SelectionList, inherit_bindings=False):
         cwd = path_utils.normalise(getcwd())
         # Get the selected option
         selected_option = self.get_option_at_index(self.highlighted)
-        file_name = path_utils.decompress(selected_option.value)
+        file_name = selected_option.value
+        # from the scan, as looking at the item again can hang on a dead mount
+        is_dir = self.entries.is_dir(selected_option.row)
         self.update_border_subtitle()
-        if self.dummy and path.isdir(path.join(self.enter_into, file_name)):
+        if self.dummy and is_dir:
             # if the folder is selected, then cd there,
             # skipping the middle folder entirely
             self.app.cd(path.join(self.enter_into, file_name))
@@ -316,7 +527,7 @@ class FileList(SelectionList, inherit_bindings=False):
             self.app.query_one("#file_list").focus()
         elif not self.select_mode_enabled:
             # Check if it's a folder or a file
-            if path.isdir(path.join(cwd, file_name)):
+            if is_dir:
                 # If it's a folder, navigate into it
                 self.app.cd(path.join(cwd, file_name))
             else:
@@ -344,19 +555,214 @@ class FileList(SelectionList, inherit_bindings=False):
             path_utils.normalise(getcwd())
         ] = highlighted_option.value
         # Get the filename from the option id
-        file_name = path_utils.decompress(highlighted_option.value)
+        file_name = highlighted_option.value
         # total files as footer
         if self.highlighted is None:
             self.highlighted = 0
         # preview
-        self.app.query_one("PreviewContainer").show_preview(
-            path_utils.normalise(path.join(getcwd(), file_name))
+        preview = self.app.query_one("PreviewContainer")
+        preview.show_preview(path_utils.normalise(path.join(getcwd(), file_name)))
+        if not self.dummy:
+            preview.prefetch(self._prefetch_paths(event.option_index))
+        self.app.query_one("MetadataContainer").update_metadata(
+            self.entries.path_of(event.option.row)
         )
-        self.app.query_one("MetadataContainer").update_metadata(event.option.dir_entry)
         self.app.query_one("#unzip").disabled = not file_name.endswith(
             tuple(ARCHIVE_EXTENSIONS)
         )
 
+    def _prefetch_paths(self, index: int) -> list[str]:
+        """Get the paths of the items that are likely to be highlighted next.
+
+        Args:
+            index (int): The index of the highlighted option.
+
+        Returns:
+            list[str]: The next `settings.preview_prefetch` items in the direction the cursor is moving, then the one behind it.
+        """
+        count = config["settings"]["preview_prefetch"]
+        step = -1 if index < self._last_highlighted_index else 1
+        self._last_highlighted_index = index
+        if count <= 0:
+            return []
+        file_paths = []
+        for offset in [*range(1, count + 1), -1]:
+            neighbour = index + step * offset
+            if not 0 <= neighbour < self.option_count:
+                continue
+            option = self.get_option_at_index(neighbour)
+            if isinstance(option, FileListSelectionWidget):
+                file_paths.append(
+                    path_utils.normalise(self.entries.path_of(option.row))
+                )
+        return file_paths
+
+    # Every option is exactly one line tall (Selection only keeps the first
+    # line of its prompt), so the lines don't need to be measured, and
+    # the line of an option is just its index.
+    def _update_lines(self) -> None:
+        """Update the virtual size to match the number of options."""
+        if not self.scrollable_content_region:
+            return
+        virtual_size = Size(
+            self.scrollable_content_region.width - self._get_left_gutter_width(),
+            len(self._options),
+        )
+        if virtual_size != self.virtual_size:
+            self.virtual_size = virtual_size
+            self._scroll_update(virtual_size)
+
+    def get_content_height(self, container: Size, viewport: Size, width: int) -> int:
+        return len(self._options)
+
+    def get_content_width(self, container: Size, viewport: Size) -> int:
+        return container.width
+
+    def scroll_to_highlight(self, top: bool = False) -> None:
+        """Scroll to the highlighted option.
+
+        Args:
+            top: Ensure highlighted option is at the top of the widget.
+        """
+        if self.highlighted is None or not self.is_mounted:
+            return
+        self._update_lines()
+        self.scroll_to_region(
+            Region(0, self.highlighted, self.scrollable_content_region.width, 1),
+            force=True,
+            animate=False,
+            top=top,
+            immediate=True,
+        )
+
+    def _move_page(self, direction: _widget_navigation.Direction) -> None:
+        """Move the highlight roughly by one page in the given direction.
+
+        Args:
+            direction: `-1` to move up a page, `1` to move down a page.
+        """
+        if not self._options:
+            return
+        self.highlighted = _widget_navigation.find_next_enabled_no_wrap(
+            candidates=self._options,
+            anchor=clamp(
+                (self.highlighted or 0)
+                + direction * self.scrollable_content_region.height,
+                0,
+                len(self._options) - 1,
+            ),
+            direction=direction,
+            with_anchor=True,
+        )
+
+    def _render_option(self, index: int, style: VisualStyle) -> list[Strip]:
+        """Get the rendered option at an index, with a given style.
+
+        Args:
+            index (int): The index of the option.
+            style (VisualStyle): The style to render with.
+
+        Returns:
+            list[Strip]: The rendered option.
+        """
+        option = self._options[index]
+        padding = self.get_component_styles("option-list--option").padding
+        width = self.scrollable_content_region.width - self._get_left_gutter_width()
+        cache_key = (option, style, padding)
+        if (strips := self._option_render_cache.get(cache_key)) is None:
+            visual = self._get_visual(option)
+            if padding:
+                visual = Padding(visual, padding)
+            strips = [
+                strip.extend_cell_length(width, style.rich_style).apply_meta({
+                    "option": index
+                })
+                for strip in visual.to_strips(self, visual, width, None, style)
+            ]
+            self._option_render_cache[cache_key] = strips
+        return strips
+
+    def clear_options(self) -> Self:
+        """Clear the content of the file list.
+
+        Returns:
+            The `FileList` instance.
+        """
+        self._set_options(VirtualOptions([], make_option=None))
+        return self
+
+    def get_option_index(self, option_id: str) -> int:
+        """Get the index of the option with the given ID.
+
+        Args:
+            option_id: The ID of the option to get the index of.
+
+        Returns:
+            The index of the item with the given ID.
+
+        Raises:
+            OptionDoesNotExist: If no option has the given ID.
+        """
+        try:
+            return self._options.index_of_row(self._options.row_of_label(option_id))
+        except ValueError:
+            raise OptionDoesNotExist(
+                f"There is no option with an ID of {option_id!r}"
+            ) from None
+
+    def get_option(self, option_id: str) -> Selection:
+        """Get the option with the given ID.
+
+        Args:
+            option_id: The ID of the option to get.
+
+        Returns:
+            The option with the ID.
+
+        Raises:
+            OptionDoesNotExist: If no option has the given ID.
+        """  # noqa: DOC502
+        return self._options[self.get_option_index(option_id)]
+
+    def _apply_to_all(self, state_change: Callable[[str], bool]) -> Self:
+        """Apply a selection state change to every option that is shown,
+        without creating the options.
+
+        Args:
+            state_change: The state change function to apply.
+
+        Returns:
+            The `FileList` instance.
+        """
+        if self._options.showing_placeholder:
+            return self
+        changed = False
+        labels = self._options.labels
+        with self.prevent(self.SelectedChanged):
+            for row in self._options.rows():
+                changed = state_change(labels[row]) or changed
+        if changed:
+            self._message_changed()
+        self.refresh()
+        return self
+
+    def _toggle(self, value: str) -> bool:
+        """Toggle the selection state of the given value.
+
+        Args:
+            value: The value to toggle.
+
+        Returns:
+            `True`.
+        """
+        if value in self._selected:
+            self._deselect(value)
+        else:
+            self._select(value)
+        if self.highlighted is not None:
+            self._message_toggled(self.highlighted)
+        return True
+
     # Use better versions of the checkbox icons
     def _get_left_gutter_width(
         self,
@@ -396,9 +802,8 @@ class FileList(SelectionList, inherit_bindings=False):
         # - using custom icons for the checkbox.
 
         def super_render_line(y: int, selection_style: str = "") -> Strip:
-            line_number = self.scroll_offset.y + y
+            option_index = self.scroll_offset.y + y
             try:
-                option_index, line_offset = self._lines[line_number]
                 option = self.options[option_index]
             except IndexError:
                 return Strip.blank(
@@ -422,15 +827,7 @@ class FileList(SelectionList, inherit_bindings=False):
             else:
                 style = self.get_visual_style("option-list--option")
 
-            strips = self._get_option_render(option, style)
-            try:
-                strip = strips[line_offset]
-            except IndexError:
-                return Strip.blank(
-                    self.scrollable_content_region.width,
-                    self.get_visual_style("option-list--option").rich_style,
-                )
-            return strip
+            return self._render_option(option_index, style)[0]
 
         # just return standard rendering
         if self.dummy or not self.select_mode_enabled:
@@ -447,35 +844,44 @@ class FileList(SelectionList, inherit_bindings=False):
         if selection.disabled:
             return Strip([*super_render_line(y)])
 
+        selected = selection.value in self._selected
+        highlighted = self.highlighted == selection_index
+        cache_key = (
+            selection_index,
+            selected,
+            highlighted,
+            self._mouse_hovering_over == selection_index,
+            self.has_focus,
+            self.scrollable_content_region.width,
+            self.app.theme,
+        )
+        strip = self._strip_cache.get(cache_key)
+        if strip is not None:
+            return strip
+
         component_style = "selection-list--button"
-        if selection.value in self._selected:
+        if selected:
             component_style += "-selected"
-        if self.highlighted == selection_index:
+        if highlighted:
             component_style += "-highlighted"
 
-        line = super_render_line(y, component_style)
-        underlying_style = next(iter(line)).style or self.rich_style
-        assert underlying_style is not None
-
-        button_style = self.get_component_rich_style(component_style)
-
-        side_style = Style.from_color(button_style.bgcolor, underlying_style.bgcolor)
+        return self._strip_cache.add_button(
+            cache_key,
+            super_render_line(y, component_style),
+            selection_index,
+            selected,
+            component_style,
+            self.get_component_rich_style,
+            self.rich_style,
+        )
 
-        side_style += Style(meta={"option": selection_index})
-        button_style += Style(meta={"option": selection_index})
+    def _clear_caches(self) -> None:
+        super()._clear_caches()
+        self._strip_cache.clear()
 
-        return Strip([
-            Segment(icon_utils.get_toggle_button_icon("left"), style=side_style),
-            Segment(
-                icon_utils.get_toggle_button_icon("inner_filled")
-                if selection.value in self._selected
-                else icon_utils.get_toggle_button_icon("inner"),
-                style=button_style,
-            ),
-            Segment(icon_utils.get_toggle_button_icon("right"), style=side_style),
-            Segment(" ", style=underlying_style),
-            *line,
-        ])
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._strip_cache.clear(styles=True)
 
     async def toggle_mode(self) -> None:
         """Toggle the selection mode between select and normal."""
@@ -483,8 +889,7 @@ class FileList(SelectionList, inherit_bindings=False):
             return
         self.select_mode_enabled = not self.select_mode_enabled
         if not self.select_mode_enabled:
-            self._line_cache.clear()
-            self._option_render_cache.clear()
+            self._clear_caches()
         self.refresh(layout=True, repaint=True)
         self.app.tabWidget.active_tab.session.selectMode = self.select_mode_enabled
         self.update_border_subtitle()
@@ -499,18 +904,12 @@ class FileList(SelectionList, inherit_bindings=False):
         if not self.select_mode_enabled:
             return [
                 path_utils.normalise(
-                    path.join(
-                        cwd,
-                        path_utils.decompress(
-                            self.get_option_at_index(self.highlighted).value
-                        ),
-                    )
+                    path.join(cwd, self.get_option_at_index(self.highlighted).value)
                 )
             ]
         else:
             return [
-                path_utils.normalise(path.join(cwd, path_utils.decompress(option)))
-                for option in self.selected
+                path_utils.normalise(path.join(cwd, option)) for option in self.selected
             ]
 
     async def on_key(self, event: events.Key) -> None:
@@ -521,11 +920,33 @@ class FileList(SelectionList, inherit_bindings=False):
                 case key if key in config["keybinds"]["toggle_visual"]:
                     event.stop()
                     await self.toggle_mode()
+                case key if key in config["keybinds"]["cycle_sort"]:
+                    event.stop()
+                    session = self.app.tabWidget.active_tab.session
+                    session.sortBy = SORT_ORDERS[
+                        (SORT_ORDERS.index(session.sortBy) + 1) % len(SORT_ORDERS)
+                    ]
+                    self.resort()
+                    self.notify(
+                        f"Sorting by {session.sortBy}"
+                        + (" (reversed)" if session.sortReverse else ""),
+                        title="Sort",
+                    )
+                case key if key in config["keybinds"]["toggle_sort_reverse"]:
+                    event.stop()
+                    session = self.app.tabWidget.active_tab.session
+                    session.sortReverse = not session.sortReverse
+                    self.resort()
+                    self.notify(
+                        f"Sorting by {session.sortBy}"
+                        + (" (reversed)" if session.sortReverse else ""),
+                        title="Sort",
+                    )
                 case key if key in config["keybinds"]["toggle_all"]:
                     event.stop()
                     if not self.select_mode_enabled:
                         await self.toggle_mode()
-                    if len(self.selected) == len(self.options):
+                    if len(self.selected) == self._options.row_count:
                         self.deselect_all()
                     else:
                         self.select_all()
@@ -635,19 +1056,17 @@ class FileList(SelectionList, inherit_bindings=False):
                     if path.isdir(
                         path.join(
                             getcwd(),
-                            path_utils.decompress(
-                                self.get_option_at_index(self.highlighted).id
-                            ),
+                            self.get_option_at_index(self.highlighted).id,
                         )
                     ):
                         with self.app.suspend():
                             cmd(
-                                f'{config["plugins"]["editor"]["folder_executable"]} "{path.join(getcwd(), path_utils.decompress(self.get_option_at_index(self.highlighted).id))}"'
+                                f'{config["plugins"]["editor"]["folder_executable"]} "{path.join(getcwd(), self.get_option_at_index(self.highlighted).id)}"'
                             )
                     else:
                         with self.app.suspend():
                             cmd(
-                                f'{config["plugins"]["editor"]["file_executable"]} "{path.join(getcwd(), path_utils.decompress(self.get_option_at_index(self.highlighted).id))}"'
+                                f'{config["plugins"]["editor"]["file_executable"]} "{path.join(getcwd(), self.get_option_at_index(self.highlighted).id)}"'
                             )
                 # hit buttons with keybinds
                 case key if (
@@ -727,10 +1146,12 @@ class FileList(SelectionList, inherit_bindings=False):
             utils.set_scuffed_subtitle(
                 self.parent,
                 "NORMAL",
-                f"{self.highlighted + 1}/{self.option_count}",
+                f"{0 if self.highlighted is None or self._options.showing_placeholder else self.highlighted + 1}/{self._options.row_count}",
             )
             self.app.tabWidget.active_tab.selectedItems = []
         else:
             utils.set_scuffed_subtitle(
-                self.parent, "SELECT", f"{len(self.selected)}/{len(self.options)}"
+                self.parent,
+                "SELECT",
+                f"{len(self.selected)}/{self._options.row_count}",
             )
@@ -4,9 +4,11 @@ from typing import ClassVar
 from textual import events, on, work
 from textual.binding import Binding, BindingType
 from textual.widgets import Input, OptionList
-from textual.widgets.option_list import Option
+from textual.widgets.option_list import Option, OptionDoesNotExist
 
-from rovr.classes import FolderNotFileError, PinnedSidebarOption
+from rovr.classes import FolderNotFileError, PinnedSidebarOption, ProbeTimeout
+from rovr.classes.fuzzy_filter import FuzzyFilter
+from rovr.classes.probe_pool import probe_pool
 from rovr.functions import icons as icon_utils
 from rovr.functions import path as path_utils
 from rovr.functions import pins as pin_utils
@@ -48,6 +50,7 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
+        self.fuzzy_filter = FuzzyFilter([], config["settings"]["search_result_limit"])
 
     @work(exclusive=True)
     async def reload_pins(self) -> None:
@@ -65,7 +68,8 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
         print(f"Reloading default folders: {default}")
         self.clear_options()
         for default_folder in default:
-            if not path.isdir(default_folder["path"]):
+            is_dir = await self._is_dir(default_folder["path"])
+            if is_dir is False:
                 if path.exists(default_folder["path"]):
                     raise FolderNotFileError(
                         f"Expected a folder but got a file: {default_folder['path']}"
@@ -74,7 +78,7 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
                     pass
             if "icon" in default_folder:
                 icon = default_folder["icon"]
-            elif path.isdir(default_folder["path"]):
+            elif is_dir is not False:
                 icon = icon_utils.get_icon_for_folder(default_folder["name"])
             else:
                 icon = icon_utils.get_icon_for_file(default_folder["name"])
@@ -82,7 +86,7 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
                 PinnedSidebarOption(
                     icon=icon,
                     label=default_folder["name"],
-                    id=f"{path_utils.compress(default_folder['path'])}-default",
+                    id=f"{default_folder['path']}-default",
                 )
             )
         self.list_of_options.append(
@@ -93,7 +97,8 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
                 pin["path"]
             except KeyError:
                 break
-            if not path.isdir(pin["path"]):
+            is_dir = await self._is_dir(pin["path"])
+            if is_dir is False:
                 if path.exists(pin["path"]):
                     raise FolderNotFileError(
                         f"Expected a folder but got a file: {pin['path']}"
@@ -102,7 +107,7 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
                     pass
             if "icon" in pin:
                 icon = pin["icon"]
-            elif path.isdir(pin["path"]):
+            elif is_dir is not False:
                 icon = icon_utils.get_icon_for_folder(pin["name"])
             else:
                 icon = icon_utils.get_icon_for_file(pin["name"])
@@ -110,7 +115,7 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
                 PinnedSidebarOption(
                     icon=icon,
                     label=pin["name"],
-                    id=f"{path_utils.compress(pin['path'])}-pinned",
+                    id=f"{pin['path']}-pinned",
                 )
             )
         self.list_of_options.append(
@@ -122,10 +127,69 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
                 PinnedSidebarOption(
                     icon=icon_utils.get_icon("folder", ":/drive:"),
                     label=drive,
-                    id=f"{path_utils.compress(drive)}-drives",
+                    id=f"{drive}-drives",
                 )
             )
         self.add_options(self.list_of_options)
+        self.fuzzy_filter = FuzzyFilter(
+            [
+                option.label if isinstance(option, PinnedSidebarOption) else ""
+                for option in self.list_of_options
+            ],
+            config["settings"]["search_result_limit"],
+        )
+
+    def show_matches(self, rows: list[int] | None) -> None:
+        """Only show some pins, keeping the headers, and the highlight if it is still shown.
+
+        Args:
+            rows (list[int] | None): The rows of `list_of_options` to show, best first, or None to show every pin.
+        """
+        if rows is None:
+            options = self.list_of_options
+        else:
+            # the default folders have no header, and every other
+            # section shows its own matches under its header
+            sections: dict[int, list[Option]] = {-1: []}
+            section_of = []
+            section = -1
+            for row, option in enumerate(self.list_of_options):
+                if option.disabled:
+                    section = row
+                    sections[section] = [option]
+                section_of.append(section)
+            for row in rows:
+                sections[section_of[row]].append(self.list_of_options[row])
+            options = [option for section in sections.values() for option in section]
+        if [option.id for option in options] == [option.id for option in self.options]:
+            return
+        try:
+            highlighted = self.highlighted_option.id
+        except AttributeError:
+            highlighted = None
+        self.clear_options()
+        self.add_options(options)
+        try:
+            self.highlighted = self.get_option_index(highlighted)
+        except OptionDoesNotExist:
+            self.action_cursor_down()
+
+    @staticmethod
+    async def _is_dir(location: str) -> bool | None:
+        """Check whether a pin is a folder, without waiting on a hung mount.
+
+        Args:
+            location (str): The path of the pin.
+
+        Returns:
+            bool | None: Whether it is a folder, or None if it didn't respond in time.
+        """
+        try:
+            # awaited, so a hung pin doesn't freeze the ui, but it still
+            # holds up the rest of the sidebar, so keep this short
+            return await probe_pool.run_async(path.isdir, location, timeout=0.5)
+        except ProbeTimeout:
+            return None
 
     async def on_mount(self) -> None:
         """Reload the pinned files from the config."""
@@ -160,8 +224,8 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
         selected_option = event.option
         # Get the file path from the option id
         assert selected_option.id is not None
-        file_path = path_utils.decompress(selected_option.id.split("-")[0])
-        if not path.isdir(file_path):
+        file_path = selected_option.id.rsplit("-", 1)[0]
+        if await self._is_dir(file_path) is False:
             if path.exists(file_path):
                 raise FolderNotFileError(
                     f"Expected a folder but got a file: {file_path}"
@@ -172,8 +236,7 @@ class PinnedSidebar(OptionList, inherit_bindings=False):
         self.app.query_one("#file_list").focus()
         with self.input.prevent(Input.Changed):
             self.input.clear()
-        self.clear_options()
-        self.add_options(self.list_of_options)
+        self.show_matches(None)
 
     def on_key(self, event: events.Key) -> None:
         if event.key in config["keybinds"]["focus_search"]:
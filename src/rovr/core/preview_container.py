@@ -1,11 +1,17 @@
 import asyncio
-import asyncio.subprocess
+import subprocess
+import sys
 import tarfile
 import zipfile
+from contextlib import suppress
+from functools import partial
+from io import BytesIO
 from os import path
+from threading import Event
 from typing import ClassVar
 
 import textual_image.widget as timg
+from PIL import Image
 from rich.text import Text
 from textual import events, on, work
 from textual.app import ComposeResult
@@ -13,13 +19,54 @@ from textual.binding import Binding, BindingType
 from textual.containers import Container
 from textual.widgets import Static, TextArea
 
-from rovr.classes import Archive
+from rovr.classes import (
+    Archive,
+    EntryTable,
+    PreviewCache,
+    PreviewPrefetcher,
+    SyntaxHighlighter,
+)
 from rovr.core import FileList
+from rovr.core.file_list import listing_cache
+from rovr.functions.utils import read_lines, sniff_file
 from rovr.variables.constants import PreviewContainerTitles, config
-from rovr.variables.maps import ARCHIVE_EXTENSIONS, EXT_TO_LANG_MAP, PIL_EXTENSIONS
+from rovr.variables.maps import (
+    ARCHIVE_EXTENSIONS,
+    EXT_TO_LANG_MAP,
+    PIL_EXTENSIONS,
+    dirs,
+)
+
+# the most characters of a line that are read for the preview
+MAX_PREVIEW_COLUMNS = 1024
+# the most characters of a file that are read when previewing all of it
+FULL_PREVIEW_LIMIT = 16 * 1024 * 1024
+# the most pixels a cell can take up, which images are shrunk to fit
+THUMBNAIL_CELL_SIZE = (20, 40)
 
 titles = PreviewContainerTitles()
 
+preview_cache = PreviewCache(
+    max_memory=int(config["settings"]["preview_cache_memory"] * 1_000_000),
+    disk_dir=path.join(dirs.user_cache_dir, "previews"),
+    max_disk=int(config["settings"]["preview_cache_disk"] * 1_000_000),
+)
+syntax_highlighter = SyntaxHighlighter()
+
+
+def _size_of(preview: str | list[str]) -> int:
+    """Roughly how many bytes some text takes up.
+
+    Args:
+        preview (str | list[str]): The text, or its lines.
+
+    Returns:
+        int: The size.
+    """
+    if isinstance(preview, str):
+        return sys.getsizeof(preview)
+    return sys.getsizeof(preview) + sum(sys.getsizeof(line) for line in preview)
+
 
 class CustomTextArea(TextArea, inherit_bindings=False):
     BINDINGS: ClassVar[list[BindingType]] = (
@@ -143,13 +190,26 @@ class PreviewContainer(Container):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._queued_task = None
-        self._queued_task_args: str | None = None
+        self._queued_task_args: tuple[str, int | None] | None = None
         self._current_content: str | list[str] | None = None
         self._current_file_path = None
+        # the line to show, from a content search
+        self._current_line: int | None = None
+        # the file and line last asked for, so that highlighting the file
+        # in the file list afterwards still shows that line
+        self._requested_line: tuple[str, int] | None = None
+        # the first line and the number of lines that were read, if only
+        # part of the file was read
+        self._content_window: tuple[int, int] | None = None
+        # the thumbnail of the image to show, or its path
+        self._current_image: Image.Image | str | None = None
         self._is_image = False
         self._is_archive = False
         self._initial_height = self.size.height
         self._current_preview_type = "none"
+        self._prefetcher = PreviewPrefetcher(self._prefetch_preview)
+        # the size of the preview when prefetching was asked for
+        self._prefetch_size = (0, 0)
 
     def compose(self) -> ComposeResult:
         # for some unknown reason, it started causing KeyErrors
@@ -175,7 +235,7 @@ class PreviewContainer(Container):
             try:
                 await self.mount(
                     timg.__dict__[config["settings"]["image_protocol"] + "Image"](
-                        self._current_file_path,
+                        self._current_image,
                         id="image_preview",
                         classes="inner_preview",
                     )
@@ -196,68 +256,133 @@ class PreviewContainer(Container):
             self._current_preview_type = "image"
         else:
             try:
-                self.query_one("#image_preview").image = self._current_file_path
+                self.query_one("#image_preview").image = self._current_image
             except Exception:
                 self._current_preview_type = "none"
                 # re-make the widget itself
                 await self._show_image_preview()
         self.border_title = titles.image
 
-    async def _show_bat_file_preview(self) -> bool:
-        """Render file preview using bat, updating in place if possible.
+    def _load_bat(
+        self,
+        file_path: str,
+        width: int,
+        height: int,
+        line: int | None = None,
+        cancelled: Event | None = None,
+    ) -> tuple[Text | None, str]:
+        """Highlight a file with bat, or get it from the cache.
+
+        Args:
+            file_path (str): The path to the file.
+            width (int): The width of the preview.
+            height (int): The height of the preview.
+            line (int | None): The line to show and highlight, starting from 1, if there is one.
+            cancelled (Event | None): Stops bat once it is set.
+
         Returns:
-            bool: whether or not the action was successful"""
-        bat_executable = config["plugins"]["bat"]["executable"]
+            tuple[Text | None, str]: The highlighted file, or None and why bat failed.
+        """
         preview_full = config["settings"]["preview_full"]
         command = [
-            bat_executable,
+            config["plugins"]["bat"]["executable"],
             "--force-colorization",
             "--paging=never",
             "--style=numbers"
             if config["plugins"]["bat"]["show_line_numbers"]
             else "--style=plain",
         ]
-        if not preview_full:
-            max_lines = self.size.height
-            if max_lines > 0:
-                command.append(f"--line-range=:{max_lines}")
-        command.append(self._current_file_path)
-
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode == 0:
-                bat_output = stdout.decode("utf-8", errors="ignore")
-                new_content = Text.from_ansi(bat_output)
+        if not preview_full and height > 0:
+            start = self._window_start(height, line)
+            command.append(f"--line-range={start + 1}:{start + height}")
+        if line is not None:
+            command.append(f"--highlight-line={line}")
+        command.append(file_path)
+
+        key = preview_cache.key(
+            file_path,
+            "bat",
+            width,
+            0 if preview_full else height,
+            line,
+            preview_full,
+            config["plugins"]["bat"]["show_line_numbers"],
+        )
+        content = preview_cache.get(key)
+        if content is not None:
+            return content, ""
+        bat_output = preview_cache.get_bytes(key)
+        if bat_output is None:
+            with subprocess.Popen(
+                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            ) as process:
+                while True:
+                    try:
+                        bat_output, stderr = process.communicate(timeout=0.05)
+                        break
+                    except subprocess.TimeoutExpired:
+                        if cancelled is not None and cancelled.is_set():
+                            process.kill()
+                            return None, "cancelled"
+            if process.returncode != 0:
+                return None, stderr.decode("utf-8", errors="ignore")
+            preview_cache.put_bytes(key, bat_output)
+        content = Text.from_ansi(bat_output.decode("utf-8", errors="ignore"))
+        # the spans take up about as much as the text
+        preview_cache.put(key, content, 2 * len(bat_output))
+        return content, ""
+
+    def _highlight(
+        self, file_path: str, height: int, line: int | None = None
+    ) -> Text | None:
+        """Highlight the lines of a file that fit, without starting bat.
 
-                if self._current_preview_type != "bat":
-                    self._current_preview_type = "none"
-                    await self.remove_children()
-                    self.remove_class("full", "clip")
+        Args:
+            file_path (str): The path to the file.
+            height (int): The height of the preview.
+            line (int | None): The line to show and highlight, starting from 1, if there is one.
 
-                    await self.mount(
-                        Static(new_content, id="text_preview", classes="inner_preview")
-                    )
-                    self.query_one(Static).can_focus = True
-                    self.add_class("bar")
-                    self._current_preview_type = "bat"
-                else:
-                    self.query_one("#text_preview", Static).update(new_content)
+        Returns:
+            Text | None: The highlighted lines, or None if bat has to be used instead.
+        """
+        if not config["plugins"]["bat"]["builtin_highlighter"]:
+            return None
+        if config["settings"]["preview_full"]:
+            start, count = 0, sys.maxsize
+        else:
+            start, count = self._window_start(height, line), height
+        return syntax_highlighter.highlight(
+            file_path,
+            EXT_TO_LANG_MAP.get(path.splitext(file_path)[1]),
+            start,
+            count,
+            line,
+            config["plugins"]["bat"]["show_line_numbers"],
+            MAX_PREVIEW_COLUMNS,
+        )
 
-                self.border_title = titles.bat
-                self.remove_class("full", "clip")
-                if preview_full:
-                    self.add_class("full")
-                else:
-                    self.add_class("clip")
-                return True
-            else:
-                error_message = stderr.decode("utf-8", errors="ignore")
+    async def _show_bat_file_preview(self) -> bool:
+        """Render file preview using the builtin highlighter or bat, updating in place if possible.
+        Returns:
+            bool: whether or not the action was successful"""
+        preview_full = config["settings"]["preview_full"]
+        line = self._current_line
+        try:
+            new_content = await asyncio.to_thread(
+                self._highlight, self._current_file_path, self.size.height, line
+            )
+            title = titles.file
+            if new_content is None:
+                # a language that the builtin highlighter doesn't know
+                new_content, error_message = await asyncio.to_thread(
+                    self._load_bat,
+                    self._current_file_path,
+                    self.size.width,
+                    self.size.height,
+                    line,
+                )
+                title = titles.bat
+            if new_content is None:
                 self._current_preview_type = "none"
                 await self.remove_children()
                 self.notify(
@@ -266,6 +391,34 @@ class PreviewContainer(Container):
                     severity="warning",
                 )
                 return False
+
+            if self._current_preview_type != "bat":
+                self._current_preview_type = "none"
+                await self.remove_children()
+                self.remove_class("full", "clip")
+
+                await self.mount(
+                    Static(new_content, id="text_preview", classes="inner_preview")
+                )
+                self.query_one(Static).can_focus = True
+                self.add_class("bar")
+                self._current_preview_type = "bat"
+            else:
+                self.query_one("#text_preview", Static).update(new_content)
+
+            self.border_title = title
+            self.remove_class("full", "clip")
+            if preview_full:
+                self.add_class("full")
+                if line is not None:
+                    self.call_after_refresh(
+                        self.scroll_to,
+                        y=max(0, line - 1 - self.size.height // 2),
+                        animate=False,
+                    )
+            else:
+                self.add_class("clip")
+            return True
         except (FileNotFoundError, Exception) as e:
             self.notify(str(e), title="Plugins: Bat", severity="warning")
             return False
@@ -274,12 +427,22 @@ class PreviewContainer(Container):
         """Render file preview using TextArea, updating in place if possible."""
         text_to_display = self._current_content
         preview_full = config["settings"]["preview_full"]
+        # the row of the text area that the line to show ends up on
+        line_row = None if self._current_line is None else self._current_line - 1
         if not preview_full:
             lines = text_to_display.splitlines()
             max_lines = self.size.height
             if max_lines > 0:
-                if len(lines) > max_lines:
-                    lines = lines[:max_lines]
+                # only the lines around the one to show may have been read
+                content_start = (
+                    0 if self._content_window is None else self._content_window[0]
+                )
+                start = max(
+                    0, self._window_start(max_lines, self._current_line) - content_start
+                )
+                lines = lines[start : start + max_lines]
+                if line_row is not None:
+                    line_row -= content_start + start
             else:
                 lines = []
             max_width = self.size.width - 5
@@ -327,8 +490,28 @@ class PreviewContainer(Container):
             text_area.text = text_to_display
             text_area.language = language
 
+        if line_row is not None and not is_special_content:
+            text_area = self.query_one("#text_preview", CustomTextArea)
+            text_area.select_line(line_row)
+            text_area.scroll_cursor_visible(center=True, animate=False)
+
         self.border_title = titles.file
 
+    @staticmethod
+    def _window_start(max_lines: int, line: int | None) -> int:
+        """Get the first line to show when only part of a file fits.
+
+        Args:
+            max_lines (int): The number of lines that fit.
+            line (int | None): The line to show, starting from 1, if there is one.
+
+        Returns:
+            int: The index of the first line, which centers the line to show if there is one.
+        """
+        if line is None:
+            return 0
+        return max(0, line - 1 - max_lines // 2)
+
     async def _render_preview(self) -> None:
         """Render function dispatcher."""
         if self._current_file_path is None:
@@ -413,17 +596,24 @@ class PreviewContainer(Container):
 
     def any_in_queue(self) -> bool:
         if self._queued_task is not None:
-            self._queued_task(self._queued_task_args)
+            self._queued_task(*self._queued_task_args)
             self._queued_task, self._queued_task_args = None, None
             return True
         return False
 
-    def show_preview(self, file_path: str) -> None:
+    def show_preview(self, file_path: str, line: int | None = None) -> None:
         """
         Debounce requests, then show preview
         Args:
             file_path(str): The file path
+            line(int | None): The line to show and highlight, starting from 1
         """
+        if line is not None:
+            self._requested_line = (file_path, line)
+        elif self._requested_line is not None and self._requested_line[0] == file_path:
+            line = self._requested_line[1]
+        else:
+            self._requested_line = None
         if (
             any(
                 worker.is_running
@@ -435,16 +625,224 @@ class PreviewContainer(Container):
             or "zen" in self.app.classes
         ):
             self._queued_task = self._perform_show_preview
-            self._queued_task_args = file_path
+            self._queued_task_args = (file_path, line)
         else:
-            self._perform_show_preview(file_path)
+            self._perform_show_preview(file_path, line)
+
+    def _load_archive(self, file_path: str) -> list[str]:
+        """List the files in an archive, or get them from the cache.
+
+        Args:
+            file_path (str): The path to the archive.
+
+        Returns:
+            list[str]: The files to show.
+        """
+        key = preview_cache.key(
+            file_path, "archive", 0, 0, config["settings"]["preview_full"]
+        )
+        content = preview_cache.get(key)
+        if content is not None:
+            return content
+        data = preview_cache.get_bytes(key)
+        if data is not None:
+            content = data.decode("utf-8").split("\n") if data else []
+            preview_cache.put(key, content, _size_of(content))
+            return content
+        try:
+            with Archive(file_path, "r") as archive:
+                if config["settings"]["preview_full"]:
+                    all_files = []
+                    for member in archive.infolist():
+                        filename = getattr(
+                            member, "filename", getattr(member, "name", "")
+                        )
+                        is_dir_func = getattr(
+                            member, "is_dir", getattr(member, "isdir", None)
+                        )
+                        is_dir = (
+                            is_dir_func()
+                            if is_dir_func
+                            else filename.replace("\\", "/").endswith("/")
+                        )
+                        if not is_dir:
+                            all_files.append(filename)
+                else:
+                    top_level_files = set()
+                    top_level_dirs = set()
+                    for member in archive.infolist():
+                        filename = getattr(
+                            member, "filename", getattr(member, "name", "")
+                        )
+                        is_dir_func = getattr(
+                            member, "is_dir", getattr(member, "isdir", None)
+                        )
+                        is_dir = (
+                            is_dir_func()
+                            if is_dir_func
+                            else filename.replace("\\", "/").endswith("/")
+                        )
+
+                        filename = filename.replace("\\", "/")
+                        if not filename:
+                            continue
+
+                        parts = filename.strip("/").split("/")
+                        if len(parts) == 1 and not is_dir:
+                            top_level_files.add(parts[0])
+                        elif parts and parts[0]:
+                            top_level_dirs.add(parts[0])
+
+                    top_level_files -= top_level_dirs
+                    all_files = sorted([d + "/" for d in top_level_dirs]) + sorted(
+                        list(top_level_files)
+                    )
+        except (
+            zipfile.BadZipFile,
+            tarfile.TarError,
+            ValueError,
+            FileNotFoundError,
+        ):
+            return [config["interface"]["preview_error"]]
+        preview_cache.put(key, all_files, _size_of(all_files))
+        preview_cache.put_bytes(key, "\n".join(all_files).encode("utf-8"))
+        return all_files
+
+    def _load_image(self, file_path: str, width: int, height: int) -> Image.Image | str:
+        """Decode an image, shrunk to fit the preview, or get it from the cache.
+
+        Args:
+            file_path (str): The path to the image.
+            width (int): The width of the preview, in cells.
+            height (int): The height of the preview, in cells.
+
+        Returns:
+            Image.Image | str: The thumbnail, or the path to the image if it can't be decoded here.
+        """
+        box = (
+            max(1, width) * THUMBNAIL_CELL_SIZE[0],
+            max(1, height) * THUMBNAIL_CELL_SIZE[1],
+        )
+        key = preview_cache.key(file_path, "image", width, height)
+        image = preview_cache.get(key)
+        if image is not None:
+            return image
+        try:
+            data = preview_cache.get_bytes(key)
+            image = Image.open(BytesIO(data) if data is not None else file_path)
+            # jpegs can be decoded at a smaller size straight away
+            image.draft("RGB", box)
+            image.thumbnail(box)
+            image.load()
+        except (OSError, ValueError, Image.DecompressionBombError):
+            # let the image widget show it, or fail to
+            return file_path
+        preview_cache.put(
+            key, image, len(image.getbands()) * image.width * image.height
+        )
+        if data is None:
+            thumbnail = BytesIO()
+            with suppress(OSError, ValueError):
+                image.save(thumbnail, "PNG")
+                preview_cache.put_bytes(key, thumbnail.getvalue())
+        return image
+
+    def _load_text(
+        self, file_path: str, line: int | None, height: int
+    ) -> tuple[str, tuple[int, int] | None]:
+        """Read the lines of a file that fit, or get them from the cache.
+
+        Args:
+            file_path (str): The path to the file.
+            line (int | None): The line to show, starting from 1, if there is one.
+            height (int): The height of the preview.
+
+        Returns:
+            tuple[str, tuple[int, int] | None]: The text, and the first line and number of lines that were read, if only part of the file was.
+        """
+        preview_full = config["settings"]["preview_full"]
+        key = preview_cache.key(
+            file_path,
+            "text",
+            0,
+            0 if preview_full else height,
+            None if preview_full else line,
+            preview_full,
+        )
+        cached = preview_cache.get(key)
+        if cached is not None:
+            return cached
+        content_window = None
+        try:
+            # don't read all of a big binary file just to find out
+            encoding = sniff_file(file_path)
+            if encoding is None:
+                return config["interface"]["preview_binary"], None
+            elif preview_full:
+                with open(file_path, "r", encoding=encoding, errors="replace") as f:
+                    content = f.read(FULL_PREVIEW_LIMIT).removeprefix("\ufeff")
+            else:
+                # only read the lines that fit, so that the size of the file
+                # doesn't matter
+                start = self._window_start(height, line)
+                lines, has_more = read_lines(
+                    file_path, start, height, MAX_PREVIEW_COLUMNS, encoding
+                )
+                content = "\n".join(lines)
+                if start > 0 or has_more:
+                    content_window = (start, height)
+        except (FileNotFoundError, PermissionError, OSError, MemoryError):
+            # not taking my chances with a memory error
+            return config["interface"]["preview_error"], None
+        preview_cache.put(key, (content, content_window), _size_of(content))
+        return content, content_window
+
+    def prefetch(self, file_paths: list[str]) -> None:
+        """Load the previews of items that are likely to be highlighted next into the cache.
+
+        Args:
+            file_paths (list[str]): The normalised paths of the items, most likely first.
+        """
+        if "hide" in self.classes or "zen" in self.app.classes:
+            file_paths = []
+        self._prefetch_size = (self.size.width, self.size.height)
+        self._prefetcher.prefetch(file_paths)
+
+    def _prefetch_preview(self, file_path: str, cancelled: Event) -> None:
+        """Load the preview of an item into the cache, in the prefetcher's thread.
+
+        Args:
+            file_path (str): The normalised path of the item.
+            cancelled (Event): Set once the preview isn't wanted anymore.
+        """
+        width, height = self._prefetch_size
+        if path.isdir(file_path):
+            # the folder preview takes its listing from the same cache
+            listing_cache.get(file_path, partial(EntryTable.scan, cancelled=cancelled))
+        elif any(file_path.endswith(ext) for ext in ARCHIVE_EXTENSIONS):
+            self._load_archive(file_path)
+        elif any(file_path.endswith(ext) for ext in PIL_EXTENSIONS):
+            self._load_image(file_path, width, height)
+        else:
+            content, _ = self._load_text(file_path, None, height)
+            if (
+                config["plugins"]["bat"]["enabled"]
+                and not cancelled.is_set()
+                and content
+                not in (
+                    config["interface"]["preview_binary"],
+                    config["interface"]["preview_error"],
+                )
+            ) and self._highlight(file_path, height) is None:
+                self._load_bat(file_path, width, height, cancelled=cancelled)
 
     @work(thread=True)
-    def _perform_show_preview(self, file_path: str) -> None:
+    def _perform_show_preview(self, file_path: str, line: int | None = None) -> None:
         """
         Load file content in a worker and then render the preview.
         Args:
             file_path(str): The file path
+            line(int | None): The line to show and highlight, starting from 1
         """
         if self.any_in_queue():
             return
@@ -455,72 +853,16 @@ class PreviewContainer(Container):
             is_image = any(file_path.endswith(ext) for ext in PIL_EXTENSIONS)
             is_archive = any(file_path.endswith(ext) for ext in ARCHIVE_EXTENSIONS)
             content = None
+            content_window = None
+            image = None
             if is_archive:
-                try:
-                    with Archive(file_path, "r") as archive:
-                        if config["settings"]["preview_full"]:
-                            all_files = []
-                            for member in archive.infolist():
-                                filename = getattr(
-                                    member, "filename", getattr(member, "name", "")
-                                )
-                                is_dir_func = getattr(
-                                    member, "is_dir", getattr(member, "isdir", None)
-                                )
-                                is_dir = (
-                                    is_dir_func()
-                                    if is_dir_func
-                                    else filename.replace("\\", "/").endswith("/")
-                                )
-                                if not is_dir:
-                                    all_files.append(filename)
-                        else:
-                            top_level_files = set()
-                            top_level_dirs = set()
-                            for member in archive.infolist():
-                                filename = getattr(
-                                    member, "filename", getattr(member, "name", "")
-                                )
-                                is_dir_func = getattr(
-                                    member, "is_dir", getattr(member, "isdir", None)
-                                )
-                                is_dir = (
-                                    is_dir_func()
-                                    if is_dir_func
-                                    else filename.replace("\\", "/").endswith("/")
-                                )
-
-                                filename = filename.replace("\\", "/")
-                                if not filename:
-                                    continue
-
-                                parts = filename.strip("/").split("/")
-                                if len(parts) == 1 and not is_dir:
-                                    top_level_files.add(parts[0])
-                                elif parts and parts[0]:
-                                    top_level_dirs.add(parts[0])
-
-                            top_level_files -= top_level_dirs
-                            all_files = sorted([
-                                d + "/" for d in top_level_dirs
-                            ]) + sorted(list(top_level_files))
-                    content = all_files
-                except (
-                    zipfile.BadZipFile,
-                    tarfile.TarError,
-                    ValueError,
-                    FileNotFoundError,
-                ):
-                    content = [config["interface"]["preview_error"]]
-            elif not is_image:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                except UnicodeDecodeError:
-                    content = config["interface"]["preview_binary"]
-                except (FileNotFoundError, PermissionError, OSError, MemoryError):
-                    # not taking my chances with a memory error
-                    content = config["interface"]["preview_error"]
+                content = self._load_archive(file_path)
+            elif is_image:
+                image = self._load_image(file_path, self.size.width, self.size.height)
+            else:
+                content, content_window = self._load_text(
+                    file_path, line, self.size.height
+                )
 
             if self.any_in_queue():
                 return
@@ -532,6 +874,9 @@ class PreviewContainer(Container):
                 is_image=is_image,
                 is_archive=is_archive,
                 content=content,
+                line=line,
+                content_window=content_window,
+                image=image,
             )
 
         if self.any_in_queue():
@@ -546,23 +891,38 @@ class PreviewContainer(Container):
         is_image: bool = False,
         is_archive: bool = False,
         content: str | list[str] | None = None,
+        line: int | None = None,
+        content_window: tuple[int, int] | None = None,
+        image: Image.Image | str | None = None,
     ) -> None:
         """
         Update the preview UI. This runs on the main thread.
         """
         self._current_file_path = file_path
+        self._current_line = line
+        self._content_window = content_window
         if is_dir:
             self._is_image = False
             self._current_content = None
             await self._show_folder_preview(file_path)
         else:
             self._is_image = is_image
+            self._current_image = image
             self._is_archive = is_archive
             self._current_content = content
             await self._render_preview()
 
     async def on_resize(self, event: events.Resize) -> None:
         """Re-render the preview on resize if it's was rendered by batcat and height changed."""
+        if (
+            self._current_preview_type == "normal_text"
+            and self._content_window is not None
+            and event.size.height > self._content_window[1]
+        ):
+            # only the lines that fitted before were read, so read more
+            self.show_preview(self._current_file_path, self._current_line)
+            self._initial_height = event.size.height
+            return
         if (
             self._current_preview_type == "bat"
             and "clip" in self.classes
@@ -573,9 +933,11 @@ class PreviewContainer(Container):
 
     async def on_key(self, event: events.Key) -> None:
         """Check for vim keybinds."""
-        if self.border_title == titles.bat or self.border_title == titles.archive:
+        if self._current_preview_type in ("bat", "archive"):
             widget = (
-                self if self.border_title == titles.bat else self.query_one(FileList)
+                self
+                if self._current_preview_type == "bat"
+                else self.query_one(FileList)
             )
             match event.key:
                 case key if key in config["keybinds"]["up"]:
@@ -1,7 +1,5 @@
 from typing import ClassVar
 
-from rich.segment import Segment
-from rich.style import Style
 from textual import events, work
 from textual.binding import Binding, BindingType
 from textual.content import Content
@@ -9,9 +7,8 @@ from textual.strip import Strip
 from textual.widgets import Button, SelectionList
 from textual.widgets.option_list import OptionDoesNotExist
 
-from rovr.classes import ClipboardSelection
+from rovr.classes import ClipboardSelection, SelectionStripCache
 from rovr.functions import icons as icon_utils
-from rovr.functions import path as path_utils
 from rovr.variables.constants import config
 
 
@@ -52,6 +49,7 @@ class Clipboard(SelectionList, inherit_bindings=False):
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         self.clipboard_contents = []
+        self._strip_cache = SelectionStripCache()
 
     def on_mount(self) -> None:
         self.mybutton: Button = self.app.query_one("#paste")
@@ -65,8 +63,8 @@ class Clipboard(SelectionList, inherit_bindings=False):
                     prompt=Content(
                         f"{icon_utils.get_icon('general', 'copy')[0]} {item}"
                     ),
-                    value=path_utils.compress(f"{item}-copy"),
-                    id=path_utils.compress(item),
+                    value=f"{item}-copy",
+                    id=item,
                 )
             )
         self.refresh(layout=True)
@@ -84,8 +82,8 @@ class Clipboard(SelectionList, inherit_bindings=False):
                         prompt=Content(
                             f"{icon_utils.get_icon('general', 'cut')[0]} {item}"
                         ),
-                        value=path_utils.compress(f"{item}-cut"),
-                        id=path_utils.compress(item),
+                        value=f"{item}-cut",
+                        id=item,
                     )
                 )
         self.refresh(layout=True)
@@ -120,43 +118,51 @@ class Clipboard(SelectionList, inherit_bindings=False):
         Returns:
             A [`Strip`][textual.strip.Strip] that is the line to render.
         """
-        line = super(SelectionList, self).render_line(y)
-
         _, scroll_y = self.scroll_offset
         selection_index = scroll_y + y
         try:
             selection = self.get_option_at_index(selection_index)
         except OptionDoesNotExist:
-            return line
+            return super(SelectionList, self).render_line(y)
+
+        selected = selection.value in self._selected
+        highlighted = self.highlighted == selection_index
+        cache_key = (
+            selection_index,
+            selected,
+            highlighted,
+            self._mouse_hovering_over == selection_index,
+            self.has_focus,
+            self.scrollable_content_region.width,
+            self.app.theme,
+        )
+        strip = self._strip_cache.get(cache_key)
+        if strip is not None:
+            return strip
 
         component_style = "selection-list--button"
-        if selection.value in self._selected:
+        if selected:
             component_style += "-selected"
-        if self.highlighted == selection_index:
+        if highlighted:
             component_style += "-highlighted"
 
-        underlying_style = next(iter(line)).style or self.rich_style
-        assert underlying_style is not None
-
-        button_style = self.get_component_rich_style(component_style)
-
-        side_style = Style.from_color(button_style.bgcolor, underlying_style.bgcolor)
+        return self._strip_cache.add_button(
+            cache_key,
+            super(SelectionList, self).render_line(y),
+            selection_index,
+            selected,
+            component_style,
+            self.get_component_rich_style,
+            self.rich_style,
+        )
 
-        side_style += Style(meta={"option": selection_index})
-        button_style += Style(meta={"option": selection_index})
+    def _clear_caches(self) -> None:
+        super()._clear_caches()
+        self._strip_cache.clear()
 
-        return Strip([
-            Segment(icon_utils.get_toggle_button_icon("left"), style=side_style),
-            Segment(
-                icon_utils.get_toggle_button_icon("inner_filled")
-                if selection.value in self._selected
-                else icon_utils.get_toggle_button_icon("inner"),
-                style=button_style,
-            ),
-            Segment(icon_utils.get_toggle_button_icon("right"), style=side_style),
-            Segment(" ", style=underlying_style),
-            *line,
-        ])
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._strip_cache.clear(styles=True)
 
     # Why isnt this already a thing
     def insert_selection_at_beginning(self, content: ClipboardSelection) -> None:
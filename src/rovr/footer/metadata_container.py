@@ -2,7 +2,8 @@ import stat
 import time
 from contextlib import suppress
 from datetime import datetime
-from os import DirEntry, lstat, path, walk
+from os import lstat, path, stat_result, walk
+from os import stat as get_stat
 
 from textual import events, on, work
 from textual.containers import VerticalGroup, VerticalScroll
@@ -10,6 +11,8 @@ from textual.css.query import NoMatches
 from textual.widgets import Static
 from textual.worker import WorkerState
 
+from rovr.classes import ProbeTimeout
+from rovr.classes.probe_pool import probe_pool
 from rovr.functions import utils
 from rovr.variables.constants import config
 from rovr.variables.maps import SPINNER
@@ -22,20 +25,16 @@ class MetadataContainer(VerticalScroll):
         self._size_worker = None
         self._update_task = None
         self._queued_task = None
-        self._queued_task_args: None | DirEntry = None
+        self._queued_task_args: None | str = None
 
-    def info_of_dir_entry(self, dir_entry: DirEntry, type_string: str) -> str:
-        """Get the permission line from a given DirEntry object
+    def info_of_stat(self, file_stat: stat_result, type_string: str) -> str:
+        """Get the permission line from the lstat of an item
         Args:
-            dir_entry (DirEntry): The nt.DirEntry class
+            file_stat (stat_result): The result of `os.lstat` on the item
             type_string (str): The type of file. It should already be handled.
         Returns:
             str: A permission string.
         """
-        try:
-            file_stat = lstat(dir_entry.path)
-        except (OSError, FileNotFoundError):
-            return "?????????"
         mode = file_stat.st_mode
 
         permission_string = ""
@@ -71,11 +70,11 @@ class MetadataContainer(VerticalScroll):
             return True
         return False
 
-    def update_metadata(self, dir_entry: DirEntry) -> None:
+    def update_metadata(self, file_path: str) -> None:
         """
         Debounce the update, because some people can be speed travellers
         Args:
-            dir_entry (DirEntry): The nt.DirEntry object
+            file_path (str): The path to the item
         """
         if any(
             worker.is_running
@@ -84,20 +83,32 @@ class MetadataContainer(VerticalScroll):
             for worker in self.app.workers
         ):
             self._queued_task = self._perform_update
-            self._queued_task_args = dir_entry
+            self._queued_task_args = file_path
         else:
-            self._perform_update(dir_entry)
+            self._perform_update(file_path)
 
     @work(thread=True)
-    def _perform_update(self, dir_entry: DirEntry) -> None:
+    def _perform_update(self, file_path: str) -> None:
         """
         After debouncing the update
         Args:
-            dir_entry (DirEntry): The nt.DirEntry object
+            file_path (str): The path to the item
         """
         if self.any_in_queue():
             return
-        if not path.exists(dir_entry.path):
+        try:
+            link_stat = probe_pool.run(lstat, file_path)
+            # got the type, now we follow
+            file_stat = probe_pool.run(get_stat, file_path)
+        except ProbeTimeout:
+            self.app.call_from_thread(self.remove_children)
+            self.app.call_from_thread(
+                self.mount, Static("Item did not respond in time.")
+            )
+            if not self.any_in_queue():
+                self._queued_task = None
+            return
+        except OSError:
             self.app.call_from_thread(self.remove_children)
             self.app.call_from_thread(
                 self.mount, Static("Item not found or inaccessible.")
@@ -105,17 +116,18 @@ class MetadataContainer(VerticalScroll):
             return
 
         type_str = "Unknown"
-        if dir_entry.is_junction():
+        # the same check as path.isjunction, without looking at the item again.
+        # st_reparse_tag, and the constant, only exist on windows
+        reparse_tag = getattr(link_stat, "st_reparse_tag", None)
+        if reparse_tag is not None and reparse_tag == stat.IO_REPARSE_TAG_MOUNT_POINT:
             type_str = "Junction"
-        elif dir_entry.is_symlink():
+        elif stat.S_ISLNK(link_stat.st_mode):
             type_str = "Symlink"
-        elif dir_entry.is_dir():
+        elif stat.S_ISDIR(link_stat.st_mode):
             type_str = "Directory"
-        elif dir_entry.is_file():
+        elif stat.S_ISREG(link_stat.st_mode):
             type_str = "File"
-        file_info = self.info_of_dir_entry(dir_entry, type_str)
-        # got the type, now we follow
-        file_stat = dir_entry.stat()
+        file_info = self.info_of_stat(link_stat, type_str)
         values_list = []
         for field in config["metadata"]["fields"]:
             match field:
@@ -188,9 +200,9 @@ class MetadataContainer(VerticalScroll):
                         keys_list.append(Static("Created"))
             keys = VerticalGroup(*keys_list, id="metadata-keys")
             self.app.call_from_thread(self.mount, keys, values)
-        self.current_path = dir_entry.path
+        self.current_path = file_path
         if type_str == "Directory" and self.has_focus:
-            self._size_worker = self.calculate_folder_size(dir_entry.path)
+            self._size_worker = self.calculate_folder_size(file_path)
         if self.any_in_queue():
             return
         else:
@@ -140,15 +140,12 @@ class ProcessContainer(VerticalScroll):
         return new_bar
 
     @work(thread=True)
-    def delete_files(
-        self, files: list[str], compressed: bool = True, ignore_trash: bool = False
-    ) -> None:
+    def delete_files(self, files: list[str], ignore_trash: bool = False) -> None:
         """
         Remove files from the filesystem.
 
         Args:
             files (list[str]): List of file paths to remove.
-            compressed (bool): Whether the file paths are compressed. Defaults to True.
             ignore_trash (bool): If True, files will be permanently deleted instead of sent to the recycle bin. Defaults to False.
         """
         # Create progress/process bar (why have I set names as such...)
@@ -167,8 +164,6 @@ class ProcessContainer(VerticalScroll):
         files_to_delete = []
         folders_to_delete = []
         for file in files:
-            if compressed:
-                file = path_utils.decompress(file)
             if path.isdir(file):
                 folders_to_delete.append(file)
             files_to_add, folders_to_add = path_utils.get_recursive_files(
@@ -898,7 +893,7 @@ class ProcessContainer(VerticalScroll):
             with suppress(OptionDoesNotExist):
                 self.app.call_from_thread(
                     self.app.query_one("Clipboard").remove_option,
-                    path_utils.compress(item),
+                    item,
                 )
         self.app.call_from_thread(
             bar.update_icon,
@@ -1,19 +1,15 @@
 from functools import lru_cache
-from os import path
 
+from rovr.classes.icon_resolver import icon_resolver
 from rovr.variables.constants import config
 from rovr.variables.maps import (
     ASCII_ICONS,
     ASCII_TOGGLE_BUTTON_ICONS,
-    FILE_MAP,
-    FILES_MAP,
-    FOLDER_MAP,
     ICONS,
     TOGGLE_BUTTON_ICONS,
 )
 
 
-@lru_cache(maxsize=128)
 def get_icon_for_file(location: str) -> list:
     """
     Get the icon and color for a file based on its name or extension.
@@ -24,46 +20,9 @@ def get_icon_for_file(location: str) -> list:
     Returns:
         list: The icon and color for the file.
     """
-    if not config["interface"]["nerd_font"]:
-        return ASCII_ICONS["file"]["default"]
-    file_name = path.basename(location).lower()
-
-    # 0. Check for custom icons if configured
-    if "icons" in config and "files" in config["icons"]:
-        for custom_icon in config["icons"]["files"]:
-            pattern = custom_icon["pattern"].lower()
-            match_type = custom_icon.get("match_type", "exact")
-
-            is_match = False
-            if (
-                match_type == "exact"
-                and file_name == pattern
-                or match_type == "endswith"
-                and file_name.endswith(pattern)
-            ):
-                is_match = True
-
-            if is_match:
-                return [custom_icon["icon"], custom_icon["color"]]
-
-    # 1. Check for full filename match
-    if file_name in FILES_MAP:
-        icon_key = FILES_MAP[file_name]
-        return ICONS["file"].get(icon_key, ICONS["file"]["default"])
-
-    # 2. Check for extension match
-    if "." in file_name:
-        # This is for hidden files like `.gitignore`
-        extension = "." + file_name.split(".")[-1]
-        if extension in FILE_MAP:
-            icon_key = FILE_MAP[extension]
-            return ICONS["file"].get(icon_key, ICONS["file"]["default"])
-
-    # 3. Default icon
-    return ICONS["file"]["default"]
+    return icon_resolver.for_path(location, folder=False)
 
 
-@lru_cache(maxsize=128)
 def get_icon_for_folder(location: str) -> list:
     """Get the icon and color for a folder based on its name.
 
@@ -73,35 +32,7 @@ def get_icon_for_folder(location: str) -> list:
     Returns:
         list: The icon and color for the folder.
     """
-    folder_name = path.basename(location).lower()
-
-    if not config["interface"]["nerd_font"]:
-        return ASCII_ICONS["folder"].get(folder_name, ASCII_ICONS["folder"]["default"])
-
-    # 0. Check for custom icons if configured
-    if "icons" in config and "folders" in config["icons"]:
-        for custom_icon in config["icons"]["folders"]:
-            pattern = custom_icon["pattern"].lower()
-            match_type = custom_icon.get("match_type", "exact")
-
-            is_match = False
-            if (
-                match_type == "exact"
-                and folder_name == pattern
-                or match_type == "endswith"
-                and folder_name.endswith(pattern)
-            ):
-                is_match = True
-
-            if is_match:
-                return [custom_icon["icon"], custom_icon["color"]]
-
-    # Check for special folder types
-    if folder_name in FOLDER_MAP:
-        icon_key = FOLDER_MAP[folder_name]
-        return ICONS["folder"].get(icon_key, ICONS["folder"]["default"])
-    else:
-        return ICONS["folder"]["default"]
+    return icon_resolver.for_path(location, folder=True)
 
 
 @lru_cache(maxsize=128)
@@ -5,12 +5,8 @@ import subprocess
 from os import path
 
 import psutil
-from lzstring import LZString
 from rich.console import Console
 
-from rovr.functions.icons import get_icon_for_file, get_icon_for_folder
-
-lzstring = LZString()
 pprint = Console().print
 
 
@@ -32,20 +28,6 @@ def normalise(location: str | bytes) -> str | bytes:
     return path.normpath(location).replace("\\", "/").replace("//", "/")
 
 
-# Okay so the reason why I have wrapper functions is
-# I was messing around with different LZString options
-# and Encoded URI Component seems to best option. I've just
-# left it here, in case we can switch to something like
-# base 64 because Encoded URI Component can get quite long
-# very fast, which isn't really the purpose of LZString
-def compress(text: str) -> str:
-    return lzstring.compressToEncodedURIComponent(text)
-
-
-def decompress(text: str) -> str:
-    return lzstring.decompressFromEncodedURIComponent(text)
-
-
 def open_file(filepath: str) -> None:
     """Cross-platform function to open files with their default application.
 
@@ -66,42 +48,6 @@ def open_file(filepath: str) -> None:
         print(f"Error opening file: {e}")
 
 
-def get_cwd_object(cwd: str | bytes) -> tuple[list[dict], list[dict]]:
-    """
-    Get the objects (files and folders) in a provided directory
-    Args:
-        cwd(str): The working directory to check
-
-    Returns:
-        folders(list[dict]): A list of dictionaries, containing "name" as the item's name and "icon" as the respective icon
-        files(list[dict]): A list of dictionaries, containing "name" as the item's name and "icon" as the respective icon
-    """
-    folders, files = [], []
-    try:
-        listed_dir = os.scandir(cwd)
-    except (PermissionError, FileNotFoundError, OSError):
-        print(f"PermissionError: Unable to access {cwd}")
-        return [PermissionError], [PermissionError]
-    for item in listed_dir:
-        if item.is_dir():
-            folders.append({
-                "name": f"{item.name}",
-                "icon": get_icon_for_folder(item.name),
-                "dir_entry": item,
-            })
-        else:
-            files.append({
-                "name": item.name,
-                "icon": get_icon_for_file(item.name),
-                "dir_entry": item,
-            })
-    # Sort folders and files properly
-    folders.sort(key=lambda x: x["name"].lower())
-    files.sort(key=lambda x: x["name"].lower())
-    print(f"Found {len(folders)} folders and {len(files)} files in {cwd}")
-    return folders, files
-
-
 def file_is_type(file_path: str) -> str:
     """Get a given path's type
     Args:
@@ -1,3 +1,14 @@
+import codecs
+import ctypes
+import ctypes.util
+import mmap
+import os
+import platform
+import sys
+from contextlib import suppress
+from functools import lru_cache
+from threading import get_native_id
+
 from humanize import naturalsize
 from lzstring import LZString
 from rich.console import Console
@@ -10,6 +21,36 @@ from rovr.variables.maps import (
 lzstring = LZString()
 pprint = Console().print
 
+# how much of the start of a file is sniffed to tell what it is
+SNIFF_SIZE = 8192
+# how many files `sniff_file` remembers
+SNIFF_CACHE_SIZE = 4096
+# byte order marks, longest first, as the utf-32-le one starts with the utf-16-le one
+BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+# the bytes that show up in text, like in `file`: every printable byte,
+# and the control characters that text files use
+TEXT_BYTES = bytes({7, 8, 9, 10, 11, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+# files at least this big are mapped into memory by `read_lines`, instead of read
+MMAP_THRESHOLD = 1024 * 1024
+# how much is checked at a time when skipping lines, which is a multiple of
+# every newline's length, so a whole character is never split between chunks
+SKIP_CHUNK_SIZE = 1024 * 1024
+# how far to look for the end of a line, before giving up on the lines after it
+MAX_LINE_SCAN = 1024 * 1024
+
+# from <linux/ioprio.h>
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+# ioprio_set has no libc wrapper, so it is called by number
+IOPRIO_SET_SYSCALL = {"x86_64": 251, "aarch64": 30, "i686": 289, "armv7l": 314}
+
 
 def deep_merge(d: dict, u: dict) -> dict:
     """Mini lodash merge
@@ -103,3 +144,178 @@ def natural_size(integer: int, suffix: str, filesize_decimals: int) -> str:
             )
         case _:
             return naturalsize(value=integer, format=f"%.{filesize_decimals}f")
+
+
+def sniff_encoding(sample: bytes) -> str | None:
+    """Guess how a file is encoded from the start of it.
+
+    A byte order mark decides it straight away. Otherwise, null bytes in
+    every other byte mean utf-16, and any other null byte means binary.
+    Valid utf-8 is utf-8, and anything else that only has bytes that show
+    up in text is taken to be latin-1.
+
+    Args:
+        sample (bytes): The first `SNIFF_SIZE` bytes of the file.
+
+    Returns:
+        str | None: The codec to decode the file with, or None if it looks binary.
+    """
+    for byte_order_mark, encoding in BYTE_ORDER_MARKS:
+        if sample.startswith(byte_order_mark):
+            return encoding
+    if b"\0" in sample:
+        # ascii text in utf-16 has a null byte for every character
+        even, odd = sample[0::2], sample[1::2]
+        if b"\0" not in even and odd.count(0) > len(odd) * 0.4:
+            return "utf-16-le"
+        if b"\0" not in odd and even.count(0) > len(even) * 0.4:
+            return "utf-16-be"
+        return None
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # the sample can end halfway through a character
+        if not (
+            exc.reason == "unexpected end of data" and exc.start >= len(sample) - 3
+        ):
+            return None if sample.translate(None, TEXT_BYTES) else "latin-1"
+    return "utf-8"
+
+
+def sniff_file(file_path: str) -> str | None:
+    """Guess how a file is encoded, see `sniff_encoding`.
+
+    Only the first `SNIFF_SIZE` bytes are read, and the result is kept
+    for as long as the file's size and modification time stay the same,
+    so the preview and content search only sniff a file once between them.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str | None: The codec to decode the file with, or None if it looks binary.
+    """
+    stat = os.stat(file_path)
+    return _sniff_file(file_path, stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=SNIFF_CACHE_SIZE)
+def _sniff_file(file_path: str, size: int, mtime_ns: int) -> str | None:
+    # the size and modification time are only there to be part of the key
+    with open(file_path, "rb") as file:
+        return sniff_encoding(file.read(SNIFF_SIZE))
+
+
+def _find_newline(
+    data: bytes | mmap.mmap, newline: bytes, start: int, end: int | None = None
+) -> int:
+    # mmap.find doesn't take None as the end, unlike bytes.find
+    if end is None:
+        end = len(data)
+    position = data.find(newline, start, end)
+    # in utf-16 and utf-32, the bytes of a newline can also be split over
+    # two characters, so only count the ones that are a whole character
+    while position != -1 and position % len(newline):
+        position = data.find(newline, position + 1, end)
+    return position
+
+
+def _count_newlines(chunk: bytes, newline: bytes) -> int:
+    if len(newline) == 1:
+        return chunk.count(newline)
+    # only the ones that are a whole character, like `_find_newline`
+    count = 0
+    position = _find_newline(chunk, newline, 0)
+    while position != -1:
+        count += 1
+        position = _find_newline(chunk, newline, position + len(newline))
+    return count
+
+
+def read_lines(
+    file_path: str, start: int, count: int, max_columns: int, encoding: str = "utf-8"
+) -> tuple[list[str], bool]:
+    """Read a few lines of a text file, without reading the rest of it.
+
+    Big files are mapped into memory, so only the parts that are looked at
+    are read from disk, and at most `max_columns` characters of each line
+    are decoded. Lines longer than `MAX_LINE_SCAN` bytes end the read, so
+    even a huge file with no newlines is quick to read.
+
+    Args:
+        file_path (str): The path to the file.
+        start (int): The index of the first line to read.
+        count (int): How many lines to read.
+        max_columns (int): The most characters to keep from each line.
+        encoding (str): The codec to decode the file with, from `sniff_file`.
+
+    Returns:
+        tuple[list[str], bool]: The lines, and whether there are more lines after them.
+    """
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return [], False
+        if size < MMAP_THRESHOLD:
+            data = file.read()
+        else:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        size = len(data)
+        newline = "\n".encode(encoding)
+        position = 0
+        # skip a chunk at a time while the line to start from isn't in it
+        while start > 0 and position < size:
+            chunk = data[position : position + SKIP_CHUNK_SIZE]
+            newlines = _count_newlines(chunk, newline)
+            if newlines < start:
+                start -= newlines
+                position += len(chunk)
+                continue
+            for _ in range(start):
+                end = _find_newline(data, newline, position)
+                position = size if end == -1 else end + len(newline)
+            start = 0
+        lines = []
+        while len(lines) < count and position < size:
+            end = _find_newline(data, newline, position, position + MAX_LINE_SCAN)
+            huge_line = end == -1 and position + MAX_LINE_SCAN < size
+            if end == -1:
+                end = size
+            # no character takes more than 4 bytes
+            text = data[position : min(end, position + max_columns * 4)].decode(
+                encoding, errors="replace"
+            )
+            if position == 0:
+                text = text.removeprefix("\ufeff")
+            lines.append(text.rstrip("\r")[:max_columns])
+            if huge_line:
+                # show the start of it, and nothing after it
+                return lines, True
+            position = end + len(newline)
+        return lines, position < size
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def lower_thread_priority() -> None:
+    """Make the calling thread give way to everything else for CPU and disk time."""
+    if not sys.platform.startswith("linux"):
+        return
+    # on linux, both of these can be set for a single thread
+    with suppress(OSError):
+        os.setpriority(os.PRIO_PROCESS, get_native_id(), 19)
+    number = IOPRIO_SET_SYSCALL.get(platform.machine())
+    if number is None:
+        return
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return
+    libc.syscall(
+        number,
+        IOPRIO_WHO_PROCESS,
+        get_native_id(),
+        IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT,
+    )
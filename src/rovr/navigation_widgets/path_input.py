@@ -6,8 +6,16 @@ from textual.validation import Function
 from textual.widgets import Input
 from textual_autocomplete import DropdownItem, PathAutoComplete, TargetState
 
+from rovr.classes import ProbeTimeout
+from rovr.classes.probe_pool import probe_pool
 from rovr.functions.icons import get_icon
 
+# the most folders suggested from the path index
+INDEXED_SUGGESTIONS = 20
+# how long to wait for a path that is typed to say whether it exists, in
+# seconds, as it is checked on every key press
+EXISTS_TIMEOUT = 0.1
+
 
 class PathDropdownItem(DropdownItem):
     def __init__(self, completion: str, path: Path) -> None:
@@ -43,6 +51,21 @@ class PathAutoCompleteInput(PathAutoComplete):
             list[DropdownItem]: A list of DropdownItems to use as AutoComplete"""
         current_input = target_state.text[: target_state.cursor_position]
 
+        # a bare name can also complete to any indexed folder, like `locate`
+        indexed = []
+        path_index = self.app.path_index
+        if (
+            path_index is not None
+            and "/" not in current_input
+            and len(current_input.strip()) >= 3
+        ):
+            indexed = [
+                DropdownItem(folder + "/", prefix=self.folder_prefix)
+                for folder, _ in path_index.search(
+                    current_input, INDEXED_SUGGESTIONS, folders_only=True
+                )
+            ]
+
         if "/" in current_input:
             last_slash_index = current_input.rindex("/")
             path_segment = current_input[:last_slash_index] or "/"
@@ -61,7 +84,7 @@ class PathAutoCompleteInput(PathAutoComplete):
                 entries = list(scandir(directory))
                 self._directory_cache[cache_key] = entries
             except OSError:
-                return []
+                return indexed
 
         results: list[PathDropdownItem] = []
         has_directories = False
@@ -75,7 +98,7 @@ class PathAutoCompleteInput(PathAutoComplete):
                 completion += "/"
                 results.append(PathDropdownItem(completion, path=Path(entry.path)))
 
-        if not has_directories:
+        if not has_directories and not indexed:
             self._empty_directory = True
             return [DropdownItem("", prefix="No folders found")]
         else:
@@ -89,7 +112,7 @@ class PathAutoCompleteInput(PathAutoComplete):
                 prefix=folder_prefix,
             )
             for item in results
-        ]
+        ] + indexed
 
     def _align_to_target(self) -> None:
         """Empty function that was supposed to align the completion box to the cursor."""
@@ -104,19 +127,34 @@ class PathAutoCompleteInput(PathAutoComplete):
         self._target.remove_class("hide_border_bottom", update=True)
 
 
+def _exists(location: str) -> bool:
+    """Check whether a path exists, for validating what is typed.
+
+    Args:
+        location (str): The path.
+
+    Returns:
+        bool: Whether it exists, which is assumed if it didn't respond quickly, like on a hung mount.
+    """
+    try:
+        return probe_pool.run(path.exists, location, timeout=EXISTS_TIMEOUT)
+    except ProbeTimeout:
+        return True
+
+
 class PathInput(Input):
     ALLOW_MAXIMIZE = False
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             id="path_switcher",
-            validators=[Function(lambda x: path.exists(x), "Path does not exist")],
+            validators=[Function(_exists, "Path does not exist")],
             validate_on=["changed"],
         )
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """Use a custom path entered as the current working directory"""
-        if path.exists(event.value) and event.value != "":
+        if event.value != "" and _exists(event.value):
             self.app.cd(event.value)
         else:
             self.notify("Path provided is not valid.", severity="error")
@@ -5,6 +5,9 @@ from .delete_files import DeleteFiles
 from .dismissable import Dismissable
 from .give_permission import GiveMePermission
 from .input import ModalInput
+from .jump_to_path import JumpToPath
+from .recursive_search import RecursiveSearch
+from .search_in_files import SearchInFiles
 from .way_too_small import TerminalTooSmall
 from .yes_or_no import YesOrNo
 from .zd_to_directory import ZDToDirectory
@@ -20,6 +23,9 @@ __all__ = [
     "CommonFileNameDoWhat",
     "DeleteFiles",
     "ModalInput",
+    "JumpToPath",
+    "RecursiveSearch",
+    "SearchInFiles",
     "YesOrNo",
     "ZDToDirectory",
     "GiveMePermission",
@@ -0,0 +1,57 @@
+import asyncio
+
+from textual import work
+from textual.widgets import OptionList
+from textual.widgets.option_list import Option
+
+from rovr.classes import PathIndex
+from rovr.variables.constants import config
+
+from .recursive_search import RecursiveSearch
+
+
+class JumpToPath(RecursiveSearch):
+    """Screen with a dialog to find any indexed path, locate-style."""
+
+    INPUT_TITLE = "Jump to a path in"
+    PLACEHOLDER = "Enter parts of a path, separated by spaces"
+
+    def __init__(self, path_index: PathIndex, **kwargs) -> None:
+        """
+        Initialise the screen.
+
+        Args:
+            path_index (PathIndex): The index to search in.
+        """
+        super().__init__(", ".join(path_index.roots), **kwargs)
+        self.path_index = path_index
+
+    @work(exclusive=True)
+    async def update_results(self, query: str) -> None:
+        """Search the index for a query.
+
+        Args:
+            query (str): What to search for.
+        """
+        search_options = self.query_one("#recursive_search_options", OptionList)
+        if not query.strip():
+            search_options.clear_options()
+            search_options.add_option(Option("  No input provided", disabled=True))
+            search_options.border_subtitle = ""
+            return
+        found = await asyncio.to_thread(
+            self.path_index.search,
+            query,
+            config["settings"]["search_result_limit"],
+        )
+        search_options.clear_options()
+        if found:
+            search_options.add_options([
+                self.create_option(match, 0) for match in found
+            ])
+            search_options.highlighted = 0
+        else:
+            search_options.add_option(Option("  --No matches found--", disabled=True))
+        search_options.border_subtitle = f"{len(found)} found" + (
+            "" if self.path_index.ready.is_set() else ", still indexing"
+        )
@@ -0,0 +1,186 @@
+import asyncio
+
+from textual import events, work
+from textual.app import ComposeResult
+from textual.containers import VerticalGroup
+from textual.screen import ModalScreen
+from textual.widgets import Input, OptionList
+from textual.widgets.option_list import Option
+
+from rovr.classes import SubtreeSearch
+from rovr.classes.icon_resolver import icon_resolver
+from rovr.classes.textual_options import icon_prompt
+from rovr.variables.constants import config
+
+
+class RecursiveSearch(ModalScreen):
+    """Screen with a dialog to find items anywhere under a directory."""
+
+    INPUT_TITLE = "Search in"
+    PLACEHOLDER = "Enter part of a name, or a glob like *.log"
+
+    def __init__(self, root: str, query: str = "", **kwargs) -> None:
+        """
+        Initialise the screen.
+
+        Args:
+            root (str): The normalised path of the directory to search in.
+            query (str): What to search for when the screen opens.
+        """
+        super().__init__(**kwargs)
+        self.root = root
+        self.initial_query = query
+        self.subtree_search: SubtreeSearch | None = None
+
+    def compose(self) -> ComposeResult:
+        with VerticalGroup(id="recursive_search_group"):
+            yield Input(
+                self.initial_query,
+                id="recursive_search_input",
+                placeholder=self.PLACEHOLDER,
+            )
+            yield OptionList(
+                Option("  No input provided", disabled=True),
+                id="recursive_search_options",
+            )
+
+    def on_mount(self) -> None:
+        search_input = self.query_one("#recursive_search_input")
+        search_input.border_title = f"{self.INPUT_TITLE} {self.root}"
+        search_input.focus()
+        search_options = self.query_one("#recursive_search_options")
+        search_options.border_title = "Matches"
+        search_options.can_focus = False
+        self.update_results(self.initial_query)
+
+    def on_unmount(self) -> None:
+        if self.subtree_search is not None:
+            self.subtree_search.cancel()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self.update_results(event.value)
+
+    @work(exclusive=True)
+    async def update_results(self, query: str) -> None:
+        """Search for a query, showing the matches while they are found.
+
+        Args:
+            query (str): What to search for.
+
+        Raises:
+            CancelledError: If a newer query replaced this one, which also stops the search.
+        """
+        # stop the previous search straight away, instead of when this
+        # worker gets to cancel it
+        if self.subtree_search is not None:
+            self.subtree_search.cancel()
+            self.subtree_search = None
+        search_options = self.query_one("#recursive_search_options", OptionList)
+        search_options.clear_options()
+        search_options.border_subtitle = ""
+        if not query.strip():
+            search_options.add_option(Option("  No input provided", disabled=True))
+            return
+        search = self.subtree_search = self.create_search(query.strip())
+        search.start()
+        prefix_length = len(self.root.rstrip("/")) + 1
+        count = 0
+        try:
+            while True:
+                finished = search.finished.is_set()
+                found = search.take()
+                if found:
+                    search_options.add_options([
+                        self.create_option(match, prefix_length) for match in found
+                    ])
+                    if search_options.highlighted is None:
+                        search_options.highlighted = 0
+                    count += len(found)
+                search_options.border_subtitle = (
+                    f"{count}{'+' if search.truncated else ''} found in {search.scanned} folders"
+                    + ("" if finished else "...")
+                )
+                if finished:
+                    break
+                # batch whatever is found in the meantime into one update
+                await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            search.cancel()
+            raise
+        if count == 0:
+            search_options.add_option(Option("  --No matches found--", disabled=True))
+
+    def create_search(self, query: str) -> SubtreeSearch:
+        """Create the search for a query.
+
+        Args:
+            query (str): What to search for.
+
+        Returns:
+            SubtreeSearch: The search, which isn't started yet.
+        """
+        return SubtreeSearch(
+            self.root,
+            query,
+            set(config["settings"]["recursive_search_exclude"]),
+            config["settings"]["search_result_limit"],
+        )
+
+    def create_option(self, match: tuple[str, bool], prefix_length: int) -> Option:
+        """Create the option for a match.
+
+        Args:
+            match (tuple[str, bool]): The path of the match, and whether it is a folder.
+            prefix_length (int): The length of the root, to cut off the path.
+
+        Returns:
+            Option: The option, with the path as its id.
+        """
+        item_path, is_dir = match
+        return Option(
+            icon_prompt(
+                icon_resolver.for_path(item_path, folder=is_dir),
+                item_path[prefix_length:],
+            ),
+            id=item_path,
+        )
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        search_options = self.query_one("#recursive_search_options", OptionList)
+        if search_options.highlighted is None:
+            search_options.highlighted = 0
+        search_options.action_select()
+
+    def get_result(self, option: Option) -> str:
+        """Get what to dismiss with when an option is chosen.
+
+        Args:
+            option (Option): The chosen option.
+
+        Returns:
+            str: The path of the match.
+        """
+        return option.id
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        """Handle option selection."""
+        self.dismiss(self.get_result(event.option))
+
+    def on_key(self, event: events.Key) -> None:
+        """Handle key presses."""
+        match event.key:
+            case "escape":
+                event.stop()
+                self.dismiss(None)
+            case "down":
+                event.stop()
+                self.query_one("#recursive_search_options").action_cursor_down()
+            case "up":
+                event.stop()
+                self.query_one("#recursive_search_options").action_cursor_up()
+            case "pagedown":
+                event.stop()
+                self.query_one("#recursive_search_options").action_page_down()
+            case "pageup":
+                event.stop()
+                self.query_one("#recursive_search_options").action_page_up()
@@ -0,0 +1,62 @@
+from textual.widgets.option_list import Option
+
+from rovr.classes import ContentSearch
+from rovr.classes.icon_resolver import icon_resolver
+from rovr.classes.textual_options import icon_prompt
+from rovr.variables.constants import config
+
+from .recursive_search import RecursiveSearch
+
+
+class SearchInFiles(RecursiveSearch):
+    """Screen with a dialog to find text in the files anywhere under a directory."""
+
+    INPUT_TITLE = "Search in files in"
+    PLACEHOLDER = "Enter the text to look for in files"
+
+    def create_search(self, query: str) -> ContentSearch:
+        """Create the search for a query.
+
+        Args:
+            query (str): The text to look for.
+
+        Returns:
+            ContentSearch: The search, which isn't started yet.
+        """
+        return ContentSearch(
+            self.root,
+            query,
+            set(config["settings"]["recursive_search_exclude"]),
+            config["settings"]["search_result_limit"],
+        )
+
+    def create_option(self, match: tuple[str, int, str], prefix_length: int) -> Option:
+        """Create the option for a matching line.
+
+        Args:
+            match (tuple[str, int, str]): The path of the file, the line number, and the line.
+            prefix_length (int): The length of the root, to cut off the path.
+
+        Returns:
+            Option: The option, with the path and line number as its id.
+        """
+        file_path, line, snippet = match
+        return Option(
+            icon_prompt(
+                icon_resolver.for_path(file_path, folder=False),
+                f"{file_path[prefix_length:]}:{line}  {snippet}",
+            ),
+            id=f"{file_path}:{line}",
+        )
+
+    def get_result(self, option: Option) -> tuple[str, int]:
+        """Get what to dismiss with when an option is chosen.
+
+        Args:
+            option (Option): The chosen option.
+
+        Returns:
+            tuple[str, int]: The path of the file, and the line number.
+        """
+        file_path, line = option.id.rsplit(":", 1)
+        return file_path, int(line)
@@ -1,5 +1,3 @@
-from subprocess import run
-
 from textual import events, work
 from textual.app import ComposeResult
 from textual.containers import VerticalGroup
@@ -8,16 +6,22 @@ from textual.screen import ModalScreen
 from textual.widgets import Input, OptionList
 from textual.widgets.option_list import Option
 
-from rovr.functions import path as path_utils
+from rovr.classes import FrecencyStore, ZoxideCache
+from rovr.variables.constants import config
 
 
 class ZDToDirectory(ModalScreen):
-    """Screen with a dialog to z to a directory, using zoxide"""
+    """Screen with a dialog to z to a directory, ranked by frecency like zoxide"""
+
+    def __init__(self, source: FrecencyStore | ZoxideCache, **kwargs) -> None:
+        """
+        Initialise the screen.
 
-    def __init__(self, **kwargs) -> None:
+        Args:
+            source (FrecencyStore | ZoxideCache): The visited folders to choose from.
+        """
         super().__init__(**kwargs)
-        self._queued_task = None
-        self._queued_task_args: str | None = None
+        self.source = source
 
     def compose(self) -> ComposeResult:
         with VerticalGroup(id="zoxide_group", classes="zoxide_group"):
@@ -33,79 +37,62 @@ class ZDToDirectory(ModalScreen):
 
     def on_mount(self) -> None:
         zoxide_input = self.query_one("#zoxide_input")
-        zoxide_input.border_title = "zoxide"
+        zoxide_input.border_title = "z"
         zoxide_input.focus()
         zoxide_options = self.query_one("#zoxide_options")
         zoxide_options.border_title = "Folders"
         zoxide_options.can_focus = False
-        self.zoxide_updater(Input.Changed(zoxide_input, value=""))
+        self.update_options("")
+        if isinstance(self.source, ZoxideCache) and self.source.stale:
+            self.refresh_source()
+
+    @work(thread=True, exclusive=True)
+    def refresh_source(self) -> None:
+        """Fetch zoxide's folders again, without making typing wait for it."""
+        if self.source.refresh():
+            self.app.call_from_thread(
+                self.update_options, self.query_one("#zoxide_input", Input).value
+            )
 
     def on_input_changed(self, event: Input.Changed) -> None:
-        if any(
-            worker.is_running and worker.node is self for worker in self.app.workers
-        ):
-            self._queued_task = self.zoxide_updater
-            self._queued_task_args = event
-        else:
-            self.zoxide_updater(event=event)
+        self.update_options(event.value)
+
+    def update_options(self, search_term: str) -> None:
+        """Update the list with the folders that match.
 
-    def any_in_queue(self) -> bool:
-        if self._queued_task is not None:
-            self._queued_task(self._queued_task_args)
-            self._queued_task, self._queued_task_args = None, None
-            return True
-        return False
+        The folders are already ranked in memory (even zoxide's, which are
+        only fetched when they are stale), so this is quick enough to do on
+        every key press, without a worker.
 
-    @work(thread=True)
-    def zoxide_updater(self, event: Input.Changed) -> None:
-        """Update the list"""
-        search_term = self.query_one("#zoxide_input").value.strip()
-        # check 1 for queue, to ignore subprocess as a whole
-        if self.any_in_queue():
-            return
-        zoxide_output = run(
-            ["zoxide", "query", "--list"] + search_term.split(),
-            capture_output=True,
-            text=True,
+        Args:
+            search_term (str): The keywords to match, separated by spaces.
+        """
+        folders = self.source.query(
+            search_term.split(), config["settings"]["search_result_limit"]
         )
-        # check 2 for queue, to ignore mounting as a whole
-        if self.any_in_queue():
-            return
         zoxide_options = self.query_one("#zoxide_options", OptionList)
-        zoxide_options.add_class("empty")
-        options = []
-        if zoxide_output.stdout:
-            for line in zoxide_output.stdout.splitlines():
-                options.append(
-                    Option(Content(f" {line}"), id=path_utils.compress(line))
-                )
-            if len(options) == len(zoxide_options.options) and all(
-                options[i].id == zoxide_options.options[i].id
-                for i in range(len(options))
-            ):  # ie same~ish query, resulting in same result
-                pass
-            else:
-                # unline normally, I'm using an add_option**s** function
-                # using it without has a likelihood of DuplicateID being
-                # raised, or just nothing showing up. By having the clear
-                # options and add options functions nearby, it hopefully
-                # reduces the likelihood of an empty option list
-                self.app.call_from_thread(zoxide_options.clear_options)
-                self.app.call_from_thread(zoxide_options.add_options, options)
-                zoxide_options.remove_class("empty")
-                zoxide_options.highlighted = 0
+        if isinstance(self.source, ZoxideCache) and self.source.fetched_at is None:
+            zoxide_options.clear_options()
+            zoxide_options.add_option(
+                Option("  Loading folders from zoxide...", disabled=True)
+            )
+        elif folders:
+            if folders == [option.id for option in zoxide_options.options]:
+                # ie same~ish query, resulting in same result
+                return
+            zoxide_options.clear_options()
+            zoxide_options.add_options([
+                Option(Content(f" {folder}"), id=folder) for folder in folders
+            ])
+            zoxide_options.remove_class("empty")
+            zoxide_options.highlighted = 0
         else:
             # No Matches to the query text
-            self.app.call_from_thread(zoxide_options.clear_options)
-            self.app.call_from_thread(
-                zoxide_options.add_option,
+            zoxide_options.add_class("empty")
+            zoxide_options.clear_options()
+            zoxide_options.add_option(
                 Option("  --No matches found--", disabled=True),
             )
-        # check 3, if somehow there's a new request after the mount
-        if self.any_in_queue():
-            return  # nothing much to do now
-        else:
-            self._queued_task = None
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         zoxide_options = self.query_one("#zoxide_options")
@@ -114,22 +101,11 @@ class ZDToDirectory(ModalScreen):
         zoxide_options.action_select()
 
     # You cant manually tab into the option list, but you can click, so I guess
-    @work(exclusive=True)
-    async def on_option_list_option_selected(
-        self, event: OptionList.OptionSelected
-    ) -> None:
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
         """Handle option selection."""
-        selected_value = event.option.id
-        assert selected_value is not None
-        run(
-            ["zoxide", "add", path_utils.decompress(selected_value)],
-            capture_output=True,
-            text=True,
-        )
-        if selected_value:
-            self.dismiss(selected_value)
-        else:
-            self.dismiss(None)
+        if isinstance(self.source, ZoxideCache):
+            self.source.add(event.option.id)
+        self.dismiss(event.option.id)
 
     def on_key(self, event: events.Key) -> None:
         """Handle key presses."""
@@ -1,14 +1,14 @@
-import contextlib
+import asyncio
+from os import getcwd, path
+from threading import Event
 
 from textual import events, work
 from textual.css.query import NoMatches
-from textual.fuzzy import Matcher
-from textual.types import OptionDoesNotExist
 from textual.widgets import Input, OptionList, SelectionList
-from textual.widgets.option_list import Option
-from textual.widgets.selection_list import Selection, SelectionError
 
-from rovr.functions.utils import set_scuffed_subtitle
+from rovr.functions import path as path_utils
+from rovr.screens import RecursiveSearch, SearchInFiles
+from rovr.variables.constants import config
 
 
 class SearchInput(Input):
@@ -16,107 +16,40 @@ class SearchInput(Input):
         super().__init__(
             *args, password=False, compact=True, select_on_focus=False, **kwargs
         )
-        self.selected = set()
 
     def on_mount(self) -> None:
         self.items_list = self.parent.query_one(OptionList)
-        if isinstance(self.items_list, SelectionList):
-            self.item_list_type = "Selection"
-        elif isinstance(self.items_list, OptionList):
-            self.item_list_type = "Option"
-        else:
+        if not hasattr(self.items_list, "show_matches"):
             raise NoMatches(
-                f"type {type(self.items_list).__name__} was matched but expected either OptionList or SelectionList"
+                f"type {type(self.items_list).__name__} was matched but expected either FileList or PinnedSidebar"
             )
 
-    # exclusive when too many options, and not enough time to mount
+    @work(exclusive=True, group="index")
+    async def on_focus(self, event: events.Focus) -> None:
+        # exact and glob searches use an index, which is built
+        # in the background before they are typed out
+        await asyncio.to_thread(self.items_list.fuzzy_filter.build_index)
+
+    # exclusive, so that a newer query cancels the older one
     @work(exclusive=True)
     async def on_input_changed(self, event: Input.Changed) -> None:
-        if self.item_list_type == "Selection":
-            assert isinstance(self.items_list, SelectionList)
-            self.selected.update({*self.items_list.selected})
-        else:
-            assert isinstance(self.items_list, OptionList)
-        try:
-            highlighted = self.items_list.highlighted_option.id
-        except AttributeError:
-            highlighted = None
         self.app.tabWidget.active_tab.session.search = event.value
         if event.value == "":
-            self.items_list.clear_options()
-            self.items_list.add_options(self.items_list.list_of_options)
-            if highlighted is not None:
-                with contextlib.suppress(OptionDoesNotExist, SelectionError):
-                    self.items_list.highlighted = self.items_list.get_option_index(
-                        highlighted
-                    )
-            else:
-                self.items_list.highlighted = 0
-            if self.item_list_type == "Selection":
-                for option_id in self.selected:
-                    with contextlib.suppress(OptionDoesNotExist):
-                        if not self.items_list.select_mode_enabled:
-                            with self.items_list.prevent(
-                                self.items_list.SelectedChanged
-                            ):
-                                self.items_list.select(
-                                    self.items_list.get_option(option_id)
-                                )
-                        else:
-                            self.items_list.select(
-                                self.items_list.get_option(option_id)
-                            )
+            self.items_list.show_matches(None)
             return
-        self.items_list.clear_options()
-        matches = []
-        matcher = Matcher(
-            event.value,
-        )
-        assert hasattr(self.items_list, "list_of_options")
-        for option in self.items_list.list_of_options:
-            assert isinstance(option, Option)
-            if option.disabled:
-                matches.append(option)
-                continue
-            score = matcher.match(option.label)
-            if score > 0:
-                matches.append(option)
-        if matches:
-            self.items_list.add_options(matches)
-        else:
-            if self.item_list_type == "Option":
-                self.items_list.add_option(
-                    Option("   --no-matches--", id="", disabled=True)
-                )
-            else:
-                self.items_list.add_option(
-                    Selection("   --no-matches--", value="", id="", disabled=True)
-                )
-                set_scuffed_subtitle(
-                    self.items_list.parent,
-                    "SELECT" if self.items_list.select_mode_enabled else "NORMAL",
-                    "0/0",
-                )
-        if self.items_list.highlighted is None:
-            if highlighted is not None:
-                try:
-                    self.items_list.highlighted = self.items_list.get_option_index(
-                        highlighted
-                    )
-                except OptionDoesNotExist:
-                    self.items_list.action_cursor_down()
-            else:
-                self.items_list.action_cursor_down()
-        if self.item_list_type == "Selection":
-            for option_id in self.selected:
-                with contextlib.suppress(OptionDoesNotExist):
-                    if not self.items_list.select_mode_enabled:
-                        with self.items_list.prevent(self.items_list.SelectedChanged):
-                            self.items_list.select(
-                                self.items_list.get_option(option_id)
-                            )
-                    else:
-                        self.items_list.select(self.items_list.get_option(option_id))
+        # matching runs in a thread, so typing doesn't wait for it
+        fuzzy_filter = self.items_list.fuzzy_filter
+        cancelled = Event()
+        try:
+            rows = await asyncio.to_thread(fuzzy_filter.filter, event.value, cancelled)
+        except asyncio.CancelledError:
+            # a newer query replaced this one, so let the thread stop early
+            cancelled.set()
+            raise
+        if fuzzy_filter is not self.items_list.fuzzy_filter:
+            # the options were replaced while matching
+            return
+        self.items_list.show_matches(rows)
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         self.items_list.focus()
@@ -125,6 +58,39 @@ class SearchInput(Input):
         if event.key == "escape":
             self.items_list.focus()
             event.stop()
+        elif event.key in config["keybinds"]["recursive_search"] and isinstance(
+            self.items_list, SelectionList
+        ):
+            event.stop()
 
-    def clear_selected(self) -> None:
-        self.selected = set()
+            def on_response(response: str | None) -> None:
+                """Go to the directory of the chosen match, and highlight it."""
+                if response:
+                    self.app.cd(
+                        path.dirname(response), focus_on=path.basename(response)
+                    )
+                    self.items_list.focus()
+
+            self.app.push_screen(
+                RecursiveSearch(path_utils.normalise(getcwd()), self.value),
+                on_response,
+            )
+        elif event.key in config["keybinds"]["search_in_files"] and isinstance(
+            self.items_list, SelectionList
+        ):
+            event.stop()
+
+            def on_line_response(response: tuple[str, int] | None) -> None:
+                """Go to the file with the chosen line, and preview the file at that line."""
+                if response:
+                    file_path, line = response
+                    self.app.query_one("PreviewContainer").show_preview(file_path, line)
+                    self.app.cd(
+                        path.dirname(file_path), focus_on=path.basename(file_path)
+                    )
+                    self.items_list.focus()
+
+            self.app.push_screen(
+                SearchInFiles(path_utils.normalise(getcwd()), self.value),
+                on_line_response,
+            )
@@ -0,0 +1,23 @@
+from rovr.classes.directory_watcher import _is_network_filesystem
+
+MOUNTS = [
+    ("/mnt/nas/media", "ext4"),
+    ("/mnt/nas", "nfs4"),
+    ("/home/user/remote", "fuse.sshfs"),
+    ("/media/usb", "fuseblk"),
+    ("/", "ext4"),
+]
+
+
+def test_network_filesystems_are_polled() -> None:
+    assert _is_network_filesystem("/mnt/nas", MOUNTS)
+    assert _is_network_filesystem("/mnt/nas/photos", MOUNTS)
+    assert _is_network_filesystem("/home/user/remote/src", MOUNTS)
+
+
+def test_local_filesystems_use_inotify() -> None:
+    # the longest mount point wins, and only at a path boundary
+    assert not _is_network_filesystem("/mnt/nas/media/films", MOUNTS)
+    assert not _is_network_filesystem("/mnt/nasty", MOUNTS)
+    assert not _is_network_filesystem("/media/usb/backup", MOUNTS)
+    assert not _is_network_filesystem("/home/user", MOUNTS)
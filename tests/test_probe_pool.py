@@ -0,0 +1,53 @@
+import asyncio
+from threading import Event
+from typing import Callable
+
+from rovr.classes import ProbeTimeout
+from rovr.classes.probe_pool import ProbePool
+
+
+def hang(release: Event) -> str:
+    release.wait()
+    return "done"
+
+
+def times_out(call: Callable[[], object]) -> bool:
+    try:
+        call()
+    except ProbeTimeout:
+        return True
+    return False
+
+
+def test_a_hung_call_times_out() -> None:
+    pool = ProbePool(timeout=0.05)
+    release = Event()
+    try:
+        assert times_out(lambda: pool.run(hang, release))
+        assert times_out(lambda: asyncio.run(pool.run_async(hang, release)))
+    finally:
+        release.set()
+
+
+def test_calls_for_the_same_key_share_one_call_while_it_runs() -> None:
+    pool = ProbePool(timeout=1.0)
+    release = Event()
+    first = pool.submit(hang, release, key="hung")
+    # waiting on it again doesn't start another thread
+    assert pool.submit(hang, release, key="hung") is first
+    assert pool.submit(hang, release, key="other") is not first
+    release.set()
+    assert first.result(1.0) == "done"
+
+    # a finished call is replaced, so its result isn't reused forever
+    assert pool.submit(hang, release, key="hung") is not first
+
+
+def test_giving_up_does_not_cancel_a_shared_call() -> None:
+    pool = ProbePool(timeout=0.05)
+    release = Event()
+    assert times_out(lambda: asyncio.run(pool.run_async(hang, release)))
+    shared = pool.submit(hang, release, key=(hang, release))
+    assert not shared.cancelled()
+    release.set()
+    assert pool.run(hang, release) == "done"
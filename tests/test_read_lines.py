@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from rovr.functions.utils import MMAP_THRESHOLD, read_lines
+
+
+def test_read_lines_from_the_middle_of_a_mapped_file(tmp_path: Path) -> None:
+    file_path = tmp_path / "big.log"
+    lines = [f"line {index}" for index in range(400_000)]
+    file_path.write_text("\n".join(lines) + "\n")
+    assert file_path.stat().st_size >= MMAP_THRESHOLD
+
+    read, more = read_lines(str(file_path), 300_000, 5, 1024)
+    assert read == lines[300_000:300_005]
+    assert more
+
+
+def test_read_lines_past_the_end_of_a_mapped_file(tmp_path: Path) -> None:
+    file_path = tmp_path / "big.log"
+    lines = [f"line {index}" for index in range(400_000)]
+    file_path.write_text("\n".join(lines))
+
+    read, more = read_lines(str(file_path), 399_998, 5, 1024)
+    assert read == lines[399_998:]
+    assert not more
+
+
+def test_read_lines_from_the_middle_of_a_mapped_utf16_file(tmp_path: Path) -> None:
+    file_path = tmp_path / "big.txt"
+    lines = [f"line {index}" for index in range(100_000)]
+    file_path.write_bytes("\n".join(lines).encode("utf-16-le"))
+    assert file_path.stat().st_size >= MMAP_THRESHOLD
+
+    read, more = read_lines(str(file_path), 50_000, 3, 1024, "utf-16-le")
+    assert read == lines[50_000:50_003]
+    assert more
+
+
+def test_read_lines_skips_split_newlines_in_utf16(tmp_path: Path) -> None:
+    file_path = tmp_path / "big.txt"
+    # "\u0a00\u0100" is b"\x00\x0a\x00\x01" in utf-16-le, which has a
+    # newline's bytes in the middle, split over the two characters
+    lines = [f"line {index} \u0a00\u0100" for index in range(200_000)]
+    file_path.write_bytes("\n".join(lines).encode("utf-16-le"))
+    assert file_path.stat().st_size >= MMAP_THRESHOLD
+
+    read, more = read_lines(str(file_path), 150_000, 3, 1024, "utf-16-le")
+    assert read == lines[150_000:150_003]
+    assert more